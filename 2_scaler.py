@@ -7,12 +7,24 @@ sayısal değerleri 0-100 aralığında normalize eder ve yeni bir dosya olarak
 """
 
 # Kütüphaneler
+import os
+
 import pandas as pd
 
+import pipeline_metrics
+from candidate_schema import compact_criteria, criteria_path
+from minmax_scaler import MinMaxScaler, scaler_path
+from pipeline_metrics import span
+
+# Ölçüm bayrakları: --metrics <dosya.jsonl> / --profile-dir <klasör> (veya PIPELINE_METRICS)
+pipeline_metrics.init_from_cli()
+
 # ---------------------- Dosya Yükleme ----------------------
 
 # Girdi dosyasını oku
-df = pd.read_excel("./outputs/processed_candidates_anonymized.xlsx")
+with span("load:processed_candidates_anonymized.xlsx") as record:
+    df = pd.read_excel("./outputs/processed_candidates_anonymized.xlsx")
+    record["rows"] = len(df)
 
 # ---------------------- Hangi Sütunlar Scale Edilecek? ----------------------
 
@@ -26,16 +38,18 @@ columns_to_scale = [col for col in df.columns if col != "ID" and col != "Deneyim
 
 # ---------------------- Ölçeklendirme (Min-Max Scaling) ----------------------
 
-# Her kolon için 0-100 scale işlemi
-for col in columns_to_scale:
-    min_val = df[col].min()
-    max_val = df[col].max()
-    
-    # Eğer min == max ise tüm değerleri 0 olarak bırakıyoruz (tek tip veri varsa bölme hatasını önlemek için)
-    if min_val == max_val:
-        df[col + " (Scaled)"] = 0
-    else:
-        df[col + " (Scaled)"] = ((df[col] - min_val) / (max_val - min_val)) * 100
+# Sınırlar havuzdan öğrenilir ve kaydedilir; yeni adaylar aynı sınırlarla
+# ölçeklenir (minmax_scaler.py). Kayıtlı sınırlar varsa sürüm oradan devam eder
+# (sınırlar değişmediyse sürüm de değişmez).
+# Eğer min == max ise tüm değerler 0 olur (tek tip veri varsa bölme hatasını önlemek için)
+if os.path.exists(scaler_path):
+    scaler = MinMaxScaler.load(scaler_path)
+    scaler.columns = columns_to_scale
+else:
+    scaler = MinMaxScaler(columns_to_scale)
+
+with span("scale:min-max", rows=len(df)):
+    df = scaler.fit_transform(df)
 
 # ---------------------- Sonuçları Kaydetme ----------------------
 
@@ -43,7 +57,16 @@ for col in columns_to_scale:
 output_path = "./outputs/processed_candidates_anonymized_scaled.xlsx"
 
 # Kaydet
-df.to_excel(output_path, index=False)
+with span("write:processed_candidates_anonymized_scaled.xlsx", rows=len(df)):
+    df.to_excel(output_path, index=False)
+
+# Ölçekleme sınırları (sürümlü)
+scaler.save(scaler_path)
+
+# Sıralama betiklerinin doğrudan okuduğu kompakt kriter tablosu
+with span("write:candidate_criteria.pkl", rows=len(df)):
+    compact_criteria(df).to_pickle(criteria_path)
 
 # Bilgilendirme
 print(f"Scale edilmiş dosya başarıyla kaydedildi: {output_path}")
+print(f"Ölçekleme sınırları (v{scaler.version}) kaydedildi: {scaler_path}")
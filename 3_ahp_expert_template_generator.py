@@ -2,17 +2,31 @@
 AHP Pairwise Comparison Matrisi Oluşturucu (Formüllü + Başlık Sorunsuz + Üst Üçgen 5)
 ===================================================================================
 
-6 uzmanın doldurması için AHP matrisleri üretir:
+Uzmanların doldurması için AHP matrisleri üretir:
 - Alt üçgen hücreler otomatik formül
 - Üst üçgen hücrelere başlangıçta 5 yazılır
 - Header ve index hizası düzgün
+
+openpyxl write-only (streaming) modu kullanılır: değerler ve karşılıklı (1/x)
+formüller tek geçişte satır satır yazılır, dosya tekrar açılmaz. Böylece
+yüzlerce uzman sayfası ve daha büyük kriter setleri bellek şişmeden üretilir.
+
+Kullanım:
+    python 3_ahp_expert_template_generator.py --uzman-sayisi 6
+    python 3_ahp_expert_template_generator.py --uzman-sayisi 200 --kriterler "K1" "K2" "K3"
+    python 3_ahp_expert_template_generator.py --uzman-sayisi 200 --metrics ./outputs/metrics.jsonl
 """
 
-import pandas as pd
+import argparse
+import os
+
 import openpyxl
 from openpyxl.utils import get_column_letter
 
-# Kriter isimleri
+import pipeline_metrics
+from pipeline_metrics import span
+
+# Varsayılan kriter isimleri
 criteria = [
     "Deneyim Seviyesi (Kategori)",
     "Yabancı Dil Skoru",
@@ -22,57 +36,67 @@ criteria = [
     "Sosyal Aktivite Skoru (0-100)"
 ]
 
+# Varsayılan uzman sayısı
+n_experts = 6
+
 # Dosya yolu
 output_path = "./outputs/ahp_matrices_formullu.xlsx"
 
-# Boş DataFrame oluştur
-def create_initial_ahp_matrix(criteria):
-    size = len(criteria)
-    df_matrix = pd.DataFrame('', index=criteria, columns=criteria)
-    for i in range(size):
-        for j in range(size):
-            if i == j:
-                df_matrix.iat[i, j] = 1  # diagonal → 1
-            elif i < j:
-                df_matrix.iat[i, j] = 5  # üst üçgen → başlangıçta 5
-            else:
-                df_matrix.iat[i, j] = ''  # alt üçgen → boş (formül eklenecek)
-    return df_matrix
-
-# ExcelWriter (openpyxl backend kullanacağız → formül destekli)
-with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-    for expert_id in range(1, 7):
-        df_matrix = create_initial_ahp_matrix(criteria)
-        sheet_name = f"Uzman_{expert_id}"
-        # startrow=0, startcol=0 → hizalama düzgün olur
-        df_matrix.to_excel(writer, sheet_name=sheet_name, startrow=0, startcol=0)
-
-# openpyxl ile tekrar aç → formülleri ekle
-wb = openpyxl.load_workbook(output_path)
-
-for expert_id in range(1, 7):
-    sheet_name = f"Uzman_{expert_id}"
-    ws = wb[sheet_name]
-    
-    n = len(criteria)
+# Üst üçgen hücrelerin başlangıç değeri
+initial_value = 5
+
+
+# Tek bir matris satırı üret (değerler + alt üçgen formülleri)
+def build_ahp_row(i, criteria, initial_value=initial_value):
     start_row = 2  # 1-based index: 1.row → header, 2.row → veri başlar
     start_col = 2  # 1.col → index, 2.col → veri başlar
-    
-    # Alt üçgen hücreler için formül yaz
-    for i in range(n):
-        for j in range(i):
-            row = start_row + i
-            col = start_col + j
-            
-            # Üst üçgendeki referans hücresini bul
-            ref_row = start_row + j
-            ref_col_letter = get_column_letter(start_col + i)
-            ref_cell = f"{ref_col_letter}{ref_row}"
-            
-            # Formül ekle
-            ws.cell(row=row, column=col).value = f"=1/{ref_cell}"
-
-# Dosyayı kaydet
-wb.save(output_path)
-
-print(f"Formüllü AHP matrisleri başarıyla oluşturuldu ve kaydedildi: {output_path}")
+
+    row = [criteria[i]]
+    for j in range(len(criteria)):
+        if i == j:
+            row.append(1)  # diagonal → 1
+        elif i < j:
+            row.append(initial_value)  # üst üçgen → başlangıçta 5
+        else:
+            # alt üçgen → üst üçgendeki simetrik hücrenin tersi
+            ref_cell = f"{get_column_letter(start_col + i)}{start_row + j}"
+            row.append(f"=1/{ref_cell}")
+    return row
+
+
+# Tüm uzman sayfalarını tek geçişte yaz
+def generate_ahp_templates(output_path, criteria, n_experts, initial_value=initial_value):
+    wb = openpyxl.Workbook(write_only=True)
+    n_rows = n_experts * (len(criteria) + 1)
+
+    with span("ahp_templates", rows=n_rows, experts=n_experts):
+        # Satırlar uzmandan bağımsız → bir kez üret, her sayfada tekrar kullan
+        header = [None] + list(criteria)
+        rows = [build_ahp_row(i, criteria, initial_value) for i in range(len(criteria))]
+
+        for expert_id in range(1, n_experts + 1):
+            ws = wb.create_sheet(title=f"Uzman_{expert_id}")
+            ws.append(header)
+            for row in rows:
+                ws.append(row)
+
+    # Write-only modda sayfalar geçici dosyalardadır; save bunları .xlsx arşivine toplar
+    with span(f"write:{os.path.basename(output_path)}", rows=n_rows):
+        wb.save(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AHP uzman şablonu oluşturucu")
+    parser.add_argument("--uzman-sayisi", type=int, default=n_experts, help="Oluşturulacak uzman sayfası sayısı")
+    parser.add_argument("--kriterler", nargs="+", default=criteria, help="Kriter isimleri (sırasıyla)")
+    parser.add_argument("--cikti", default=output_path, help="Çıktı Excel dosyası")
+    # Ölçüm bayrakları: --metrics <dosya.jsonl> / --profile-dir <klasör> (veya PIPELINE_METRICS)
+    pipeline_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    pipeline_metrics.configure_from_args(args)
+
+    generate_ahp_templates(args.cikti, args.kriterler, args.uzman_sayisi)
+
+    print(f"Formüllü AHP matrisleri başarıyla oluşturuldu ve kaydedildi: {args.cikti}")
+    print(f"Uzman sayısı: {args.uzman_sayisi} | Kriter sayısı: {len(args.kriterler)}")
@@ -11,26 +11,21 @@ AHP Ağırlık Hesaplama + Birleşik Ağırlık (CR ≤ 0.15 filtreli) + CI/CR/L
 import pandas as pd
 import numpy as np
 
-# RI değerleri
-RI_dict = {
-    1: 0.00,
-    2: 0.00,
-    3: 0.58,
-    4: 0.90,
-    5: 1.12,
-    6: 1.24,
-    7: 1.32,
-    8: 1.41,
-    9: 1.45,
-    10: 1.49
-}
+import pipeline_metrics
+from ahp_methods import ahp_weights, consistency, geometric_mean_matrix
+from pipeline_metrics import span
+
+# Ölçüm bayrakları: --metrics <dosya.jsonl> / --profile-dir <klasör> (veya PIPELINE_METRICS)
+pipeline_metrics.init_from_cli()
 
 # Dosya yolu
 input_path = "./data_sources/ahp_expert_filled.xlsx"
 
 # Dosya oku
-wb = pd.ExcelFile(input_path)
-sheet_names = wb.sheet_names
+with span("load:ahp_expert_filled.xlsx") as record:
+    wb = pd.ExcelFile(input_path)
+    sheet_names = wb.sheet_names
+    record["rows"] = len(sheet_names)
 print(f"Bulunan uzmanlar: {sheet_names}")
 
 # Sonuçlar
@@ -43,21 +38,13 @@ expert_cr = {}
 for sheet in sheet_names:
     print(f"\n---- {sheet} ----")
     
-    df = wb.parse(sheet_name=sheet, index_col=0)
-    matrix = df.astype(float).values
-    n = matrix.shape[0]
-    
-    column_sums = matrix.sum(axis=0)
-    normalized_matrix = matrix / column_sums
-    
-    weights = normalized_matrix.mean(axis=1)
-    
-    lambda_max = np.dot(column_sums, weights)
-    
-    CI = (lambda_max - n) / (n - 1)
-    
-    RI = RI_dict[n]
-    CR = CI / RI if RI != 0 else 0.0
+    with span(f"ahp:{sheet}"):
+        df = wb.parse(sheet_name=sheet, index_col=0)
+        matrix = df.astype(float).values
+        n = matrix.shape[0]
+
+        # Normalize sütun ortalaması → ağırlıklar, Lambda_max, CI, CR
+        weights, lambda_max, CI, CR = ahp_weights(matrix)
     
     # Kayıt
     expert_weights[sheet] = weights
@@ -94,25 +81,20 @@ else:
 
     valid_summary_df = summary_df[valid_experts]
 
-    combined_weights = np.exp(np.log(valid_summary_df).mean(axis=1))
-    combined_weights = combined_weights / combined_weights.sum()
-
-    # Konsolide Lambda_max hesapla
-    matrix_list = []
-    for sheet in valid_experts:
-        df = wb.parse(sheet_name=sheet, index_col=0)
-        matrix = df.astype(float).values
-        matrix_list.append(matrix)
+    with span("ahp:birlesik", rows=len(valid_experts)):
+        combined_weights = np.exp(np.log(valid_summary_df).mean(axis=1))
+        combined_weights = combined_weights / combined_weights.sum()
 
-    matrix_array = np.array(matrix_list)
-    geo_mean_matrix = np.exp(np.mean(np.log(matrix_array), axis=0))
+        # Konsolide Lambda_max hesapla
+        matrix_list = []
+        for sheet in valid_experts:
+            df = wb.parse(sheet_name=sheet, index_col=0)
+            matrix = df.astype(float).values
+            matrix_list.append(matrix)
 
-    column_sums_combined = geo_mean_matrix.sum(axis=0)
-    lambda_max_combined = np.dot(column_sums_combined, combined_weights)
+        geo_mean_matrix = geometric_mean_matrix(matrix_list)
 
-    CI_combined = (lambda_max_combined - n) / (n - 1)
-    RI_combined = RI_dict[n]
-    CR_combined = CI_combined / RI_combined if RI_combined != 0 else 0.0
+        lambda_max_combined, CI_combined, CR_combined = consistency(geo_mean_matrix, combined_weights)
 
     # Ekrana yaz
     print("\nBirleşik Ağırlıklar:")
@@ -127,7 +109,7 @@ else:
 
 output_path = "./outputs/ahp_weights_summary.xlsx"
 
-with pd.ExcelWriter(output_path) as writer:
+with span("write:ahp_weights_summary.xlsx"), pd.ExcelWriter(output_path) as writer:
     # Sheet 1 → Uzman ağırlıkları
     summary_df = pd.DataFrame({sheet: expert_weights[sheet] for sheet in sheet_names},
                               index=df.columns)
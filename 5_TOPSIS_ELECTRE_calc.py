@@ -4,7 +4,7 @@ AHP + TOPSIS + ELECTRE Pipeline
 
 Girdi:
 - ./outputs/ahp_weights_summary.xlsx (Birlesik_Agirlik)
-- ./outputs/processed_candidates_anonymized_scaled.xlsx
+- ./outputs/candidate_criteria.pkl (kompakt; yoksa processed_candidates_anonymized_scaled.xlsx)
 
 Çıktılar:
 - TOPSIS_Ranking.xlsx
@@ -14,6 +14,14 @@ Girdi:
 import pandas as pd
 import numpy as np
 
+import mcdm_methods
+import pipeline_metrics
+from candidate_schema import criteria_path, load_criteria
+from pipeline_metrics import span
+
+# Ölçüm bayrakları: --metrics <dosya.jsonl> / --profile-dir <klasör> (veya PIPELINE_METRICS)
+pipeline_metrics.init_from_cli()
+
 # --------------- Parametreler ----------------
 
 # Dosya yolları
@@ -29,46 +37,35 @@ D_threshold = 0.35
 # --------------- Ağırlıkları Yükle ----------------
 
 # Birleşik ağırlıkları oku
-weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
-weights = weights_df["Birlesik_Agirlik"].values
-criteria_names = weights_df.index.tolist()
+with span("load:ahp_weights_summary.xlsx"):
+    weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+    weights = weights_df["Birlesik_Agirlik"].values
+    criteria_names = weights_df.index.tolist()
 
 print(f"Kriterler: {criteria_names}")
 print(f"Ağırlıklar: {weights}")
 
 # --------------- Aday Verisini Yükle ----------------
 
-candidates_df = pd.read_excel(candidates_path)
-candidates_df.set_index("ID", inplace=True)
+# Kompakt kriter tablosu (candidate_criteria.pkl) varsa doğrudan o, yoksa Excel okunur
+with span("load:candidate_criteria") as record:
+    candidates_df = load_criteria(criteria_path, candidates_path)
+    record["rows"] = len(candidates_df)
 
 # Kriter matrisini çıkar
-criteria_matrix = candidates_df[criteria_names].values
+criteria_matrix = candidates_df[criteria_names].to_numpy(dtype=float)
 
 print(f"\nAday sayısı: {criteria_matrix.shape[0]}")
 print(f"Kriter sayısı: {criteria_matrix.shape[1]}")
 
 # --------------- TOPSIS Hesaplama ----------------
 
-# Normalize et (vektör normu ile)
-norm = np.linalg.norm(criteria_matrix, axis=0)
-normalized_matrix = criteria_matrix / norm
-
-# Ağırlıklı normalize matris
-weighted_matrix = normalized_matrix * weights
-
-# Ideal ve anti-ideal çözümler
-ideal_solution = np.max(weighted_matrix, axis=0)
-anti_ideal_solution = np.min(weighted_matrix, axis=0)
+# Vektör normu ile normalize, ağırlıklı ideal/anti-ideal uzaklıkları
+with span("topsis", rows=len(criteria_matrix)):
+    topsis_scores = mcdm_methods.topsis_scores(criteria_matrix, weights)
 
-# Mesafe hesapla
-distance_to_ideal = np.linalg.norm(weighted_matrix - ideal_solution, axis=1)
-distance_to_anti_ideal = np.linalg.norm(weighted_matrix - anti_ideal_solution, axis=1)
-
-# TOPSIS skorları
-topsis_scores = distance_to_anti_ideal / (distance_to_ideal + distance_to_anti_ideal)
-
-# Sıralama (yüksek skor daha iyi)
-topsis_ranking = np.argsort(topsis_scores)[::-1] + 1
+    # Sıralama (yüksek skor daha iyi)
+    topsis_ranking = mcdm_methods.descending_rank(topsis_scores)
 
 # TOPSIS sonuç dataframe
 topsis_df = candidates_df.copy()
@@ -77,69 +74,36 @@ topsis_df["TOPSIS_Rank"] = topsis_ranking
 
 # --------------- ELECTRE Hesaplama ----------------
 
-n_candidates = criteria_matrix.shape[0]
-n_criteria = criteria_matrix.shape[1]
-
-# Concordance ve Discordance matrisleri
-C_matrix = np.zeros((n_candidates, n_candidates))
-D_matrix = np.zeros((n_candidates, n_candidates))
-
-for i in range(n_candidates):
-    for j in range(n_candidates):
-        if i == j:
-            continue
-        
-        # Cij: hangi kriterlerde i aday j'den daha iyi?
-        concordance_indices = criteria_matrix[i, :] >= criteria_matrix[j, :]
-        Cij = np.sum(weights[concordance_indices])
-        C_matrix[i, j] = Cij
-        
-        # Dij: hangi kriterlerde i aday j'den çok kötü?
-        differences = np.abs(criteria_matrix[i, :] - criteria_matrix[j, :])
-        max_diff = np.max(differences)
-        if max_diff == 0:
-            D_matrix[i, j] = 0
-        else:
-            Dij = np.max((criteria_matrix[j, :] - criteria_matrix[i, :]) / max_diff)
-            D_matrix[i, j] = Dij
-
-# Outranking (dominance) matrisi
-outranking_matrix = np.zeros((n_candidates, n_candidates))
-
-for i in range(n_candidates):
-    for j in range(n_candidates):
-        if i == j:
-            continue
-        if C_matrix[i, j] >= C_threshold and D_matrix[i, j] <= D_threshold:
-            outranking_matrix[i, j] = 1  # i dominates j
-        else:
-            outranking_matrix[i, j] = 0
-
-# Dominance score → kaç adaya üstün geliyor?
-dominance_scores = np.sum(outranking_matrix, axis=1)
-
-# ELECTRE sonuç dataframe
-electre_df = pd.DataFrame({
-    "ID": candidates_df.index,
-    "ELECTRE_Dominance_Score": dominance_scores
-}).set_index("ID")
-
-# Sıralama
-electre_df["ELECTRE_Rank"] = electre_df["ELECTRE_Dominance_Score"].rank(ascending=False, method='min').astype(int)
+# Concordance, Discordance ve Outranking (dominance) matrisleri
+with span("electre", rows=len(criteria_matrix)):
+    C_matrix, D_matrix, outranking_matrix = mcdm_methods.electre_matrices(
+        criteria_matrix, weights, C_threshold, D_threshold
+    )
+
+    # Dominance score → kaç adaya üstün geliyor?
+    dominance_scores = np.sum(outranking_matrix, axis=1)
+
+    # ELECTRE sonuç dataframe + sıralama
+    electre_df = mcdm_methods.electre_ranking(dominance_scores, candidates_df.index)
 
 # --------------- Sonuçları Kaydet ----------------
 
 # TOPSIS
 topsis_df_out = topsis_df[["TOPSIS_Score", "TOPSIS_Rank"]].copy()
-topsis_df_out.to_excel("./outputs/TOPSIS_Ranking.xlsx")
+with span("write:TOPSIS_Ranking.xlsx", rows=len(candidates_df)):
+    topsis_df_out.to_excel("./outputs/TOPSIS_Ranking.xlsx")
 
 # ELECTRE
-electre_df.to_excel("./outputs/ELECTRE_Results.xlsx")
+with span("write:ELECTRE_Results.xlsx", rows=len(candidates_df)):
+    electre_df.to_excel("./outputs/ELECTRE_Results.xlsx")
 
 # Matrisleri de istersen kaydedebiliriz (advanced kullanım için):
-pd.DataFrame(C_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Concordance.xlsx")
-pd.DataFrame(D_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Discordance.xlsx")
-pd.DataFrame(outranking_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Outranking.xlsx")
+with span("write:ELECTRE_Concordance.xlsx", rows=len(candidates_df)):
+    pd.DataFrame(C_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Concordance.xlsx")
+with span("write:ELECTRE_Discordance.xlsx", rows=len(candidates_df)):
+    pd.DataFrame(D_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Discordance.xlsx")
+with span("write:ELECTRE_Outranking.xlsx", rows=len(candidates_df)):
+    pd.DataFrame(outranking_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Outranking.xlsx")
 
 print("\nTOPSIS ve ELECTRE hesaplamaları başarıyla tamamlandı.")
 print("Çıktılar:")
@@ -0,0 +1,58 @@
+"""
+AHP Hesaplama Fonksiyonları
+===========================
+
+4_ahp_calculator.py'deki hesapların yeniden kullanılabilir sürümü:
+- Uzman matrisinden ağırlık (normalize sütun ortalaması), Lambda_max, CI, CR
+- Uzman ağırlıklarının ve matrislerinin geometrik ortalaması
+"""
+
+import numpy as np
+
+# RI değerleri
+RI_dict = {
+    1: 0.00,
+    2: 0.00,
+    3: 0.58,
+    4: 0.90,
+    5: 1.12,
+    6: 1.24,
+    7: 1.32,
+    8: 1.41,
+    9: 1.45,
+    10: 1.49
+}
+
+# Konsolideye dahil edilecek uzmanlar için CR üst sınırı
+CR_LIMIT = 0.15
+
+
+# Lambda_max, CI ve CR
+def consistency(matrix, weights):
+    n = matrix.shape[0]
+    column_sums = matrix.sum(axis=0)
+    lambda_max = np.dot(column_sums, weights)
+    CI = (lambda_max - n) / (n - 1)
+    RI = RI_dict[n]
+    CR = CI / RI if RI != 0 else 0.0
+    return lambda_max, CI, CR
+
+
+# Tek uzman matrisi → ağırlıklar + tutarlılık
+def ahp_weights(matrix):
+    column_sums = matrix.sum(axis=0)
+    normalized_matrix = matrix / column_sums
+    weights = normalized_matrix.mean(axis=1)
+    lambda_max, CI, CR = consistency(matrix, weights)
+    return weights, lambda_max, CI, CR
+
+
+# Uzman ağırlıklarının geometrik ortalaması (toplamı 1)
+def combine_weights(weight_list):
+    combined = np.exp(np.log(np.array(weight_list)).mean(axis=0))
+    return combined / combined.sum()
+
+
+# Uzman matrislerinin eleman bazında geometrik ortalaması
+def geometric_mean_matrix(matrix_list):
+    return np.exp(np.mean(np.log(np.array(matrix_list)), axis=0))
@@ -0,0 +1,160 @@
+"""
+Örneklemeli Yaklaşık ELECTRE Baskınlık Skorları
+===============================================
+
+Yüz binlerce adayda tam n² outranking (bloklu bile olsa) pahalıdır. Bu modül
+her adayın ELECTRE_Dominance_Score'unu havuzdan rastgele seçilen s rakibe
+karşı tahmin eder:
+- Tahmin: p̂ = (baskılanan örnek rakip) / (örnek rakip sayısı), skor ≈ p̂ · (n - 1)
+- Güven aralığı: sonlu popülasyon düzeltmeli Hoeffding-Serfling sınırı; n aday
+  için Bonferroni ile birlikte tüm aralıklar en az 1 - δ olasılıkla doğrudur
+- Uyarlamalı iyileştirme: ilk k kesimiyle (k. en büyük alt sınır) aralığı
+  çakışan adaylar için örneklem büyütülür (her turda ×4, δ turlara bölünür);
+  kalan belirsiz adayların skorları tüm havuza karşı tam hesaplanır
+
+Tüm aralıklar doğruysa (olasılık ≥ 1 - δ) tam hesaplanan adaylar kesimin
+üstündeki herkesi kapsar; yani yaklaşık ilk k, tam ilk k ile aynıdır.
+Kesimin altında kalan adayların skoru tahmindir (ELECTRE_Exact = False).
+
+Kullanım:
+    python approximate_electre.py --ilk-k 50 --orneklem 2000 --delta 0.05
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import electre_kernels
+import mcdm_methods
+from candidate_schema import criteria_excel_path, criteria_path, load_criteria
+from incremental_electre import PAIR_BUDGET
+
+# Dosya yolları
+weights_path = "./outputs/ahp_weights_summary.xlsx"
+results_path = "./outputs/ELECTRE_Approx_Results.xlsx"
+
+# Varsayılan ayarlar
+SAMPLE_SIZE = 2000
+DELTA = 0.05
+MAX_ROUNDS = 3
+EXACT_MAX = 2000  # belirsiz aday sayısı bunun altına inince tam hesaba geçilir
+
+
+def _outranks_count(pool_matrix, candidates, weights, C_threshold, D_threshold, backend):
+    """Her aday için havuzda baskıladığı aday sayısı (kendisi dahil)."""
+    return electre_kernels.outranking_counts(
+        pool_matrix, candidates, weights, C_threshold, D_threshold, backend, pair_budget=PAIR_BUDGET
+    )[0]
+
+
+def hoeffding_serfling_radius(sample_size, population_size, delta):
+    """Örneklem oranı için (yerine koymadan örnekleme) iki yönlü güven yarıçapı."""
+    correction = 1 - (sample_size - 1) / population_size
+    return np.sqrt(correction * np.log(2 / delta) / (2 * sample_size))
+
+
+def sampled_dominance(criteria_matrix, weights, top_k, sample_size=SAMPLE_SIZE, delta=DELTA,
+                      C_threshold=mcdm_methods.C_THRESHOLD, D_threshold=mcdm_methods.D_THRESHOLD,
+                      max_rounds=MAX_ROUNDS, exact_max=EXACT_MAX, seed=42, backend="auto"):
+    """Yaklaşık baskınlık skorları, güven aralıkları ve ilk k için tam iyileştirme.
+
+    Dönen: (scores, lower, upper, exact_mask, report); skorlar aday sayısı cinsindendir.
+    """
+    X = np.asarray(criteria_matrix, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    n_candidates = len(X)
+    n_opponents = n_candidates - 1
+    top_k = min(top_k, n_candidates)
+    rng = np.random.default_rng(seed)
+
+    # Aday kendisiyle karşılaştırıldığında (özdeş vektör) baskılar mı?
+    self_outranks = int(weights.sum() >= C_threshold and 0 <= D_threshold)
+
+    scores = np.zeros(n_candidates)
+    lower = np.zeros(n_candidates)
+    upper = np.full(n_candidates, float(n_opponents))
+    exact = np.zeros(n_candidates, dtype=bool)
+    uncertain = np.arange(n_candidates)
+    pairs_evaluated = 0
+    rounds = 0
+
+    # Tüm aralıklar için Bonferroni: her tur δ / 2^(tur+1), tur içinde aday başına / n
+    while rounds < max_rounds and len(uncertain) > exact_max and sample_size < n_opponents:
+        round_delta = delta / 2 ** (rounds + 1) / n_candidates
+        sample = rng.choice(n_candidates, size=sample_size, replace=False)
+        counts = _outranks_count(X[sample], X[uncertain], weights, C_threshold, D_threshold, backend)
+        pairs_evaluated += len(uncertain) * sample_size
+
+        # Örneklemde kendisi bulunan aday: kendi çifti sayımdan ve paydadan düşülür
+        in_sample = np.isin(uncertain, sample)
+        counts -= in_sample * self_outranks
+        effective = sample_size - in_sample
+        proportion = counts / effective
+        radius = hoeffding_serfling_radius(effective, n_opponents, round_delta)
+
+        scores[uncertain] = proportion * n_opponents
+        lower[uncertain] = np.maximum(lower[uncertain], (proportion - radius) * n_opponents)
+        upper[uncertain] = np.minimum(upper[uncertain], (proportion + radius) * n_opponents)
+
+        # k. en büyük alt sınırın altında üst sınırı kalanlar ilk k'ya giremez
+        cutoff = np.partition(lower, n_candidates - top_k)[n_candidates - top_k]
+        uncertain = np.flatnonzero(upper >= cutoff)
+        sample_size *= 4
+        rounds += 1
+
+    # Belirsiz adaylar için tam skor (tüm havuza karşı)
+    exact_scores = _outranks_count(X, X[uncertain], weights, C_threshold, D_threshold, backend) - self_outranks
+    pairs_evaluated += len(uncertain) * n_candidates
+    scores[uncertain] = lower[uncertain] = upper[uncertain] = exact_scores
+    exact[uncertain] = True
+
+    pairs_full = n_candidates * n_opponents
+    report = {
+        "n_candidates": n_candidates,
+        "top_k": top_k,
+        "rounds": rounds,
+        "n_exact": int(exact.sum()),
+        "pairs_full": pairs_full,
+        "pairs_evaluated": pairs_evaluated,
+        "work_ratio": pairs_evaluated / pairs_full if pairs_full else 0.0,
+        "guarantee_probability": 1 - delta if rounds else 1.0,
+    }
+    return scores, lower, upper, exact, report
+
+
+def approximate_electre_ranking(criteria_matrix, weights, index, top_k, **kwargs):
+    """electre_ranking tablosu + ELECTRE_Lower / ELECTRE_Upper / ELECTRE_Exact kolonları."""
+    scores, lower, upper, exact, report = sampled_dominance(criteria_matrix, weights, top_k, **kwargs)
+    electre_df = mcdm_methods.electre_ranking(scores, index)
+    electre_df["ELECTRE_Lower"] = lower
+    electre_df["ELECTRE_Upper"] = upper
+    electre_df["ELECTRE_Exact"] = exact
+    return electre_df, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Örneklemeli yaklaşık ELECTRE baskınlık skorları")
+    parser.add_argument("--ilk-k", type=int, required=True, help="Tam olarak doğru bulunacak kısa liste boyutu")
+    parser.add_argument("--orneklem", type=int, default=SAMPLE_SIZE, help="İlk turdaki rakip örneklem boyutu")
+    parser.add_argument("--delta", type=float, default=DELTA, help="Hata olasılığı (ilk k ≥ 1 - δ olasılıkla tam)")
+    parser.add_argument("--tam-esik", type=int, default=EXACT_MAX, help="Tam hesaba geçilecek belirsiz aday sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cikti", default=results_path)
+    args = parser.parse_args()
+
+    weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+    candidates_df = load_criteria(criteria_path, criteria_excel_path)
+    criteria_matrix = candidates_df[weights_df.index.tolist()].to_numpy(dtype=float)
+
+    electre_df, report = approximate_electre_ranking(
+        criteria_matrix, weights_df["Birlesik_Agirlik"].values, candidates_df.index, args.ilk_k,
+        sample_size=args.orneklem, delta=args.delta, exact_max=args.tam_esik, seed=args.seed,
+    )
+    electre_df.to_excel(args.cikti)
+
+    print(f"Aday sayısı: {report['n_candidates']}, tur: {report['rounds']}, tam hesaplanan: {report['n_exact']}")
+    print(f"Hesaplanan ikili karşılaştırma: {report['pairs_evaluated']:,} / {report['pairs_full']:,} "
+          f"(%{report['work_ratio'] * 100:.1f})")
+    print(f"İlk {report['top_k']} tam sıralamayla en az {report['guarantee_probability']:.2f} olasılıkla aynıdır.")
+    print(f"Çıktı: {args.cikti}")
@@ -0,0 +1,349 @@
+"""
+Aşama Bazlı Pipeline Benchmark'ı
+================================
+
+synthetic_data.py ile üretilen sentetik aday havuzlarında pipeline aşamalarını
+(featurize, embedding, scale, AHP, TOPSIS, ELECTRE, export) ayrı ayrı çalıştırır;
+her aşama için süre, satır/saniye, tracemalloc tepe belleği ve süreç RSS tepesini
+ölçer. Sonuçlar commit'ler arası karşılaştırma için JSON olarak kaydedilir.
+
+Notlar:
+- Embedding (Sosyal Aktivite Skoru) yalnızca --embedding-sample kadar satırda
+  ölçülür ve toplam süre satır başı süreden tahmin edilir. sentence_transformers
+  kurulu değilse aşama atlanır; sonraki aşamalar için sosyal skor rastgele üretilir.
+  --zenginlik ngram ile hızlı metin zenginliği backend'i tüm havuzda ölçülür.
+- --workers N: featurize aşaması embedding dışındaki özellikleri N süreçte
+  çalıştırır (featurize_parallel; embedding ayrı aşamada ölçülür).
+- ELECTRE n² bellek/iş gerektirir; --electre-max-n üzerindeki boyutlarda atlanır.
+  "pareto" aşaması ilk --pareto-layers katmanla kaçınılacak ikili iş oranını raporlar.
+  Daha büyük boyutlarda "electre_approx" aşaması örneklemeli yaklaşık skorları
+  (ilk --approx-top-k tam) ölçer.
+- ELECTRE sayımı --electre-backend çekirdeğiyle (auto/numpy/numba) yapılır;
+  Numba kuruluysa "electre_kernels" aşaması iki çekirdeğin süresini ve
+  sonuçlarının aynı olup olmadığını kaydeder.
+- "pairwise_shared" aşaması ELECTRE durumu + PROMETHEE II'yi tek fark
+  taramasında hesaplar; yalnızca ELECTRE durumunu kuran "pairwise_electre"
+  aşamasıyla farkı (marginal_seconds) ek yöntemin maliyetidir.
+- "rank_agreement" aşaması TOPSIS ve ELECTRE sıralamaları arasındaki Kendall
+  tau-b, Spearman, ilk-k ve RBO uyumunu tüm havuzda hesaplar.
+- "topsis_stream" aşaması kriter matrisini .npy parçalarına yazıp iki geçişli
+  bellek dışı TOPSIS'i (streaming_topsis.py) ölçer; bellekteki TOPSIS ile en
+  büyük skor farkını ve ilk --approx-top-k listesinin aynı olup olmadığını kaydeder.
+
+Kullanım:
+    python benchmark_pipeline.py --sizes 1k,10k,100k
+    python benchmark_pipeline.py --sizes 1k --experts 50 --output-dir ./benchmarks
+    python benchmark_pipeline.py --compare benchmarks/eski.json benchmarks/yeni.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import approximate_electre
+import electre_kernels
+import mcdm_methods
+import outranking_graph
+import pipeline_metrics
+import rank_agreement
+import streaming_topsis
+import text_richness
+from ahp_methods import ahp_weights, combine_weights
+from candidate_features import (
+    FEATURE_STEPS, _featurize_chunk, anon_columns, calculate_social_activity_score_advanced
+)
+from minmax_scaler import MinMaxScaler
+from pipeline_metrics import span
+from synthetic_data import criteria, generate_candidate_pool, generate_expert_workbook
+
+# Varsayılan ayarlar
+DEFAULT_SIZES = "1k,10k,100k,1m"
+DEFAULT_OUTPUT_DIR = "./benchmarks"
+ELECTRE_MAX_N = 5000
+EMBEDDING_SAMPLE = 200
+REGRESSION_RATIO = 1.2
+
+
+# "10k" / "1m" / "2500" → satır sayısı
+def parse_size(text):
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def measure(stages, name, rows):
+    """Aşamayı pipeline_metrics span'i ile ölçüp stages listesine ekler."""
+    with span(name, rows=rows, stage=name) as record:
+        yield record
+    stages.append(record)
+
+
+# ---------------------- Aşamalar ----------------------
+
+def stage_featurize(df, workers=1):
+    if workers > 1:
+        return stage_featurize_parallel(df, workers)
+    for column, func, kwargs in FEATURE_STEPS:
+        if func is calculate_social_activity_score_advanced:
+            continue
+        with span(f"feature:{column}", rows=len(df)):
+            df[column] = df.apply(func, axis=1, **kwargs)
+    return df
+
+
+def stage_featurize_parallel(df, workers):
+    """Embedding dışındaki özellikler süreç havuzunda (parça sırası korunur)."""
+    chunk_size = max(1, -(-len(df) // (workers * 4)))
+    chunks = [df.iloc[start:start + chunk_size].copy() for start in range(0, len(df), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        features = pd.concat(executor.map(_featurize_chunk, chunks))
+    for column, func, _ in FEATURE_STEPS:
+        if func is not calculate_social_activity_score_advanced:
+            df[column] = features[column]
+    return df
+
+
+def stage_embedding(stages, df, sample_size, seed):
+    n_rows = len(df)
+    backend = text_richness.get_backend()
+    try:
+        backend.warm_up()  # model yükleme süresi ölçüme dahil değil
+    except ImportError:
+        stages.append({"stage": "embedding", "rows": n_rows, "skipped": "sentence_transformers kurulu değil"})
+        rng = np.random.default_rng(seed)
+        df["Sosyal Aktivite Skoru"] = rng.uniform(0, 100, size=n_rows)
+        return df
+
+    if backend.name != "transformer":
+        sample_size = n_rows  # hızlı backend tüm havuzda ölçülür
+    sample = df.sample(n=min(sample_size, n_rows), random_state=seed)
+    with measure(stages, "embedding", n_rows) as record:
+        record["backend"] = backend.name
+        sample_scores = sample.apply(calculate_social_activity_score_advanced, axis=1)
+    # Örnek süresinden tüm havuz süresini tahmin et
+    record["sampled_rows"] = len(sample)
+    record["extrapolated"] = len(sample) < n_rows
+    record["seconds"] = record["seconds"] / len(sample) * n_rows
+    record["rows_per_sec"] = n_rows / record["seconds"] if record["seconds"] > 0 else None
+    if len(sample) < n_rows:
+        # Örneklenmeyen satırlara örneklemin dağılımından değer ata
+        rng = np.random.default_rng(seed)
+        df["Sosyal Aktivite Skoru"] = rng.choice(sample_scores.values, size=n_rows)
+    else:
+        df["Sosyal Aktivite Skoru"] = sample_scores
+    return df
+
+
+def stage_scale(df):
+    df = MinMaxScaler(["Sosyal Aktivite Skoru"], suffix=" (0-100)").fit_transform(df)
+    columns_to_scale = [col for col in anon_columns if col != "ID" and col != "Deneyim Seviyesi (Kategori)"]
+    return MinMaxScaler(columns_to_scale).fit_transform(df[anon_columns])
+
+
+def stage_ahp(workbook_path):
+    expert_sheets = pd.read_excel(workbook_path, sheet_name=None, index_col=0)
+    weight_list = [ahp_weights(sheet.values.astype(float))[0] for sheet in expert_sheets.values()]
+    return pd.Series(combine_weights(weight_list), index=criteria)
+
+
+def run_size(n_rows, args, work_dir):
+    stages = []
+    spans = []  # aşamaların içindeki alt span'ler (ör. her feature fonksiyonu)
+
+    def collect(record):
+        if record["depth"] > 0:
+            spans.append(record)
+
+    pipeline_metrics.add_listener(collect)
+    print(f"\n=== {n_rows} aday ===")
+
+    with measure(stages, "generate", n_rows):
+        df = generate_candidate_pool(n_rows, args.seed)
+
+    with measure(stages, "featurize", n_rows):
+        df = stage_featurize(df, args.workers)
+
+    df = stage_embedding(stages, df, args.embedding_sample, args.seed)
+
+    with measure(stages, "scale", n_rows):
+        df_scaled = stage_scale(df)
+
+    workbook_path = os.path.join(work_dir, f"ahp_{args.experts}.xlsx")
+    if not os.path.exists(workbook_path):
+        generate_expert_workbook(workbook_path, args.experts, seed=args.seed)
+    with measure(stages, "ahp", args.experts):
+        weights = stage_ahp(workbook_path)
+
+    criteria_matrix = df_scaled[weights.index].values.astype(float)
+    with measure(stages, "topsis", n_rows):
+        topsis_scores = mcdm_methods.topsis_scores(criteria_matrix, weights.values)
+        df_scaled["TOPSIS_Score"] = topsis_scores
+        df_scaled["TOPSIS_Rank"] = mcdm_methods.descending_rank(topsis_scores)
+
+    # Bellek dışı TOPSIS: parça yazımı ölçüme dahil değil, iki geçiş + ilk k heap'i ölçülür
+    chunk_dir = os.path.join(work_dir, f"criteria_chunks_{n_rows}")
+    streaming_topsis.write_chunks(df_scaled[weights.index], chunk_dir)
+    with measure(stages, "topsis_stream", n_rows) as record:
+        scores_file = os.path.join(work_dir, f"topsis_scores_{n_rows}.npy")
+        top_df, stream_report = streaming_topsis.streaming_topsis(
+            chunk_dir, weights.values, list(weights.index), args.approx_top_k, scores_output=scores_file
+        )
+    record.update({key: stream_report[key] for key in ("n_chunks", "chunk_rows", "pass1_seconds", "pass2_seconds")})
+    record["max_abs_diff"] = float(np.max(np.abs(np.load(scores_file) - topsis_scores), initial=0))
+    record["top_k_match"] = top_df.index.tolist() == df_scaled["TOPSIS_Rank"].nsmallest(len(top_df)).index.tolist()
+
+    # Pareto ön filtresi: ELECTRE'nin kaçınacağı ikili karşılaştırma oranı
+    with measure(stages, "pareto", n_rows) as record:
+        _, _, prefilter_report = mcdm_methods.pareto_prefilter(criteria_matrix, max_layers=args.pareto_layers)
+        record.update(prefilter_report)
+
+    if n_rows <= args.electre_max_n:
+        with measure(stages, "electre", n_rows) as record:
+            n_profiles = len(np.unique(criteria_matrix, axis=0))
+            record.update({"n_profiles": n_profiles, "pairs_evaluated": n_profiles * (n_profiles - 1)})
+            record["backend"] = electre_kernels.resolve_backend(args.electre_backend)
+            dominance, _ = electre_kernels.dominance_counts(
+                criteria_matrix, weights.values, mcdm_methods.C_THRESHOLD, mcdm_methods.D_THRESHOLD, args.electre_backend
+            )
+            electre = mcdm_methods.electre_ranking(dominance, df_scaled.index)
+            df_scaled = df_scaled.join(electre)
+        with measure(stages, "pairwise_electre", n_rows) as electre_record:
+            mcdm_methods.ProfileElectreState(criteria_matrix)
+        with measure(stages, "pairwise_shared", n_rows) as record:
+            promethee_flows = mcdm_methods.PrometheeFlows(weights.values)
+            mcdm_methods.ProfileElectreState(criteria_matrix, consumers=[promethee_flows])
+            df_scaled["PROMETHEE_Net_Flow"] = promethee_flows.net_flows()
+        record["marginal_seconds"] = record["seconds"] - electre_record["seconds"]
+        with measure(stages, "vikor", n_rows):
+            df_scaled["VIKOR_Q"] = mcdm_methods.vikor_scores(criteria_matrix, weights.values)[2]
+        with measure(stages, "electre_graph", n_rows) as record:
+            adjacency = outranking_graph.sparse_outranking(criteria_matrix, weights.values)
+            record["edges"] = adjacency.nnz
+            record.update(outranking_graph.graph_summary(outranking_graph.graph_ranking(adjacency, df_scaled.index)))
+        if electre_kernels.numba_available():
+            with measure(stages, "electre_kernels", n_rows) as record:
+                record.update(electre_kernels.check_backends(criteria_matrix, weights.values))
+    else:
+        stages.append({"stage": "electre", "rows": n_rows, "skipped": f"n > --electre-max-n ({args.electre_max_n})"})
+        with measure(stages, "electre_approx", n_rows) as record:
+            electre, approx_report = approximate_electre.approximate_electre_ranking(
+                criteria_matrix, weights.values, df_scaled.index, args.approx_top_k, seed=args.seed,
+                backend=args.electre_backend,
+            )
+            record.update(approx_report)
+            df_scaled = df_scaled.join(electre)
+
+    with measure(stages, "rank_agreement", n_rows) as record:
+        record.update(rank_agreement.compare_rankings(df_scaled["TOPSIS_Rank"], df_scaled["ELECTRE_Rank"],
+                                                      ids=df_scaled.index))
+
+    if n_rows <= args.export_max_n:
+        with measure(stages, "export", n_rows):
+            df_scaled.to_excel(os.path.join(work_dir, "combined_ranking_report.xlsx"), index=False)
+    else:
+        stages.append({"stage": "export", "rows": n_rows, "skipped": f"n > --export-max-n ({args.export_max_n})"})
+
+    for record in stages:
+        if "skipped" in record:
+            print(f"  {record['stage']:<10} atlandı: {record['skipped']}")
+        else:
+            print(f"  {record['stage']:<10} {record['seconds']:9.3f} s  {record['rows_per_sec'] or 0:12.0f} satır/s  "
+                  f"tracemalloc {record['tracemalloc_peak_mb']:8.1f} MB")
+    pipeline_metrics.remove_listener(collect)
+    return {"n_rows": n_rows, "stages": stages, "spans": spans}
+
+
+# ---------------------- Karşılaştırma ----------------------
+
+def compare_results(old_path, new_path, threshold=REGRESSION_RATIO):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    def index(result):
+        return {(run["n_rows"], stage["stage"]): stage
+                for run in result["runs"] for stage in run["stages"] if "skipped" not in stage}
+
+    old_index, new_index = index(old), index(new)
+    print(f"Eski: {old.get('commit')}  Yeni: {new.get('commit')}")
+    print(f"{'n':>9} {'aşama':<10} {'eski (s)':>10} {'yeni (s)':>10} {'oran':>7}")
+    regressions = []
+    for key in sorted(set(old_index) & set(new_index)):
+        old_seconds, new_seconds = old_index[key]["seconds"], new_index[key]["seconds"]
+        ratio = new_seconds / old_seconds if old_seconds > 0 else float("inf")
+        flag = "  ← YAVAŞLAMA" if ratio > threshold else ""
+        if flag:
+            regressions.append(key)
+        print(f"{key[0]:>9} {key[1]:<10} {old_seconds:10.3f} {new_seconds:10.3f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik verilerle aşama bazlı pipeline benchmark'ı")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Virgülle ayrılmış boyutlar (ör. 1k,10k,100k,1m)")
+    parser.add_argument("--experts", type=int, default=6, help="Sentetik uzman sayısı")
+    parser.add_argument("--workers", type=int, default=1, help="featurize aşaması için süreç sayısı")
+    parser.add_argument("--embedding-sample", type=int, default=EMBEDDING_SAMPLE)
+    parser.add_argument("--electre-max-n", type=int, default=ELECTRE_MAX_N)
+    parser.add_argument("--electre-backend", choices=electre_kernels.BACKENDS, default="auto",
+                        help="ELECTRE sayım çekirdeği (numba kurulu değilse auto → numpy)")
+    parser.add_argument("--approx-top-k", type=int, default=100, help="Yaklaşık ELECTRE'de tam bulunacak ilk k")
+    parser.add_argument("--pareto-layers", type=int, default=3, help="Pareto ön filtresinde tutulacak katman sayısı")
+    parser.add_argument("--export-max-n", type=int, default=1_048_575, help="Excel satır sınırı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--compare", nargs=2, metavar=("ESKI_JSON", "YENI_JSON"))
+    parser.add_argument("--threshold", type=float, default=REGRESSION_RATIO, help="Yavaşlama sayılacak süre oranı")
+    pipeline_metrics.add_arguments(parser)
+    text_richness.add_arguments(parser)
+    args = parser.parse_args()
+    pipeline_metrics.configure_from_args(args)
+    text_richness.configure_from_args(args)
+    if electre_kernels.resolve_backend(args.electre_backend) == "numba":
+        electre_kernels.warm_up(len(criteria))  # derleme süresi ölçüme dahil edilmez
+
+    if args.compare:
+        regressions = compare_results(*args.compare, threshold=args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    commit = git_commit()
+    result = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "run_id": pipeline_metrics.run_id(),
+        "text_richness_backend": text_richness.backend_name(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("compare", "output_dir", "metrics", "profile_dir")},
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes.split(","):
+            result["runs"].append(run_size(parse_size(size), args, work_dir))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}_{commit or 'nocommit'}.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\nBenchmark sonuçları kaydedildi: {output_path}")
@@ -0,0 +1,287 @@
+"""
+Aday Özellik (Feature) Fonksiyonları
+====================================
+
+1_tamTemiz_pipeline.py'nin kullandığı referans tabloları ve satır bazlı skor
+fonksiyonları. Pipeline, skorlama servisi ve diğer betikler aynı fonksiyonları
+bu modülden kullanır.
+
+Embedding modeli (SentenceTransformer) ilk ihtiyaç anında bir kez yüklenir;
+böylece embedding gerektirmeyen kullanımlarda torch yüklenmez. Sosyal aktivite
+skorundaki metin zenginliği text_richness.py'deki seçili backend'den gelir
+(varsayılan: transformer embedding normu).
+
+featurize_parallel: embedding dışındaki satır fonksiyonları (tarih, regex,
+interpolasyon) aday parçaları halinde süreç havuzunda çalışır; embedding
+adımı aynı anda ana süreçte hesaplanır. Sonuçlar orijinal satır sırasıyla
+birleştirilir ve featurize ile aynıdır.
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import interp1d
+
+import text_richness
+from pipeline_metrics import span
+
+# ---------------------- Referans Veri ve Sözlükler ----------------------
+
+# Yabancı dil seviye dönüşümü
+lang_level_dict = { 0: "Zayıf", 33: "Orta", 66: "İyi", 99: "Çok iyi" }
+level_to_score = {v: k for k, v in lang_level_dict.items()}
+lang_weight_dict = { "Konuşma": 40, "Yazma": 30, "Okuma": 30 }
+
+# Eğitim seviyesi dönüşümü
+education_level_dict = { "Lise": 0, "Lisans/Ön Lisans": 1, "Yüksek Lisans": 2, "Doktora": 3 }
+
+# Bilgisayar yetkinliği interpolasyon referansı
+software_reference_data = {
+    "x": [0,1,2,3,4,5,7,9,12,15,25,30],
+    "y": [0,15,40,60,65,70,75,80,85,90,95,100]
+}
+software_reference_df = pd.DataFrame(software_reference_data)
+
+# Sertifika skoru interpolasyon referansı
+certificate_reference_data = {
+    "x": [0, 1, 2, 3, 5, 7, 10, 15, 20],
+    "y": [0, 5, 10, 25, 50, 70, 90, 95, 100]
+}
+certificate_reference_df = pd.DataFrame(certificate_reference_data)
+
+# Sosyal aktivite skoru için embedding modeli
+EMBEDDING_MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+_embedding_model = None
+
+# Anonim çıktıda (ve sıralamada) kullanılan kolonlar
+anon_columns = [
+    "ID",
+    "Deneyim Seviyesi (Kategori)",
+    "Yabancı Dil Skoru",
+    "Eğitim Seviyesi Skoru",
+    "Basic Computer Skills Skoru",
+    "Katıldığınız Kurs/Seminer/Sertifika Skoru",
+    "Sosyal Aktivite Skoru (0-100)"
+]
+
+
+def get_embedding_model():
+    """SentenceTransformer modelini ilk çağrıda yükler, sonra aynısını döndürür."""
+    global _embedding_model
+    if _embedding_model is None:
+        from sentence_transformers import SentenceTransformer
+        _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return _embedding_model
+
+
+# Sütun adlarını temizle (çok satırlı / fazla boşluklu başlıklar)
+def clean_columns(df):
+    df.columns = df.columns.str.replace(r'\s+', ' ', regex=True).str.strip()
+    return df
+
+# ---------------------- Özellik (Feature) Fonksiyonları ----------------------
+
+# 1️⃣ Deneyim Süresi (gün cinsinden)
+def handle_experience(row):
+    toplam_gun = 0
+    for i in range(1, 5):
+        start = pd.to_datetime(row.get(f"{i}. Kuruma Başlangıç Tarihi"), errors='coerce', dayfirst=True)
+        end = pd.to_datetime(row.get(f"{i}. Kurumdan Çıkış Tarihi"), errors='coerce', dayfirst=True)
+        if pd.notnull(start) and pd.notnull(end):
+            sure = (end - start).days
+            if sure > 0:
+                toplam_gun += sure
+    return toplam_gun
+
+# 2️⃣ Deneyim Seviyesi (Kategori)
+def categorize_experience_days(row):
+    days = row["Toplam Deneyim (gün)"]
+    if days < 180:
+        return 0
+    elif 180 <= days < 365:
+        return 1
+    elif 365 <= days < 1095:
+        return 2
+    else:  # 1095 gün ve üzeri
+        return 4
+
+# 3️⃣ Yabancı Dil Skoru
+def calculate_language_score(row):
+    toplam_skor = 0
+    for beceri, agirlik in lang_weight_dict.items():
+        seviye = row.get(beceri, "")
+        seviye_skor = level_to_score.get(seviye, 0)
+        toplam_skor += (seviye_skor * agirlik) / 100
+    return toplam_skor
+
+# 4️⃣ Sertifika Sayısı
+def count_certificates(row):
+    metin = str(row.get("Katıldığınız Kurs/Seminer/Sertifika/ Ödül ve Takdirler", "")).strip()
+    if metin == "":
+        return 0
+    return len(metin.split("\n"))
+
+# 5️⃣ Sertifika Skoru (Interpolasyon)
+def certificate_score_with_reference(row, reference_df):
+    # Sayı kolonu önceden hesaplandıysa (FEATURE_STEPS sırası / lineage önbelleği) yeniden sayılmaz
+    cert_count = row.get("Katıldığınız Kurs/Seminer/Sertifika Sayısı")
+    if cert_count is None or pd.isna(cert_count):
+        cert_count = count_certificates(row)
+    interpolator = interp1d(reference_df["x"].values, reference_df["y"].values, kind='linear', fill_value='extrapolate')
+    score = interpolator(cert_count)
+    return min(score, 100)
+
+# 6️⃣ Eğitim Seviyesi Skoru
+def get_education_level(row):
+    seviye = row.get("Eğitim Durumunuz", "")
+    return education_level_dict.get(seviye, 0)
+
+# 7️⃣ Bilgisayar Yetkinliği Sayısı
+def count_software_skills(row):
+    metin = str(row.get("Yazılım Bilginiz", "")).strip()
+    if metin == "":
+        return 0
+    metin = re.sub(r'[\-\n,;]', ';', metin)
+    metin = re.sub(r'\s{2,}', ' ', metin)
+    ogeler = [item.strip() for item in metin.split(';') if item.strip() != '']
+    return len(ogeler)
+
+# 8️⃣ Bilgisayar Yetkinliği Skoru
+def software_skill_score_with_reference(row, reference_df):
+    yetkinlik_sayisi = row.get("Yazılım Bilgisi Sayısı")
+    if yetkinlik_sayisi is None or pd.isna(yetkinlik_sayisi):
+        yetkinlik_sayisi = count_software_skills(row)
+    interpolator = interp1d(reference_df["x"].values, reference_df["y"].values, kind='linear', fill_value='extrapolate')
+    score = interpolator(yetkinlik_sayisi)
+    return min(score, 100)
+
+# 9️⃣ Sosyal Aktivite Skoru (ileri seviye)
+def calculate_social_activity_score_advanced(row, backend=None):
+    hobiler = str(row.get("Hobileriniz", "")).strip()
+    dernekler = str(row.get("Üye olduğunuz dernek ve kuruluşlar", "")).strip()
+
+    if hobiler == "" and dernekler == "":
+        return 0
+
+    hobiler_clean = re.sub(r'[\-\n,;]', ';', hobiler)
+    hobiler_list = [item.strip() for item in hobiler_clean.split(';') if item.strip() != '']
+    hobiler_sayisi = len(hobiler_list)
+
+    dernek_clean = re.sub(r'[\-\n,;]', ';', dernekler)
+    dernek_list = [item.strip() for item in dernek_clean.split(';') if item.strip() != '']
+    dernek_sayisi = len(dernek_list)
+
+    full_text = hobiler + " " + dernekler
+    kelime_sayisi = len(full_text.split())
+    # Metin zenginliği: seçili backend (transformer → embedding normu)
+    embedding_norm = (backend or text_richness.get_backend()).richness(full_text)
+
+    hobi_skor = min(hobiler_sayisi * 20, 60)
+    dernek_skor = min(dernek_sayisi * 25, 50)
+    zenginlik_skor = min((embedding_norm / 10 * 50) + (kelime_sayisi / 50 * 25), 50)
+
+    ham_skor = hobi_skor + dernek_skor + zenginlik_skor
+    normalize_skor = min(ham_skor / 150 * 100, 100)
+
+    return normalize_skor
+
+# ---------------------- Toplu Uygulama ----------------------
+
+# Skor kolonları ve üretim sırası: (kolon, fonksiyon, ek parametreler)
+FEATURE_STEPS = [
+    ("Toplam Deneyim (gün)", handle_experience, {}),
+    ("Deneyim Seviyesi (Kategori)", categorize_experience_days, {}),
+    ("Yabancı Dil Skoru", calculate_language_score, {}),
+    ("Katıldığınız Kurs/Seminer/Sertifika Sayısı", count_certificates, {}),
+    ("Katıldığınız Kurs/Seminer/Sertifika Skoru", certificate_score_with_reference, {"reference_df": certificate_reference_df}),
+    ("Eğitim Seviyesi Skoru", get_education_level, {}),
+    ("Yazılım Bilgisi Sayısı", count_software_skills, {}),
+    ("Basic Computer Skills Skoru", software_skill_score_with_reference, {"reference_df": software_reference_df}),
+    ("Sosyal Aktivite Skoru", calculate_social_activity_score_advanced, {}),
+]
+
+# Skor fonksiyonlarının okuduğu ham kolonlar
+RAW_INPUT_COLUMNS = (
+    [f"{i}. Kuruma Başlangıç Tarihi" for i in range(1, 5)]
+    + [f"{i}. Kurumdan Çıkış Tarihi" for i in range(1, 5)]
+    + list(lang_weight_dict)
+    + [
+        "Katıldığınız Kurs/Seminer/Sertifika/ Ödül ve Takdirler",
+        "Eğitim Durumunuz",
+        "Yazılım Bilginiz",
+        "Hobileriniz",
+        "Üye olduğunuz dernek ve kuruluşlar",
+    ]
+)
+
+# Kolon düzeyinde soy (lineage): her skor kolonunun okuduğu kolonlar ve bağlı
+# olduğu parametreler (bu modüldeki referans tabloları; "text_richness" → seçili
+# zenginlik backend'i). feature_lineage.py bu bildirimle yalnızca etkilenen
+# kolonları yeniden hesaplar.
+FEATURE_LINEAGE = {
+    "Toplam Deneyim (gün)": {
+        "inputs": [f"{i}. Kuruma Başlangıç Tarihi" for i in range(1, 5)] + [f"{i}. Kurumdan Çıkış Tarihi" for i in range(1, 5)],
+        "params": [],
+    },
+    "Deneyim Seviyesi (Kategori)": {"inputs": ["Toplam Deneyim (gün)"], "params": []},
+    "Yabancı Dil Skoru": {"inputs": list(lang_weight_dict), "params": ["lang_level_dict", "lang_weight_dict"]},
+    "Katıldığınız Kurs/Seminer/Sertifika Sayısı": {
+        "inputs": ["Katıldığınız Kurs/Seminer/Sertifika/ Ödül ve Takdirler"], "params": [],
+    },
+    "Katıldığınız Kurs/Seminer/Sertifika Skoru": {
+        "inputs": ["Katıldığınız Kurs/Seminer/Sertifika Sayısı"], "params": ["certificate_reference_data"],
+    },
+    "Eğitim Seviyesi Skoru": {"inputs": ["Eğitim Durumunuz"], "params": ["education_level_dict"]},
+    "Yazılım Bilgisi Sayısı": {"inputs": ["Yazılım Bilginiz"], "params": []},
+    "Basic Computer Skills Skoru": {"inputs": ["Yazılım Bilgisi Sayısı"], "params": ["software_reference_data"]},
+    "Sosyal Aktivite Skoru": {
+        "inputs": ["Hobileriniz", "Üye olduğunuz dernek ve kuruluşlar"], "params": ["text_richness"],
+    },
+}
+
+# Tüm skor kolonlarını sırasıyla ekle (her adım ayrı ölçüm span'i)
+def featurize(df):
+    for column, func, kwargs in FEATURE_STEPS:
+        kind = f"embedding[{text_richness.backend_name()}]" if func is calculate_social_activity_score_advanced else "feature"
+        with span(f"{kind}:{column}", rows=len(df)):
+            df[column] = df.apply(func, axis=1, **kwargs)
+    return df
+
+# Süreç havuzundaki işçi: embedding dışındaki adımlar (parça içinde sırayla)
+def _featurize_chunk(chunk):
+    for column, func, kwargs in FEATURE_STEPS:
+        if func is not calculate_social_activity_score_advanced:
+            chunk[column] = chunk.apply(func, axis=1, **kwargs)
+    return chunk.drop(columns=[col for col in RAW_INPUT_COLUMNS if col in chunk.columns])
+
+# featurize'ın süreç havuzlu sürümü (workers <= 1 → featurize)
+def featurize_parallel(df, workers, chunk_size=None):
+    if workers <= 1 or len(df) == 0:
+        return featurize(df)
+    chunk_size = chunk_size or max(1, -(-len(df) // (workers * 4)))
+    # İşçilere yalnızca skor fonksiyonlarının okuduğu ham kolonlar gönderilir
+    raw = df[[col for col in RAW_INPUT_COLUMNS if col in df.columns]]
+    chunks = [raw.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        with span("feature:parallel", rows=len(df), workers=workers, chunks=len(chunks)):
+            futures = [executor.submit(_featurize_chunk, chunk.copy()) for chunk in chunks]
+            # Embedding ana süreçte, işçiler çalışırken hesaplanır
+            with span(f"embedding[{text_richness.backend_name()}]:Sosyal Aktivite Skoru", rows=len(df)):
+                social_scores = df.apply(calculate_social_activity_score_advanced, axis=1)
+            features = pd.concat([future.result() for future in futures])  # gönderim sırası = satır sırası
+
+    for column, func, _ in FEATURE_STEPS:
+        df[column] = social_scores if func is calculate_social_activity_score_advanced else features[column]
+    return df
+
+# Tek bir ham kaydı (dict) DataFrame oluşturmadan skorla
+def featurize_record(record):
+    # Eksik ham kolonlar DataFrame'deki gibi NaN olur → sonuçlar featurize ile aynı
+    row = {column: np.nan for column in RAW_INPUT_COLUMNS}
+    row.update({re.sub(r'\s+', ' ', str(key)).strip(): value for key, value in record.items()})
+    for column, func, kwargs in FEATURE_STEPS:
+        row[column] = func(row, **kwargs)
+    return row
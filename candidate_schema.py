@@ -0,0 +1,100 @@
+"""
+Aday Tabloları için Kompakt Veri Tipi Şeması
+============================================
+
+Excel çıktılarında tüm skorlar float64/object olarak tutulur ve
+processed_candidates_full.xlsx tüm serbest metni taşıyordu. Bu modül özellik
+tabloları için bildirilmiş bir şema tanımlar:
+- Kategoriler (Deneyim Seviyesi, Eğitim Seviyesi Skoru) → uint8
+- Sayımlar → uint16, gün → uint32, skorlar → float32 (sıralama girdisinde float64)
+- Okuma/Yazma/Konuşma ve Eğitim Durumunuz → sıralı categorical
+- Ham metin / kişisel bilgi kolonları → ayrı tablo (candidate_raw_text.pkl)
+
+Kompakt tablolar veri tiplerini koruması için pickle olarak kaydedilir; Excel
+çıktıları okunabilirlik için üretilmeye devam eder (processed_candidates_full.xlsx
+artık özellik tablosundan yazılır, ham metin yalnızca candidate_raw_text.pkl'dedir).
+Sıralama betikleri candidate_criteria.pkl varsa doğrudan onu, yoksa Excel dosyasını okur.
+
+Not: Kategori listesinde olmayan dil/eğitim değerleri categorical dönüşümde NaN
+olur; skor fonksiyonları bu değerlere zaten 0 verdiği için skorlar değişmez.
+"""
+
+import os
+
+import pandas as pd
+
+from candidate_features import anon_columns, education_level_dict
+
+# Dosya yolları
+features_path = "./outputs/candidate_features.pkl"
+raw_text_path = "./outputs/candidate_raw_text.pkl"
+criteria_path = "./outputs/candidate_criteria.pkl"
+criteria_excel_path = "./outputs/processed_candidates_anonymized_scaled.xlsx"
+
+# Kategorik seviyeler (aday_havuzu.xlsx'teki yazımlarıyla)
+LANGUAGE_LEVELS = ["Zayıf", "Orta", "İyi", "Çok İyi"]
+language_level_dtype = pd.CategoricalDtype(LANGUAGE_LEVELS, ordered=True)
+education_dtype = pd.CategoricalDtype(list(education_level_dict), ordered=True)
+
+CATEGORICAL_DTYPES = {
+    "Okuma": language_level_dtype,
+    "Yazma": language_level_dtype,
+    "Konuşma": language_level_dtype,
+    "Eğitim Durumunuz": education_dtype,
+}
+
+# Özellik (skor) kolonları
+FEATURE_DTYPES = {
+    "ID": "uint32",
+    "Toplam Deneyim (gün)": "uint32",
+    "Deneyim Seviyesi (Kategori)": "uint8",
+    "Yabancı Dil Skoru": "float32",
+    "Katıldığınız Kurs/Seminer/Sertifika Sayısı": "uint16",
+    "Katıldığınız Kurs/Seminer/Sertifika Skoru": "float32",
+    "Eğitim Seviyesi Skoru": "uint8",
+    "Yazılım Bilgisi Sayısı": "uint16",
+    "Basic Computer Skills Skoru": "float32",
+    "Sosyal Aktivite Skoru": "float32",
+    "Sosyal Aktivite Skoru (0-100)": "float32",
+}
+
+# Sıralamada kullanılan kriter tablosu (ID indeksli, "(Scaled)" kopyaları olmadan).
+# Sürekli skorlar float64 kalır: float32 yuvarlaması birbirine çok yakın değerleri
+# eşitleyip ELECTRE concordance/discordance karşılaştırmalarını değiştirebiliyor.
+CRITERIA_DTYPES = {
+    col: "float64" if FEATURE_DTYPES[col] == "float32" else FEATURE_DTYPES[col]
+    for col in anon_columns if col != "ID"
+}
+
+
+def apply_schema(df, dtypes):
+    """Tabloda bulunan kolonları şemadaki tiplere çevir."""
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+
+
+def split_compact(df):
+    """Featurize edilmiş tam tablo → (kompakt özellik tablosu, ham metin tablosu)."""
+    feature_columns = [col for col in ["ID", *CATEGORICAL_DTYPES, *FEATURE_DTYPES] if col in df.columns]
+    feature_columns = list(dict.fromkeys(feature_columns))
+    features = apply_schema(df[feature_columns], {**FEATURE_DTYPES, **CATEGORICAL_DTYPES})
+    raw_columns = [col for col in df.columns if col not in feature_columns]
+    raw_text = df[["ID", *raw_columns]].astype({"ID": FEATURE_DTYPES["ID"]})
+    return features, raw_text
+
+
+def compact_criteria(df):
+    """Kriter tablosunu (ID + anon kolonlar) kompakt tiplere çevir, ID'yi indeks yap."""
+    criteria = df[anon_columns] if "ID" in df.columns else df[list(CRITERIA_DTYPES)]
+    criteria = apply_schema(criteria, {"ID": FEATURE_DTYPES["ID"], **CRITERIA_DTYPES})
+    return criteria.set_index("ID") if "ID" in criteria.columns else criteria
+
+
+def load_criteria(path=criteria_path, excel_path=criteria_excel_path):
+    """Kompakt kriter tablosu (varsa) veya Excel'den ID indeksli kriter tablosu."""
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+    return pd.read_excel(excel_path).set_index("ID")
+
+
+def bytes_per_candidate(df):
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
@@ -0,0 +1,244 @@
+"""
+ELECTRE İkili Karşılaştırma Çekirdekleri (NumPy / Numba)
+========================================================
+
+NumPy sürümü (mcdm_methods) farkları blok blok b × n × m geçici dizilerle
+hesaplar. Numba kuruluysa aynı hesabı her (i, j) çifti için tek döngüde
+yapan, satırlara paralel (prange) derlenmiş çekirdek kullanılır:
+concordance kodu, discordance, eşik karşılaştırması ve baskınlık sayımı
+geçici dizi oluşturmadan birleştirilir.
+
+- backend="auto": Numba varsa "numba", yoksa "numpy"
+- Concordance, NumPy sürümüyle aynı ağırlık tablosundan (concordance_weight_table)
+  okunur; iki çekirdeğin sonuçları birebir aynıdır (check_backends,
+  tests/test_electre_kernels.py)
+- Çekirdek benzersiz profiller üzerinde çalışır, sayımlar profil
+  çokluklarıyla ağırlıklandırılır (ProfileElectreState ile aynı)
+
+Numba opsiyoneldir (pip install numba); ilk çağrıda derleme süresi eklenir.
+
+Kullanım (iki çekirdeği karşılaştır):
+    python electre_kernels.py --adaylar 3000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import mcdm_methods
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba opsiyonel
+    njit = None
+    prange = range
+
+BACKENDS = ("auto", "numpy", "numba")
+
+
+def numba_available():
+    return njit is not None
+
+
+def resolve_backend(backend="auto"):
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen ELECTRE çekirdeği: {backend} (seçenekler: {', '.join(BACKENDS)})")
+    if backend == "auto":
+        return "numba" if numba_available() else "numpy"
+    if backend == "numba" and not numba_available():
+        raise ImportError("Numba kurulu değil: pip install numba (veya backend='numpy')")
+    return backend
+
+
+# ---------------------- Döngü çekirdekleri ----------------------
+
+def _pair_codes(x_i, x_j):
+    """(i → j concordance kodu, j → i kodu, D(i, j), D(j, i)); mcdm_methods ile aynı C/D tanımı."""
+    forward_code = 0
+    backward_code = 0
+    max_diff = 0.0
+    worst_forward = -np.inf
+    worst_backward = -np.inf
+    for k in range(x_i.shape[0]):
+        diff = x_j[k] - x_i[k]
+        if diff <= 0:
+            forward_code += 1 << k
+        if diff >= 0:
+            backward_code += 1 << k
+        if abs(diff) > max_diff:
+            max_diff = abs(diff)
+        if diff > worst_forward:
+            worst_forward = diff
+        if -diff > worst_backward:
+            worst_backward = -diff
+    if max_diff == 0:
+        D_forward = 0.0
+        D_backward = 0.0
+    else:
+        D_forward = worst_forward / max_diff
+        D_backward = worst_backward / max_diff
+    return forward_code, backward_code, D_forward, D_backward
+
+
+def _pair_outranks(x_i, x_j, weight_table, C_threshold, D_threshold):
+    """(i → j, j → i) baskınlıkları."""
+    forward_code, backward_code, D_forward, D_backward = _pair_codes(x_i, x_j)
+    forward = weight_table[forward_code] >= C_threshold and D_forward <= D_threshold
+    backward = weight_table[backward_code] >= C_threshold and D_backward <= D_threshold
+    return forward, backward
+
+
+def _profile_counts_kernel(profiles, counts, weight_table, C_threshold, D_threshold):
+    """Profil başına (baskılanan, baskılayan) aday sayıları; profil içi i == j çifti hariç."""
+    n_profiles = profiles.shape[0]
+    dominance = np.zeros(n_profiles, dtype=np.int64)
+    dominated_by = np.zeros(n_profiles, dtype=np.int64)
+    for p in prange(n_profiles):
+        for q in range(n_profiles):
+            forward, backward = _pair_outranks(profiles[p], profiles[q], weight_table, C_threshold, D_threshold)
+            if forward:
+                dominance[p] += counts[q]
+            if backward:
+                dominated_by[p] += counts[q]
+        # Adayın kendisiyle olan çifti (profil köşegeni) sayılmaz
+        forward, backward = _pair_outranks(profiles[p], profiles[p], weight_table, C_threshold, D_threshold)
+        if forward:
+            dominance[p] -= 1
+        if backward:
+            dominated_by[p] -= 1
+    return dominance, dominated_by
+
+
+def _against_pool_kernel(pool_matrix, candidates, weight_table, C_threshold, D_threshold):
+    """Aday başına havuzda (baskıladığı, baskılandığı) aday sayısı."""
+    n_candidates = candidates.shape[0]
+    outranks = np.zeros(n_candidates, dtype=np.int64)
+    outranked_by = np.zeros(n_candidates, dtype=np.int64)
+    for k in prange(n_candidates):
+        for j in range(pool_matrix.shape[0]):
+            forward, backward = _pair_outranks(candidates[k], pool_matrix[j], weight_table, C_threshold, D_threshold)
+            if forward:
+                outranks[k] += 1
+            if backward:
+                outranked_by[k] += 1
+    return outranks, outranked_by
+
+
+def _pair_matrices_kernel(criteria_matrix, weight_table):
+    """n × n concordance ve discordance matrisleri (köşegen 0)."""
+    n_candidates = criteria_matrix.shape[0]
+    C_matrix = np.zeros((n_candidates, n_candidates))
+    D_matrix = np.zeros((n_candidates, n_candidates))
+    for i in prange(n_candidates):
+        for j in range(n_candidates):
+            if i != j:
+                forward_code, _, D_forward, _ = _pair_codes(criteria_matrix[i], criteria_matrix[j])
+                C_matrix[i, j] = weight_table[forward_code]
+                D_matrix[i, j] = D_forward
+    return C_matrix, D_matrix
+
+
+if njit is not None:
+    _pair_codes = njit(cache=True)(_pair_codes)
+    _pair_outranks = njit(cache=True)(_pair_outranks)
+    _pair_matrices_kernel = njit(parallel=True, cache=True)(_pair_matrices_kernel)
+    _profile_counts_kernel = njit(parallel=True, cache=True)(_profile_counts_kernel)
+    _against_pool_kernel = njit(parallel=True, cache=True)(_against_pool_kernel)
+
+
+# ---------------------- Ortak arayüz ----------------------
+
+def dominance_counts(criteria_matrix, weights, C_threshold=mcdm_methods.C_THRESHOLD,
+                     D_threshold=mcdm_methods.D_THRESHOLD, backend="auto"):
+    """Aday başına (ELECTRE baskınlık skoru, baskılanma sayısı)."""
+    backend = resolve_backend(backend)
+    criteria_matrix = np.asarray(criteria_matrix, dtype=float)
+    if backend == "numpy":
+        state = mcdm_methods.ProfileElectreState(criteria_matrix)
+        return (state.dominance_scores(weights, C_threshold, D_threshold),
+                state.dominated_by_scores(weights, C_threshold, D_threshold))
+
+    profiles, inverse, counts = np.unique(criteria_matrix, axis=0, return_inverse=True, return_counts=True)
+    weight_table = mcdm_methods.concordance_weight_table(np.asarray(weights, dtype=float))
+    dominance, dominated_by = _profile_counts_kernel(
+        np.ascontiguousarray(profiles), counts.astype(np.int64), weight_table, float(C_threshold), float(D_threshold)
+    )
+    inverse = inverse.reshape(-1)
+    return dominance[inverse], dominated_by[inverse]
+
+
+def pairwise_matrices(criteria_matrix, weights, backend="auto"):
+    """n × n (concordance, discordance) matrisleri; çekirdeklerin C/D tanımını doğrulamak için."""
+    backend = resolve_backend(backend)
+    criteria_matrix = np.asarray(criteria_matrix, dtype=float)
+    if backend == "numpy":
+        state = mcdm_methods.ElectrePairwiseState(criteria_matrix)
+        return state.concordance(weights), state.D_matrix
+    weight_table = mcdm_methods.concordance_weight_table(np.asarray(weights, dtype=float))
+    return _pair_matrices_kernel(np.ascontiguousarray(criteria_matrix), weight_table)
+
+
+def outranking_counts(pool_matrix, candidates, weights, C_threshold=mcdm_methods.C_THRESHOLD,
+                      D_threshold=mcdm_methods.D_THRESHOLD, backend="auto", pair_budget=2_000_000):
+    """Aday başına havuzda (baskıladığı, baskılandığı) aday sayısı; özdeş çiftler dahil."""
+    backend = resolve_backend(backend)
+    pool_matrix = np.asarray(pool_matrix, dtype=float)
+    candidates = np.atleast_2d(np.asarray(candidates, dtype=float))
+    if backend == "numba":
+        weight_table = mcdm_methods.concordance_weight_table(np.asarray(weights, dtype=float))
+        return _against_pool_kernel(np.ascontiguousarray(pool_matrix), np.ascontiguousarray(candidates),
+                                    weight_table, float(C_threshold), float(D_threshold))
+
+    outranks = np.zeros(len(candidates), dtype=np.int64)
+    outranked_by = np.zeros(len(candidates), dtype=np.int64)
+    chunk_size = max(1, pair_budget // max(len(pool_matrix), 1))
+    for start in range(0, len(candidates), chunk_size):
+        chunk_outranks, chunk_outranked_by = mcdm_methods.electre_against_pool(
+            pool_matrix, candidates[start:start + chunk_size], weights, C_threshold, D_threshold
+        )
+        outranks[start:start + chunk_size] = chunk_outranks.sum(axis=1)
+        outranked_by[start:start + chunk_size] = chunk_outranked_by.sum(axis=1)
+    return outranks, outranked_by
+
+
+def warm_up(n_criteria=8):
+    """Numba çekirdeklerini küçük bir girdiyle derle (ilk çağrı gecikmesi ölçümlere girmesin)."""
+    if numba_available():
+        criteria_matrix = np.arange(2 * n_criteria, dtype=float).reshape(2, n_criteria)
+        weights = np.full(n_criteria, 1 / n_criteria)
+        dominance_counts(criteria_matrix, weights, backend="numba")
+        outranking_counts(criteria_matrix, criteria_matrix, weights, backend="numba")
+
+
+def check_backends(criteria_matrix, weights, C_threshold=mcdm_methods.C_THRESHOLD,
+                   D_threshold=mcdm_methods.D_THRESHOLD):
+    """İki çekirdeği aynı girdide çalıştır; süreler ve sonuçların aynı olup olmadığı."""
+    report = {"numba_available": numba_available()}
+    results = {}
+    for backend in ("numpy", "numba") if numba_available() else ("numpy",):
+        start = time.perf_counter()
+        results[backend] = dominance_counts(criteria_matrix, weights, C_threshold, D_threshold, backend)
+        report[f"{backend}_seconds"] = time.perf_counter() - start
+    if "numba" in results:
+        report["match"] = all(np.array_equal(a, b) for a, b in zip(results["numpy"], results["numba"]))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NumPy ve Numba ELECTRE çekirdeklerini karşılaştır")
+    parser.add_argument("--adaylar", type=int, default=3000, help="Rastgele aday sayısı")
+    parser.add_argument("--kriterler", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    criteria_matrix = np.round(rng.uniform(0, 100, size=(args.adaylar, args.kriterler)))
+    weights = rng.dirichlet(np.ones(args.kriterler))
+
+    warm_up(args.kriterler)  # derleme süresi karşılaştırmaya dahil edilmez
+    report = check_backends(criteria_matrix, weights)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    if report.get("match") is False:
+        raise SystemExit("UYARI: NumPy ve Numba çekirdeklerinin sonuçları farklı.")
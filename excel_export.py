@@ -0,0 +1,153 @@
+"""
+Akışlı (Sabit Bellekli) Excel Dışa Aktarımı
+===========================================
+
+DataFrame.to_excel (openpyxl) tüm çalışma kitabını bellekte hücre nesneleri
+olarak kurar; n × n ELECTRE matrislerinde çok yavaştır. Bu modül satırları
+sırayla diske yazar:
+- xlsxwriter kuruluysa constant_memory modu (satır yazıldıktan sonra bellekten
+  atılır), değilse openpyxl write-only çalışma sayfası
+- Sütun biçimleri (başlık, tarih) yazımdan önce bir kez hazırlanır
+- Çıktı pandas.read_excel ile to_excel çıktısıyla aynı okunur (indeks ilk
+  sütun, NaN/NA → boş hücre)
+
+BackgroundExporter dışa aktarımları tek bir arka plan thread'inde sırayla
+çalıştırır; sıralama sonucu Excel dosyaları bitmeden kullanılabilir.
+wait() tüm dosyalar yazılana kadar bekler ve hata varsa yeniden fırlatır.
+Metrik açıkken (pipeline_metrics.enabled()) yazımlar submit içinde, ana
+thread'de eşzamanlı yapılır: write:<dosya> span'lerinin süresi ve tracemalloc
+tepesi tam ölçülür (arka plan thread'indeki span'lerde bellek tepesi yoktur).
+"""
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+import pipeline_metrics
+from pipeline_metrics import span
+
+try:
+    import xlsxwriter
+except ImportError:  # xlsxwriter opsiyonel
+    xlsxwriter = None
+
+DEFAULT_SHEET = "Sheet1"
+
+
+def _clean(value):
+    """Excel'e yazılamayan değerleri (NaN, NA, NaT, numpy skalerleri) dönüştür."""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+        return None if isinstance(value, float) and math.isnan(value) else value
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+
+def _header(df, index):
+    """Başlık satırı; sayısal kolon adları (ör. matrislerde ID) sayı olarak kalır."""
+    columns = [_clean(col) for col in df.columns]
+    if not index:
+        return columns
+    return [df.index.name if df.index.name is not None else ""] + columns
+
+
+def iter_rows(df, index=True):
+    """Satırları Excel'e yazılabilir Python değerleri listesi olarak üret."""
+    for row in df.itertuples(index=index, name=None):
+        yield [_clean(value) for value in row]
+
+
+def _write_xlsxwriter(df, path, sheet_name, index):
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet(sheet_name)
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+    date_format = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+    worksheet.write_row(0, 0, _header(df, index), header_format)
+    for row_number, row in enumerate(iter_rows(df, index), start=1):
+        for col_number, value in enumerate(row):
+            if value is None:
+                continue
+            if isinstance(value, (datetime, date)):
+                worksheet.write_datetime(row_number, col_number, value, date_format)
+            else:
+                worksheet.write(row_number, col_number, value)
+    workbook.close()
+
+
+def _write_openpyxl(df, path, sheet_name, index):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    thin = Side(style="thin")
+    header_style = {"font": Font(bold=True), "border": Border(left=thin, right=thin, top=thin, bottom=thin),
+                    "alignment": Alignment(horizontal="center")}
+
+    header_cells = []
+    for title in _header(df, index):
+        cell = WriteOnlyCell(worksheet, value=title)
+        for attribute, style in header_style.items():
+            setattr(cell, attribute, style)
+        header_cells.append(cell)
+    worksheet.append(header_cells)
+    for row in iter_rows(df, index):
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def write_frame(df, path, sheet_name=DEFAULT_SHEET, index=True):
+    """DataFrame'i satır satır .xlsx olarak yaz (to_excel yerine)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if xlsxwriter is not None:
+        _write_xlsxwriter(df, path, sheet_name, index)
+    else:
+        _write_openpyxl(df, path, sheet_name, index)
+    return path
+
+
+class BackgroundExporter:
+    """Excel yazımlarını tek arka plan thread'inde sırayla çalıştırır.
+
+    background=None → metrik kapalıyken arka planda, açıkken eşzamanlı (ölçüm için).
+    """
+
+    def __init__(self, background=None):
+        self.background = not pipeline_metrics.enabled() if background is None else background
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel_export") if self.background else None
+        self._jobs = []
+        self._written = []
+
+    def submit(self, df, path, sheet_name=DEFAULT_SHEET, index=True):
+        if not self.background:
+            with span(f"write:{os.path.basename(path)}", rows=len(df)):
+                self._written.append(write_frame(df, path, sheet_name, index))
+            return
+
+        def job():
+            with span(f"write:{os.path.basename(path)}", rows=len(df), background=True):
+                return write_frame(df, path, sheet_name, index)
+        self._jobs.append((path, self._executor.submit(job)))
+
+    @property
+    def pending(self):
+        return [path for path, future in self._jobs if not future.done()]
+
+    def wait(self):
+        """Tüm dosyalar yazılana kadar bekle; yazılan yolları döndür."""
+        paths = self._written + [future.result() for _, future in self._jobs]
+        if self._executor is not None:
+            self._executor.shutdown()
+        return paths
@@ -0,0 +1,207 @@
+"""
+Kolon Düzeyinde Soy (Lineage) ve Artımlı Özellik Hesabı
+=======================================================
+
+Referans tablolarından biri (software_reference_data, certificate_reference_data,
+lang_weight_dict, education_level_dict, ...) değiştiğinde aşama 1'in tamamı
+(embedding dahil) yeniden çalışıyordu. candidate_features.FEATURE_LINEAGE her
+skor kolonunun okuduğu kolonları ve bağlı olduğu parametreleri bildirir. Bu
+modül her kolon için bir parmak izi üretir:
+- kod: skor fonksiyonunun kaynak kodu
+- parametreler: bildirilen referans tablolarının değerleri ("text_richness" →
+  seçili zenginlik backend'i ve ölçeği)
+- girdiler: ham kolonların veri özeti veya üst kolonun parmak izi
+
+Hesaplanan kolonlar parmak izleriyle önbelleğe yazılır
+(./outputs/feature_cache.pkl). Artımlı çalıştırmada yalnızca parmak izi
+değişen kolonlar (ve onlara bağlı kolonlar) yeniden hesaplanır; örn.
+software_reference_data değişince Yazılım Bilgisi Sayısı önbellekten gelir,
+yalnızca Basic Computer Skills Skoru yeniden hesaplanır, embedding atlanır.
+Plan ayrıca etkilenen sonraki aşamaları (ölçekleme, sıralama) listeler.
+
+Kullanım:
+    python 1_tamTemiz_pipeline.py --kuru       # neyin yeniden hesaplanacağını listele
+    python 1_tamTemiz_pipeline.py --artimli    # yalnızca etkilenen kolonları hesapla
+    python feature_lineage.py --soy            # bildirilen bağımlılık tablosu
+"""
+
+import argparse
+import hashlib
+import inspect
+import os
+from datetime import datetime
+
+import pandas as pd
+
+import candidate_features
+import text_richness
+from candidate_features import FEATURE_LINEAGE, FEATURE_STEPS, anon_columns, featurize_parallel
+from pipeline_metrics import span
+
+# Dosya yolları
+feature_cache_path = "./outputs/feature_cache.pkl"
+input_path = "./data_sources/aday_havuzu.xlsx"
+
+CACHE_FORMAT = 1
+FEATURE_COLUMNS = [column for column, _, _ in FEATURE_STEPS]
+
+# Özellik kolonlarından türetilen çıktılar → bağlı oldukları özellik kolonları
+DERIVED_COLUMNS = {"Sosyal Aktivite Skoru (0-100)": "Sosyal Aktivite Skoru"}
+_ranking_inputs = [DERIVED_COLUMNS.get(col, col) for col in anon_columns if col != "ID"]
+DOWNSTREAM = [
+    ("1_tamTemiz_pipeline.py: Sosyal Aktivite Skoru (0-100) ölçeklemesi", ["Sosyal Aktivite Skoru"]),
+    ("2_scaler.py", _ranking_inputs),
+    ("multi_criteria_ranking_pipeline.py", _ranking_inputs),
+]
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _data_hash(series):
+    return hashlib.sha1(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes()).hexdigest()[:16]
+
+
+def parameter_values():
+    """Bildirilen parametrelerin güncel değerleri."""
+    names = {name for declared in FEATURE_LINEAGE.values() for name in declared["params"]} - {"text_richness"}
+    values = {name: getattr(candidate_features, name) for name in names}
+    backend = text_richness.get_backend()
+    if backend.name == "transformer":
+        values["text_richness"] = (backend.name, candidate_features.EMBEDDING_MODEL_NAME)
+    else:
+        values["text_richness"] = (backend.name, backend.n, backend.scale)
+    return values
+
+
+def column_lineage(df, params=None):
+    """Kolon başına {code, params, inputs, fingerprint} (FEATURE_STEPS sırasıyla)."""
+    params = parameter_values() if params is None else params
+    fingerprints = {}
+    lineage = {}
+    for column, func, _ in FEATURE_STEPS:
+        declared = FEATURE_LINEAGE[column]
+        inputs = {}
+        for name in declared["inputs"]:
+            if name not in fingerprints:
+                fingerprints[name] = _data_hash(df[name]) if name in df.columns else "yok"
+            inputs[name] = fingerprints[name]
+        components = {
+            "code": _hash(inspect.getsource(func)),
+            "params": {name: _hash(repr(params[name])) for name in declared["params"]},
+            "inputs": inputs,
+        }
+        components["fingerprint"] = _hash(repr((components["code"], components["params"], components["inputs"])))
+        fingerprints[column] = components["fingerprint"]
+        lineage[column] = components
+    return lineage
+
+
+def load_cache(path=feature_cache_path):
+    if not os.path.exists(path):
+        return None
+    cache = pd.read_pickle(path)
+    return cache if cache.get("format") == CACHE_FORMAT else None
+
+
+def save_cache(path, lineage, columns_df):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    pd.to_pickle({
+        "format": CACHE_FORMAT,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "lineage": lineage,
+        "columns": columns_df.reset_index(drop=True),
+    }, path)
+
+
+def build_plan(df, cache=None, force=False):
+    """Yeniden hesaplanacak kolonlar (nedenleriyle), önbellekten gelenler ve etkilenen aşamalar."""
+    lineage = column_lineage(df)
+    cached_lineage = cache["lineage"] if cache is not None and len(cache["columns"]) == len(df) else {}
+    recompute = {}
+    for column, components in lineage.items():
+        old = cached_lineage.get(column)
+        if force:
+            recompute[column] = ["tam çalıştırma"]
+        elif old is None:
+            recompute[column] = ["önbellekte yok"]
+        elif old["fingerprint"] != components["fingerprint"]:
+            reasons = ["kod"] if old["code"] != components["code"] else []
+            reasons += [f"parametre: {name}" for name, value in components["params"].items() if old["params"].get(name) != value]
+            reasons += [f"girdi: {name}" for name, value in components["inputs"].items() if old["inputs"].get(name) != value]
+            recompute[column] = reasons
+    return {
+        "n_rows": len(df),
+        "lineage": lineage,
+        "recompute": recompute,
+        "cached": [column for column in lineage if column not in recompute],
+        "downstream": [stage for stage, columns in DOWNSTREAM if any(col in recompute for col in columns)],
+    }
+
+
+def format_plan(plan):
+    lines = [f"Aday sayısı: {plan['n_rows']}"]
+    if plan["recompute"]:
+        lines.append("Yeniden hesaplanacak kolonlar:")
+        lines += [f"  - {column} ({', '.join(reasons)})" for column, reasons in plan["recompute"].items()]
+    else:
+        lines.append("Yeniden hesaplanacak kolon yok.")
+    if plan["cached"]:
+        lines.append(f"Önbellekten: {', '.join(plan['cached'])}")
+    if plan["downstream"]:
+        lines.append("Etkilenen sonraki aşamalar:")
+        lines += [f"  - {stage}" for stage in plan["downstream"]]
+    else:
+        lines.append("Sıralama girdileri değişmedi; sonraki aşamaların yeniden çalıştırılması gerekmez.")
+    return "\n".join(lines)
+
+
+def featurize_incremental(df, workers=1, cache_path=feature_cache_path, force=False):
+    """featurize ile aynı sonuç; yalnızca parmak izi değişen kolonlar hesaplanır. (df, plan) döndürür."""
+    cache = None if force else load_cache(cache_path)
+    plan = build_plan(df, cache, force)
+    if len(plan["recompute"]) == len(FEATURE_STEPS):
+        df = featurize_parallel(df, workers)
+    else:
+        for column, func, kwargs in FEATURE_STEPS:
+            if column not in plan["recompute"]:
+                df[column] = cache["columns"][column].to_numpy()
+                continue
+            kind = f"embedding[{text_richness.backend_name()}]" if func is candidate_features.calculate_social_activity_score_advanced else "feature"
+            with span(f"{kind}:{column}", rows=len(df)):
+                df[column] = df.apply(func, axis=1, **kwargs)
+    save_cache(cache_path, plan["lineage"], df[FEATURE_COLUMNS])
+    return df, plan
+
+
+def lineage_table():
+    """Bildirilen bağımlılıklar: kolon, girdiler, parametreler."""
+    return pd.DataFrame([
+        {"Kolon": column, "Girdiler": ", ".join(declared["inputs"]), "Parametreler": ", ".join(declared["params"])}
+        for column, declared in FEATURE_LINEAGE.items()
+    ])
+
+
+if __name__ == "__main__":
+    from candidate_features import clean_columns
+
+    parser = argparse.ArgumentParser(description="Özellik kolonlarının soyu ve artımlı hesap planı (kuru çalıştırma)")
+    parser.add_argument("--girdi", default=input_path, help="Aday havuzu (.xlsx)")
+    parser.add_argument("--onbellek", default=feature_cache_path)
+    parser.add_argument("--soy", action="store_true", help="Yalnızca bildirilen bağımlılık tablosunu yazdır")
+    text_richness.add_arguments(parser)
+    args = parser.parse_args()
+    text_richness.configure_from_args(args)
+
+    if args.soy:
+        print(lineage_table().to_string(index=False))
+        print("\nSonraki aşamalar:")
+        for stage, columns in DOWNSTREAM:
+            print(f"  - {stage} ← {', '.join(columns)}")
+        raise SystemExit(0)
+
+    df = clean_columns(pd.read_excel(args.girdi))
+    print(format_plan(build_plan(df, load_cache(args.onbellek))))
@@ -0,0 +1,265 @@
+"""
+Artımlı (Incremental) ELECTRE Durumu
+====================================
+
+Havuza aday eklendiğinde veya havuzdan aday çıkarıldığında ELECTRE baskınlık
+skorları tüm n × n matris yeniden hesaplanmadan güncellenir:
+- Ekleme: yalnızca yeni adayların satır/sütunu (b × n karşılaştırma, O(b·n·m))
+  hesaplanır; havuzun baskınlık (satır toplamı) ve baskılanma (sütun toplamı)
+  sayıları yerinde güncellenir
+- Çıkarma: çıkarılan adayların havuzla karşılaştırması tekrar hesaplanıp
+  kalan adayların sayılarından düşülür
+- Sıralar baskınlık skorlarından yeniden üretilir (electre_ranking)
+
+Durum ./outputs/electre_state.npz olarak saklanır (ID'ler, kriter matrisi,
+ağırlıklar, eşikler, baskınlık/baskılanma sayıları); n × n matris tutulmaz.
+Ağırlık veya eşik değişirse artımlı güncelleme geçersizdir, tam yeniden
+hesap yapılır. Sonuçlar tam hesapla (ProfileElectreState) birebir aynıdır
+(tests/test_incremental_electre.py).
+
+Sıralama ayrı bir dosyaya (ELECTRE_Incremental_Results.xlsx) yazılır;
+pipeline çıktıları (ELECTRE_Results.xlsx, combined_ranking_report.xlsx,
+ELECTRE_Outranking.npz, results.sqlite) değişmez, tutarlı kalır. Havuzun tüm
+raporları için multi_criteria_ranking_pipeline.py yeniden çalıştırılmalıdır.
+
+Kullanım (gece işi):
+    python incremental_electre.py --ekle ./outputs/yeni_adaylar_scaled.xlsx --cikar 12,57
+    python incremental_electre.py --ekle yeni.xlsx --dogrula   # tam hesapla karşılaştır
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import electre_kernels
+import mcdm_methods
+
+# Dosya yolları
+electre_state_path = "./outputs/electre_state.npz"
+weights_path = "./outputs/ahp_weights_summary.xlsx"
+results_path = "./outputs/ELECTRE_Incremental_Results.xlsx"
+
+# Tek seferde karşılaştırılacak en fazla (yeni aday × havuz adayı) çifti
+PAIR_BUDGET = 2_000_000
+
+
+class IncrementalElectreState:
+    """ID indeksli baskınlık / baskılanma sayıları; ekleme ve çıkarma ile güncellenir."""
+
+    def __init__(self, ids, criteria_matrix, weights, dominance, dominated_by,
+                 C_threshold=mcdm_methods.C_THRESHOLD, D_threshold=mcdm_methods.D_THRESHOLD,
+                 criteria_names=None, version=0):
+        self.ids = np.asarray(ids)
+        self.criteria_matrix = np.asarray(criteria_matrix, dtype=float)
+        self.weights = np.asarray(weights, dtype=float)
+        self.dominance = np.asarray(dominance, dtype=np.int64)
+        self.dominated_by = np.asarray(dominated_by, dtype=np.int64)
+        self.C_threshold = float(C_threshold)
+        self.D_threshold = float(D_threshold)
+        self.criteria_names = list(criteria_names) if criteria_names is not None else None
+        self.version = int(version)
+        self._positions = {candidate_id: pos for pos, candidate_id in enumerate(self.ids.tolist())}
+
+    @classmethod
+    def from_criteria(cls, ids, criteria_matrix, weights, C_threshold=mcdm_methods.C_THRESHOLD,
+                      D_threshold=mcdm_methods.D_THRESHOLD, criteria_names=None, backend="auto"):
+        """Tam hesapla (benzersiz profiller üzerinden) başlangıç durumu."""
+        dominance, dominated_by = electre_kernels.dominance_counts(
+            criteria_matrix, weights, C_threshold, D_threshold, backend
+        )
+        return cls(ids, criteria_matrix, weights, dominance, dominated_by, C_threshold, D_threshold, criteria_names)
+
+    @property
+    def n_candidates(self):
+        return len(self.ids)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._positions
+
+    def positions(self, ids):
+        missing = [candidate_id for candidate_id in ids if candidate_id not in self._positions]
+        if missing:
+            raise KeyError(f"ELECTRE durumunda bulunmayan aday ID'leri: {missing[:10]}")
+        return np.array([self._positions[candidate_id] for candidate_id in ids], dtype=np.int64)
+
+    # ---------------------- Karşılaştırma ----------------------
+
+    def _against_pool(self, pool_matrix, batch):
+        """batch ile havuz arasındaki iki yönlü baskınlık sayıları (parçalar halinde).
+
+        Dönen: (batch_outranks[b], batch_outranked_by[b], pool_outranks[n], pool_outranked_by[n])
+        batch_outranks[k] → k'nın baskıladığı havuz adayı sayısı
+        pool_outranks[j]  → havuzdaki j'nin baskıladığı batch adayı sayısı
+        """
+        n_pool, n_batch = len(pool_matrix), len(batch)
+        batch_outranks = np.zeros(n_batch, dtype=np.int64)
+        batch_outranked_by = np.zeros(n_batch, dtype=np.int64)
+        pool_outranks = np.zeros(n_pool, dtype=np.int64)
+        pool_outranked_by = np.zeros(n_pool, dtype=np.int64)
+        if n_pool == 0 or n_batch == 0:
+            return batch_outranks, batch_outranked_by, pool_outranks, pool_outranked_by
+
+        chunk_size = max(1, PAIR_BUDGET // n_pool)
+        for start in range(0, n_batch, chunk_size):
+            stop = min(start + chunk_size, n_batch)
+            outranks, outranked_by = mcdm_methods.electre_against_pool(
+                pool_matrix, batch[start:stop], self.weights, self.C_threshold, self.D_threshold
+            )
+            batch_outranks[start:stop] = outranks.sum(axis=1)
+            batch_outranked_by[start:stop] = outranked_by.sum(axis=1)
+            pool_outranks += outranked_by.sum(axis=0)
+            pool_outranked_by += outranks.sum(axis=0)
+        return batch_outranks, batch_outranked_by, pool_outranks, pool_outranked_by
+
+    # ---------------------- Ekle / Çıkar ----------------------
+
+    def add(self, ids, criteria_matrix):
+        """Yeni adayları ekle; yalnızca yeni satır/sütunlar hesaplanır."""
+        ids = np.asarray(ids)
+        batch = np.atleast_2d(np.asarray(criteria_matrix, dtype=float))
+        if len(ids) != len(batch):
+            raise ValueError(f"ID sayısı ({len(ids)}) ile kriter satırı sayısı ({len(batch)}) farklı.")
+        if batch.shape[1] != self.criteria_matrix.shape[1]:
+            raise ValueError(f"Kriter sayısı uyuşmuyor: {batch.shape[1]} ≠ {self.criteria_matrix.shape[1]}")
+        duplicates = [candidate_id for candidate_id in ids.tolist() if candidate_id in self._positions]
+        if duplicates or len(set(ids.tolist())) != len(ids):
+            raise ValueError(f"Havuzda (veya eklenen grupta) zaten bulunan aday ID'leri: {duplicates[:10]}")
+        if len(ids) == 0:
+            return self
+
+        batch_outranks, batch_outranked_by, pool_outranks, pool_outranked_by = self._against_pool(
+            self.criteria_matrix, batch
+        )
+        # Yeni adayların kendi aralarındaki karşılaştırmalar
+        batch_state = mcdm_methods.ProfileElectreState(batch)
+        batch_outranks += batch_state.dominance_scores(self.weights, self.C_threshold, self.D_threshold)
+        batch_outranked_by += batch_state.dominated_by_scores(self.weights, self.C_threshold, self.D_threshold)
+
+        self.dominance = np.concatenate([self.dominance + pool_outranks, batch_outranks])
+        self.dominated_by = np.concatenate([self.dominated_by + pool_outranked_by, batch_outranked_by])
+        self.criteria_matrix = np.vstack([self.criteria_matrix, batch])
+        self.ids = np.concatenate([self.ids, ids])
+        self._positions.update({candidate_id: self.n_candidates - len(ids) + pos
+                                for pos, candidate_id in enumerate(ids.tolist())})
+        self.version += 1
+        return self
+
+    def remove(self, ids):
+        """Adayları çıkar; kalanların sayılarından çıkarılanlarla olan ilişkiler düşülür."""
+        removed = self.positions(list(ids))
+        if len(removed) == 0:
+            return self
+        keep = np.ones(self.n_candidates, dtype=bool)
+        keep[removed] = False
+
+        _, _, keep_outranks, keep_outranked_by = self._against_pool(
+            self.criteria_matrix[keep], self.criteria_matrix[removed]
+        )
+        self.dominance = self.dominance[keep] - keep_outranks
+        self.dominated_by = self.dominated_by[keep] - keep_outranked_by
+        self.criteria_matrix = self.criteria_matrix[keep]
+        self.ids = self.ids[keep]
+        self._positions = {candidate_id: pos for pos, candidate_id in enumerate(self.ids.tolist())}
+        self.version += 1
+        return self
+
+    def rebuild(self, weights=None, C_threshold=None, D_threshold=None, backend="auto"):
+        """Ağırlık/eşik değişiminde tam yeniden hesap (artımlı güncelleme geçersiz)."""
+        if weights is not None:
+            self.weights = np.asarray(weights, dtype=float)
+        if C_threshold is not None:
+            self.C_threshold = float(C_threshold)
+        if D_threshold is not None:
+            self.D_threshold = float(D_threshold)
+        self.dominance, self.dominated_by = electre_kernels.dominance_counts(
+            self.criteria_matrix, self.weights, self.C_threshold, self.D_threshold, backend
+        )
+        self.version += 1
+        return self
+
+    def ranking(self):
+        """ELECTRE_Dominance_Score + ELECTRE_Rank tablosu (ID indeksli)."""
+        return mcdm_methods.electre_ranking(self.dominance, self.ids)
+
+    def verify(self):
+        """Tam hesapla karşılaştır; uyuşmayan aday sayısı (0 → birebir aynı)."""
+        state = mcdm_methods.ProfileElectreState(self.criteria_matrix)
+        dominance = state.dominance_scores(self.weights, self.C_threshold, self.D_threshold)
+        dominated_by = state.dominated_by_scores(self.weights, self.C_threshold, self.D_threshold)
+        return int(((dominance != self.dominance) | (dominated_by != self.dominated_by)).sum())
+
+    # ---------------------- Kaydet / Yükle ----------------------
+
+    def save(self, path=electre_state_path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(
+            path, ids=self.ids, criteria_matrix=self.criteria_matrix, weights=self.weights,
+            dominance=self.dominance, dominated_by=self.dominated_by,
+            thresholds=np.array([self.C_threshold, self.D_threshold]),
+            criteria_names=np.array(self.criteria_names or [], dtype=str), version=self.version,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path=electre_state_path):
+        with np.load(path) as data:
+            criteria_names = data["criteria_names"].tolist() or None
+            C_threshold, D_threshold = data["thresholds"].tolist()
+            return cls(data["ids"], data["criteria_matrix"], data["weights"], data["dominance"],
+                       data["dominated_by"], C_threshold, D_threshold, criteria_names, int(data["version"]))
+
+
+# ID indeksli kriter tablosu (.pkl: candidate_schema formatı, diğerleri: ID kolonlu Excel)
+def read_batch(path):
+    if path.endswith(".pkl"):
+        return pd.read_pickle(path)
+    return pd.read_excel(path).set_index("ID")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ELECTRE durumuna artımlı aday ekle / çıkar")
+    parser.add_argument("--durum", default=electre_state_path, help="Kayıtlı ELECTRE durumu (.npz)")
+    parser.add_argument("--ekle", default=None, help="Eklenecek (ölçeklenmiş) adaylar (.xlsx/.pkl, ID kolonlu)")
+    parser.add_argument("--cikar", default=None, help="Çıkarılacak aday ID'leri (virgülle ayrılmış)")
+    parser.add_argument("--agirlik", default=weights_path, help="AHP ağırlık dosyası (değiştiyse tam yeniden hesap)")
+    parser.add_argument("--cikti", default=results_path, help="Artımlı ELECTRE sonuç dosyası (.xlsx)")
+    parser.add_argument("--dogrula", action="store_true", help="Güncellemeden sonra tam hesapla karşılaştır")
+    args = parser.parse_args()
+
+    state = IncrementalElectreState.load(args.durum)
+    print(f"ELECTRE durumu yüklendi: {state.n_candidates} aday (sürüm {state.version})")
+
+    if args.agirlik and os.path.exists(args.agirlik):
+        weights_df = pd.read_excel(args.agirlik, sheet_name="Birlesik_Agirlik", index_col=0)
+        if state.criteria_names is not None and weights_df.index.tolist() != state.criteria_names:
+            raise ValueError("Ağırlık dosyasındaki kriterler kayıtlı durumdaki kriterlerle aynı değil.")
+        new_weights = weights_df["Birlesik_Agirlik"].values.astype(float)
+        if not np.array_equal(new_weights, state.weights):
+            print("Ağırlıklar değişmiş: artımlı güncelleme yerine tam yeniden hesap yapılıyor.")
+            state.rebuild(new_weights)
+
+    if args.cikar:
+        remove_ids = [int(candidate_id) for candidate_id in args.cikar.split(",") if candidate_id.strip()]
+        state.remove(remove_ids)
+        print(f"{len(remove_ids)} aday çıkarıldı.")
+
+    if args.ekle:
+        batch = read_batch(args.ekle)
+        if state.criteria_names is not None:
+            batch = batch[state.criteria_names]
+        state.add(batch.index.values, batch.to_numpy(dtype=float))
+        print(f"{len(batch)} aday eklendi.")
+
+    if args.dogrula:
+        mismatches = state.verify()
+        print("Doğrulama: tam hesapla birebir aynı." if mismatches == 0
+              else f"UYARI: {mismatches} adayda tam hesapla fark var.")
+
+    state.save(args.durum)
+    state.ranking().to_excel(args.cikti)
+    print(f"Güncel havuz: {state.n_candidates} aday (sürüm {state.version})")
+    print(f"Çıktılar:\n- {args.durum}\n- {args.cikti}")
@@ -0,0 +1,477 @@
+"""
+Çok Kriterli Karar Yöntemleri (TOPSIS + ELECTRE + PROMETHEE II + VIKOR)
+=======================================================================
+
+multi_criteria_ranking_pipeline.py içindeki hesapların yeniden kullanılabilir,
+vektörize sürümü. Pipeline, dashboard ve diğer betikler aynı fonksiyonları
+kullanır.
+
+ELECTRE için ikili karşılaştırma durumu (ElectrePairwiseState) bir kez
+hesaplanır:
+- Concordance: her (i, j) çifti için "i, j'den iyi veya eşit" kriterlerinin
+  bit kodu saklanır → ağırlık değişince C = ağırlık_tablosu[kod]
+- Discordance: ağırlıktan bağımsızdır, bir kez hesaplanır
+Böylece ağırlık veya eşik değişimi O(n²) tablo okumasına iner.
+
+İkili farklar (x_j - x_i) blok blok yalnızca bir kez hesaplanır
+(pairwise_sweep); ELECTRE durumu ve ek tüketiciler (ör. PROMETHEE II tercih
+fonksiyonları, PrometheeFlows) aynı taramada aynı fark bloğunu kullanır. Ek
+bir yöntem yalnızca kendi blok hesabı kadar süre ekler. VIKOR ikili
+karşılaştırma gerektirmez (ideal/anti-ideal üzerinden O(n·m)).
+
+Aynı kriter vektörüne sahip adaylar (ProfileElectreState) tek profil olarak
+karşılaştırılır: ikili iş n² yerine u² (u = benzersiz profil sayısı), aday
+sonuçları profil çokluklarıyla geri açılır. Sonuçlar aday bazlı hesapla aynıdır.
+
+Pareto ön filtresi (pareto_prefilter): her kriterde başka bir adaya eşit
+veya geride kalan (baskın çözülen) adaylar katmanlara ayrılır; ELECTRE yalnızca
+ilk katmanlarda (veya kısa listeyi dolduracak kadar katmanda) çalıştırılabilir.
+"""
+
+import numpy as np
+import pandas as pd
+
+# ELECTRE threshold varsayılanları
+C_THRESHOLD = 0.65  # Concordance threshold
+D_THRESHOLD = 0.35  # Discordance threshold
+
+# İkili karşılaştırmalar bu kadar satırlık bloklar halinde hesaplanır
+PAIRWISE_BLOCK_SIZE = 256
+
+# VIKOR strateji ağırlığı (v = 0.5 → uzlaşı; çoğunluk kuralı ile veto arasında denge)
+VIKOR_V = 0.5
+
+# PROMETHEE tercih fonksiyonları
+PREFERENCE_FUNCTIONS = ("usual", "linear")
+
+
+# -------------------------------------
+# TOPSIS
+# -------------------------------------
+
+def _closeness(weighted_matrix, ideal_solution, anti_ideal_solution):
+    distance_to_ideal = np.linalg.norm(weighted_matrix - ideal_solution, axis=1)
+    distance_to_anti_ideal = np.linalg.norm(weighted_matrix - anti_ideal_solution, axis=1)
+    return distance_to_anti_ideal / (distance_to_ideal + distance_to_anti_ideal)
+
+
+def topsis_scores(criteria_matrix, weights):
+    """İdeale yakınlık katsayısı (yüksek skor daha iyi)."""
+    norm = np.linalg.norm(criteria_matrix, axis=0)
+    norm[norm == 0] = 1  # tamamen 0 olan kriter → bölme hatasını önle
+    normalized_matrix = criteria_matrix / norm
+    weighted_matrix = normalized_matrix * weights
+
+    ideal_solution = np.max(weighted_matrix, axis=0)
+    anti_ideal_solution = np.min(weighted_matrix, axis=0)
+
+    return _closeness(weighted_matrix, ideal_solution, anti_ideal_solution)
+
+
+class TopsisReference:
+    """Havuzun normalizasyonu sabit tutularak yeni adayları puanlayan TOPSIS.
+
+    Sütun normları, ideal ve anti-ideal çözüm havuzdan bir kez hesaplanır;
+    yeni aday O(m) sürede puanlanır, sırası havuz skorları içinde ikili
+    aramayla bulunur. Havuz değişmediği sürece havuz skorları aynı kalır.
+    """
+
+    def __init__(self, criteria_matrix, weights):
+        criteria_matrix = np.asarray(criteria_matrix, dtype=float)
+        self.weights = np.asarray(weights, dtype=float)
+        self.norm = np.linalg.norm(criteria_matrix, axis=0)
+        self.norm[self.norm == 0] = 1
+
+        weighted_matrix = criteria_matrix / self.norm * self.weights
+        self.ideal_solution = np.max(weighted_matrix, axis=0)
+        self.anti_ideal_solution = np.min(weighted_matrix, axis=0)
+
+        self.pool_scores = _closeness(weighted_matrix, self.ideal_solution, self.anti_ideal_solution)
+        self._sorted_scores = np.sort(self.pool_scores)
+
+    def score(self, criteria_matrix):
+        weighted_matrix = np.atleast_2d(np.asarray(criteria_matrix, dtype=float)) / self.norm * self.weights
+        return _closeness(weighted_matrix, self.ideal_solution, self.anti_ideal_solution)
+
+    def rank(self, scores):
+        """Havuza göre sıra (1 + daha yüksek skorlu havuz adayı sayısı)."""
+        higher = len(self._sorted_scores) - np.searchsorted(self._sorted_scores, scores, side="right")
+        return higher + 1
+
+
+def descending_rank(scores):
+    """Skora göre sıra numarası (1 = en yüksek skor)."""
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[np.argsort(-np.asarray(scores), kind="stable")] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
+# -------------------------------------
+# VIKOR
+# -------------------------------------
+
+def vikor_scores(criteria_matrix, weights, v=VIKOR_V):
+    """S (grup faydası), R (bireysel pişmanlık) ve Q uzlaşı indeksi (düşük Q daha iyi)."""
+    criteria_matrix = np.asarray(criteria_matrix, dtype=float)
+    best = np.max(criteria_matrix, axis=0)
+    worst = np.min(criteria_matrix, axis=0)
+    spread = best - worst
+    spread[spread == 0] = 1  # tüm adaylarda aynı olan kriter → pişmanlık 0
+
+    regret = np.asarray(weights, dtype=float) * (best - criteria_matrix) / spread
+    S = regret.sum(axis=1)
+    R = regret.max(axis=1)
+
+    def _normalized(values):
+        value_range = values.max() - values.min()
+        return (values - values.min()) / value_range if value_range > 0 else np.zeros_like(values)
+
+    Q = v * _normalized(S) + (1 - v) * _normalized(R)
+    return S, R, Q
+
+
+# -------------------------------------
+# Ortak İkili Fark Taraması
+# -------------------------------------
+
+def pairwise_sweep(criteria_matrix, consumers, block_size=PAIRWISE_BLOCK_SIZE):
+    """Kriter farklarını blok blok bir kez hesaplayıp tüm tüketicilere ilet.
+
+    consumer(start, stop, differences) → differences[i, j, k] = x_jk - x_ik, i ∈ [start, stop)
+    """
+    X = np.asarray(criteria_matrix, dtype=float)
+    n_candidates = len(X)
+    for start in range(0, n_candidates, block_size):
+        stop = min(start + block_size, n_candidates)
+        differences = X[None, :, :] - X[start:stop, None, :]
+        for consumer in consumers:
+            consumer(start, stop, differences)
+
+
+class PrometheeFlows:
+    """PROMETHEE II pozitif/negatif/net akışları (ortak fark taramasının tüketicisi).
+
+    ProfileElectreState(..., consumers=[flows]) ile ELECTRE ile aynı taramada
+    benzersiz profiller üzerinden hesaplanır; profil çoklukları ağırlık olarak
+    kullanılır. "linear" tercih fonksiyonunda p eşiği kriterin havuzdaki
+    aralığıdır (P(d) = d / aralık), "usual" için P(d) = 1 (d > 0).
+    """
+
+    def __init__(self, weights, preference="linear"):
+        if preference not in PREFERENCE_FUNCTIONS:
+            raise ValueError(f"Bilinmeyen tercih fonksiyonu: {preference} (seçenekler: {', '.join(PREFERENCE_FUNCTIONS)})")
+        self.weights = np.asarray(weights, dtype=float)
+        self.preference = preference
+
+    def bind(self, profiles, counts, inverse):
+        """Tarama öncesi: profil çoklukları ve aday → profil eşlemesi."""
+        self.counts = np.asarray(counts, dtype=float)
+        self.inverse = inverse
+        spread = np.max(profiles, axis=0) - np.min(profiles, axis=0)
+        spread[spread == 0] = 1
+        self.spread = spread
+        self.positive = np.zeros(len(profiles))
+        self.negative = np.zeros(len(profiles))
+        return self.consume
+
+    def _preference(self, d):
+        if self.preference == "usual":
+            return (d > 0).astype(float)
+        return np.clip(d / self.spread, 0, 1)
+
+    def consume(self, start, stop, differences):
+        # i'nin j'ye tercihi: d = x_i - x_j = -differences
+        preference_forward = self._preference(-differences) @ self.weights
+        preference_backward = self._preference(differences) @ self.weights
+        self.positive[start:stop] += preference_forward @ self.counts
+        self.negative[start:stop] += preference_backward @ self.counts
+
+    def flows(self):
+        """Aday başına (φ+, φ-, φ) (aday kendisiyle karşılaştırılmaz; π(i, i) = 0)."""
+        n_others = max(self.counts.sum() - 1, 1)
+        positive = self.positive[self.inverse] / n_others
+        negative = self.negative[self.inverse] / n_others
+        return positive, negative, positive - negative
+
+    def net_flows(self):
+        return self.flows()[2]
+
+
+def promethee_net_flows(criteria_matrix, weights, preference="linear", block_size=PAIRWISE_BLOCK_SIZE):
+    """Yalnızca PROMETHEE II için (ELECTRE olmadan) tarama."""
+    profiles, inverse, counts = np.unique(np.asarray(criteria_matrix, dtype=float), axis=0,
+                                          return_inverse=True, return_counts=True)
+    flows = PrometheeFlows(weights, preference)
+    pairwise_sweep(profiles, [flows.bind(profiles, counts, inverse.reshape(-1))], block_size)
+    return flows.net_flows()
+
+
+# -------------------------------------
+# ELECTRE
+# -------------------------------------
+
+def concordance_weight_table(weights):
+    """Her concordance bit kodu için ilgili ağırlıkların toplamı."""
+    n_criteria = len(weights)
+    codes = np.arange(2 ** n_criteria)
+    masks = ((codes[:, None] >> np.arange(n_criteria)) & 1).astype(bool)
+    return np.array([np.sum(weights[mask]) for mask in masks])
+
+
+class ElectrePairwiseState:
+    """Ağırlık ve eşik değişimlerinde yeniden kullanılan ELECTRE ikili durum."""
+
+    def __init__(self, criteria_matrix, block_size=PAIRWISE_BLOCK_SIZE, consumers=()):
+        self.criteria_matrix = np.asarray(criteria_matrix, dtype=float)
+        n_candidates, n_criteria = self.criteria_matrix.shape
+        if n_criteria > 16:
+            raise ValueError("ElectrePairwiseState en fazla 16 kriter destekler.")
+
+        code_dtype = np.uint8 if n_criteria <= 8 else np.uint16
+        self._bit_values = (1 << np.arange(n_criteria)).astype(code_dtype)
+
+        self.codes = np.zeros((n_candidates, n_candidates), dtype=code_dtype)
+        self.D_matrix = np.zeros((n_candidates, n_candidates))
+
+        # Ek tüketiciler (ör. PROMETHEE) aynı fark bloklarını kullanır
+        pairwise_sweep(self.criteria_matrix, [self._consume, *consumers], block_size)
+        np.fill_diagonal(self.D_matrix, 0)
+
+    def _consume(self, start, stop, differences):
+        # Cij: hangi kriterlerde i aday j'den iyi veya eşit?
+        self.codes[start:stop] = ((differences <= 0) * self._bit_values).sum(axis=2, dtype=self.codes.dtype)
+
+        # Dij: i adayın j'ye karşı en büyük farkla geride kaldığı kriter
+        max_diff = np.abs(differences).max(axis=2)
+        worst = differences.max(axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.D_matrix[start:stop] = np.where(max_diff == 0, 0, worst / max_diff)
+
+    @property
+    def n_candidates(self):
+        return self.codes.shape[0]
+
+    def concordance(self, weights):
+        C_matrix = concordance_weight_table(np.asarray(weights, dtype=float))[self.codes]
+        np.fill_diagonal(C_matrix, 0)
+        return C_matrix
+
+    def outranking(self, weights, C_threshold=C_THRESHOLD, D_threshold=D_THRESHOLD, C_matrix=None):
+        if C_matrix is None:
+            C_matrix = self.concordance(weights)
+        return outranking_from_matrices(C_matrix, self.D_matrix, C_threshold, D_threshold)
+
+
+class ProfileElectreState:
+    """Aynı kriter vektörüne sahip adayları tek profil olarak tutan ELECTRE durumu.
+
+    Profil içi çiftler (farklı ama aynı vektörlü iki aday) için C = tüm
+    ağırlıkların toplamı, D = 0'dır; bu değerler profil matrisinin köşegeninde
+    tutulur (aday bazlı hesapta yalnızca i == j köşegeni 0'lanır).
+
+    consumers: bind(profiles, counts, inverse) metodu olan ek tüketiciler
+    (ör. PrometheeFlows); aynı ikili fark taramasına katılırlar.
+    """
+
+    def __init__(self, criteria_matrix, block_size=PAIRWISE_BLOCK_SIZE, consumers=()):
+        criteria_matrix = np.asarray(criteria_matrix, dtype=float)
+        profiles, inverse, counts = np.unique(criteria_matrix, axis=0, return_inverse=True, return_counts=True)
+        self.inverse = inverse.reshape(-1)
+        self.counts = counts
+        self.profile_state = ElectrePairwiseState(
+            profiles, block_size, [consumer.bind(profiles, counts, self.inverse) for consumer in consumers]
+        )
+
+    @property
+    def n_candidates(self):
+        return len(self.inverse)
+
+    @property
+    def n_profiles(self):
+        return len(self.counts)
+
+    def work_report(self):
+        pairs_full = self.n_candidates * (self.n_candidates - 1)
+        pairs_evaluated = self.n_profiles * (self.n_profiles - 1)
+        return {
+            "n_candidates": self.n_candidates,
+            "n_profiles": self.n_profiles,
+            "pairs_full": pairs_full,
+            "pairs_evaluated": pairs_evaluated,
+            "pairs_avoided": pairs_full - pairs_evaluated,
+        }
+
+    def profile_concordance(self, weights):
+        """u × u concordance (köşegen: profil içi çiftler)."""
+        return concordance_weight_table(np.asarray(weights, dtype=float))[self.profile_state.codes]
+
+    def profile_outranking(self, weights, C_threshold=C_THRESHOLD, D_threshold=D_THRESHOLD, C_matrix=None):
+        if C_matrix is None:
+            C_matrix = self.profile_concordance(weights)
+        return ((C_matrix >= C_threshold) & (self.profile_state.D_matrix <= D_threshold)).astype(np.int8)
+
+    def dominance_scores(self, weights, C_threshold=C_THRESHOLD, D_threshold=D_THRESHOLD):
+        """Aday başına baskıladığı aday sayısı (n × n matris oluşturmadan)."""
+        profile_outranking = self.profile_outranking(weights, C_threshold, D_threshold)
+        # Profil p'deki aday: diğer profillerdeki tüm adaylar + kendi profilindeki diğer (count - 1) aday
+        profile_scores = profile_outranking.astype(np.int64) @ self.counts - np.diag(profile_outranking)
+        return profile_scores[self.inverse]
+
+    def dominated_by_scores(self, weights, C_threshold=C_THRESHOLD, D_threshold=D_THRESHOLD):
+        """Aday başına onu baskılayan aday sayısı (outranking sütun toplamı)."""
+        profile_outranking = self.profile_outranking(weights, C_threshold, D_threshold)
+        profile_scores = profile_outranking.T.astype(np.int64) @ self.counts - np.diag(profile_outranking)
+        return profile_scores[self.inverse]
+
+    def expand(self, profile_matrix):
+        """u × u profil matrisini n × n aday matrisine aç (i == j köşegeni 0)."""
+        candidate_matrix = profile_matrix[np.ix_(self.inverse, self.inverse)]
+        np.fill_diagonal(candidate_matrix, 0)
+        return candidate_matrix
+
+
+def outranking_from_matrices(C_matrix, D_matrix, C_threshold=C_THRESHOLD, D_threshold=D_THRESHOLD):
+    """i, j'yi baskılıyorsa 1 (i == j → 0)."""
+    outranking_matrix = ((C_matrix >= C_threshold) & (D_matrix <= D_threshold)).astype(np.int8)
+    np.fill_diagonal(outranking_matrix, 0)
+    return outranking_matrix
+
+
+def electre_matrices(criteria_matrix, weights, C_threshold=C_THRESHOLD, D_threshold=D_THRESHOLD, state=None):
+    """Concordance, discordance ve outranking matrislerini döndürür (benzersiz profiller üzerinden)."""
+    if state is None:
+        state = ProfileElectreState(criteria_matrix)
+    C_profile = state.profile_concordance(weights)
+    outranking_profile = state.profile_outranking(weights, C_threshold, D_threshold, C_matrix=C_profile)
+    return state.expand(C_profile), state.expand(state.profile_state.D_matrix), state.expand(outranking_profile)
+
+
+def electre_against_pool(pool_matrix, candidates, weights, C_threshold=C_THRESHOLD, D_threshold=D_THRESHOLD):
+    """Yeni adaylar (b × m) ile havuz (n × m) arasında iki yönlü ELECTRE karşılaştırması.
+
+    outranks[k, j] → k. yeni aday havuzdaki j adayını baskılar
+    outranked_by[k, j] → havuzdaki j adayı k. yeni adayı baskılar
+    Hesaplar ElectrePairwiseState ile birebir aynıdır.
+    """
+    pool_matrix = np.asarray(pool_matrix, dtype=float)
+    candidates = np.atleast_2d(np.asarray(candidates, dtype=float))
+    n_criteria = pool_matrix.shape[1]
+
+    weight_table = concordance_weight_table(np.asarray(weights, dtype=float))
+    bit_values = 1 << np.arange(n_criteria)
+
+    # differences[k, j, :] = x_j - x_k (k: yeni aday, j: havuz adayı)
+    differences = pool_matrix[None, :, :] - candidates[:, None, :]
+    max_diff = np.abs(differences).max(axis=2)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        C_forward = weight_table[((differences <= 0) * bit_values).sum(axis=2)]
+        D_forward = np.where(max_diff == 0, 0, differences.max(axis=2) / max_diff)
+        C_backward = weight_table[((differences >= 0) * bit_values).sum(axis=2)]
+        D_backward = np.where(max_diff == 0, 0, (-differences).max(axis=2) / max_diff)
+
+    outranks = (C_forward >= C_threshold) & (D_forward <= D_threshold)
+    outranked_by = (C_backward >= C_threshold) & (D_backward <= D_threshold)
+    return outranks, outranked_by
+
+
+# -------------------------------------
+# Pareto Katmanları (Ön Filtre)
+# -------------------------------------
+
+def _dense_ranks(criteria_matrix):
+    """Her kriteri tamsayı sıraya çevir; baskınlık ilişkileri aynen korunur."""
+    return np.column_stack([
+        np.unique(column, return_inverse=True)[1] for column in np.asarray(criteria_matrix, dtype=float).T
+    ]).astype(np.int32)
+
+
+def _dominated_by(A, B, chunk_size=PAIRWISE_BLOCK_SIZE * 16):
+    """B'nin her satırı için: A'da onu Pareto-baskılayan (≥ her kriter, > en az biri) satır var mı?"""
+    dominated = np.zeros(len(B), dtype=bool)
+    A_columns, B_columns = A.T, B.T
+    for start in range(0, len(A), chunk_size):
+        # Kriter kriter 2 boyutlu karşılaştırma (küçük son eksende all/any'den hızlı)
+        at_least = np.ones((min(chunk_size, len(A) - start), len(B)), dtype=bool)
+        better = np.zeros_like(at_least)
+        for a_column, b_column in zip(A_columns[:, start:start + chunk_size], B_columns):
+            at_least &= a_column[:, None] >= b_column[None, :]
+            better |= a_column[:, None] > b_column[None, :]
+        dominated |= (at_least & better).any(axis=0)
+    return dominated
+
+
+def pareto_front_mask(ranks, block_size=PAIRWISE_BLOCK_SIZE):
+    """Baskın çözülmeyen satırlar (skyline), sıralama tabanlı blok tarama.
+
+    Satırlar sıra toplamına göre azalan işlenir: bir satırı baskılayan satırın
+    toplamı kesin olarak büyüktür, yani daha önce (veya aynı blokta) görülür.
+    Her blok yalnızca o ana kadarki skyline ve kendi içiyle karşılaştırılır.
+    """
+    n_rows = len(ranks)
+    order = np.argsort(-ranks.sum(axis=1, dtype=np.int64), kind="stable")
+    front_mask = np.zeros(n_rows, dtype=bool)
+    front = ranks[:0]
+    for start in range(0, n_rows, block_size):
+        block_index = order[start:start + block_size]
+        block = ranks[block_index]
+        dominated = _dominated_by(front, block) | _dominated_by(block, block)
+        front_mask[block_index[~dominated]] = True
+        front = np.concatenate([front, block[~dominated]])
+    return front_mask
+
+
+def pareto_layers(criteria_matrix, max_layers=None, min_count=None):
+    """Pareto katman numaraları (1 = baskın çözülmeyenler, 0 = hesaplanmadı).
+
+    max_layers katman hesaplandığında veya en az min_count aday katmanlara
+    atandığında durur (ikisi de None → tüm katmanlar).
+    """
+    ranks = _dense_ranks(criteria_matrix)
+    layers = np.zeros(len(ranks), dtype=np.int32)
+    remaining = np.arange(len(ranks))
+    layer = 0
+    while remaining.size:
+        if max_layers is not None and layer >= max_layers:
+            break
+        if min_count is not None and len(ranks) - remaining.size >= min_count:
+            break
+        layer += 1
+        front = remaining[pareto_front_mask(ranks[remaining])]
+        layers[front] = layer
+        remaining = remaining[layers[remaining] == 0]
+    return layers
+
+
+def pareto_prefilter(criteria_matrix, max_layers=None, shortlist_size=None):
+    """ELECTRE'ye girecek adaylar (ilk max_layers katman veya shortlist_size'ı dolduran katmanlar).
+
+    Dönüş: (seçilen satır indeksleri, katman numaraları, rapor). Pareto baskınlık
+    ELECTRE'de de baskınlık demektir (C = 1, D ≤ 0); filtre dışı kalan her aday
+    seçilenlerden en az birine baskın çözülür.
+    """
+    layers = pareto_layers(criteria_matrix, max_layers=max_layers, min_count=shortlist_size)
+    selected = np.flatnonzero(layers > 0)
+    n_candidates, n_selected = len(layers), len(selected)
+    pairs_full = n_candidates * (n_candidates - 1)
+    pairs_evaluated = n_selected * (n_selected - 1)
+    report = {
+        "n_candidates": n_candidates,
+        "n_selected": n_selected,
+        "layers_used": int(layers.max()) if n_candidates else 0,
+        "pairs_full": pairs_full,
+        "pairs_evaluated": pairs_evaluated,
+        "pairs_avoided": pairs_full - pairs_evaluated,
+        "avoided_ratio": (pairs_full - pairs_evaluated) / pairs_full if pairs_full else 0.0,
+    }
+    return selected, layers, report
+
+
+def electre_ranking(dominance_scores, index):
+    """ELECTRE_Dominance_Score + ELECTRE_Rank tablosu."""
+    electre_df = pd.DataFrame({
+        "ID": index,
+        "ELECTRE_Dominance_Score": dominance_scores
+    }).set_index("ID")
+    electre_df["ELECTRE_Rank"] = electre_df["ELECTRE_Dominance_Score"].rank(ascending=False, method='min').astype(int)
+    return electre_df
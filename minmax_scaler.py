@@ -0,0 +1,196 @@
+"""
+Fit/Transform Min-Max Ölçekleyici (Kalıcı Sınırlar)
+===================================================
+
+2_scaler.py her çalıştırmada min/max'ı verilen dosyadan yeniden hesaplıyordu;
+yeni bir aday grubu tüm havuzun ölçekli skorlarını kaydırıyordu. Bu modülde:
+- fit: havuz (veya parça parça akan veri, çalışan min/max) üzerinden sınır öğrenir
+- transform: öğrenilmiş sınırlarla 0-100 ölçekler (havuz yeniden ölçeklenmez)
+- Sınırlar sürüm numarasıyla JSON olarak kaydedilir / yüklenir
+
+Aralık dışı değer politikaları:
+- "clip":   0-100'e kırp (sınırlar ve sürüm değişmez)
+- "extend": sınırları genişlet, sürümü artır, rescale_required işaretle
+            (havuzun mevcut ölçekli skorları artık eski sınırlara göredir;
+            genişletilen kolonlar rescale_columns'ta, ayrıca warnings.warn)
+- "error":  ValueError fırlat
+
+Kullanım (yeni aday grubunu kayıtlı sınırlarla ölçekleme):
+    python minmax_scaler.py --input ./outputs/yeni_adaylar.xlsx --output ./outputs/yeni_adaylar_scaled.xlsx --policy clip
+"""
+
+import argparse
+import json
+import os
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Kayıtlı sınır dosyaları
+scaler_path = "./outputs/scaler_bounds.json"
+social_scaler_path = "./outputs/social_scaler_bounds.json"
+
+POLICIES = ("clip", "extend", "error")
+
+
+class MinMaxScaler:
+    """Kolon bazında min-max ölçekleyici; çıktı kolonları col + suffix."""
+
+    def __init__(self, columns, suffix=" (Scaled)", feature_range=(0, 100), policy="clip"):
+        if policy not in POLICIES:
+            raise ValueError(f"Bilinmeyen politika: {policy} (seçenekler: {', '.join(POLICIES)})")
+        self.columns = list(columns)
+        self.suffix = suffix
+        self.feature_range = tuple(feature_range)
+        self.policy = policy
+        self.bounds = {}
+        self.n_rows = 0
+        self.version = 0
+        self.fitted_at = None
+        self.rescale_required = False
+        self.rescale_columns = []
+
+    @property
+    def is_fitted(self):
+        return bool(self.bounds)
+
+    # ---------------------- Fit ----------------------
+
+    def partial_fit(self, df):
+        """Bir parça veriyle çalışan min/max'ı güncelle (akan veri için)."""
+        for col in self.columns:
+            values = np.asarray(df[col], dtype=float)
+            if np.isnan(values).all():
+                continue
+            low, high = float(np.nanmin(values)), float(np.nanmax(values))
+            if col in self.bounds:
+                low, high = min(low, self.bounds[col][0]), max(high, self.bounds[col][1])
+            self.bounds[col] = (low, high)
+        self.n_rows += len(df)
+        return self
+
+    def fit(self, data):
+        """DataFrame veya DataFrame parçaları (iterable) üzerinden sınırları sıfırdan öğren.
+
+        Sürüm yalnızca sınırlar değiştiğinde artar (kayıtlı ölçekleyici yeniden fit edilirse).
+        """
+        previous_bounds = self.bounds
+        self.bounds = {}
+        self.n_rows = 0
+        for chunk in ([data] if isinstance(data, pd.DataFrame) else data):
+            self.partial_fit(chunk)
+        if self.bounds != previous_bounds or self.version == 0:
+            self.version += 1
+        self.fitted_at = datetime.now().isoformat(timespec="seconds")
+        self.rescale_required = False
+        self.rescale_columns = []
+        return self
+
+    # ---------------------- Transform ----------------------
+
+    def transform_column(self, col, values, policy=None):
+        policy = policy or self.policy
+        low, high = self.bounds[col]
+        values = np.asarray(values, dtype=float)
+
+        with np.errstate(invalid="ignore"):
+            out_of_range = (values < low) | (values > high)
+        if out_of_range.any():
+            if policy == "error":
+                raise ValueError(
+                    f"{col}: {int(out_of_range.sum())} değer kayıtlı sınırların ({low}, {high}) dışında."
+                )
+            if policy == "extend":
+                new_low, new_high = min(low, float(np.nanmin(values))), max(high, float(np.nanmax(values)))
+                warnings.warn(f"{col} sınırları genişletildi ({low}, {high}) → ({new_low}, {new_high}); "
+                              f"havuzun yeniden ölçeklenmesi gerekiyor.", stacklevel=3)
+                self.bounds[col] = (new_low, new_high)
+                self.version += 1
+                self.rescale_required = True
+                if col not in self.rescale_columns:
+                    self.rescale_columns.append(col)
+                low, high = new_low, new_high
+
+        range_low, range_high = self.feature_range
+        # min == max ise tüm değerler alt sınır (2_scaler.py'deki gibi bölme hatası önlenir)
+        if low == high:
+            return np.full(len(values), range_low, dtype=float)
+        scaled = (values - low) / (high - low) * (range_high - range_low) + range_low
+        if policy == "clip":
+            scaled = np.clip(scaled, range_low, range_high)
+        return scaled
+
+    def transform(self, df, policy=None):
+        """Ölçekli kolonları (col + suffix) eklenmiş kopya döndür."""
+        if not self.is_fitted:
+            raise ValueError("Ölçekleyici henüz fit edilmedi.")
+        df = df.copy()
+        for col in self.columns:
+            df[col + self.suffix] = self.transform_column(col, df[col], policy)
+        return df
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    # ---------------------- Kaydet / Yükle ----------------------
+
+    def to_dict(self):
+        return {
+            "version": self.version,
+            "fitted_at": self.fitted_at,
+            "n_rows": self.n_rows,
+            "policy": self.policy,
+            "suffix": self.suffix,
+            "feature_range": list(self.feature_range),
+            "columns": self.columns,
+            "bounds": {col: list(bound) for col, bound in self.bounds.items()},
+            "rescale_required": self.rescale_required,
+            "rescale_columns": self.rescale_columns,
+        }
+
+    def save(self, path=scaler_path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def from_dict(cls, data):
+        scaler = cls(data["columns"], data["suffix"], data["feature_range"], data["policy"])
+        scaler.bounds = {col: tuple(bound) for col, bound in data["bounds"].items()}
+        scaler.n_rows = data["n_rows"]
+        scaler.version = data["version"]
+        scaler.fitted_at = data["fitted_at"]
+        scaler.rescale_required = data.get("rescale_required", False)
+        scaler.rescale_columns = data.get("rescale_columns", [])
+        return scaler
+
+    @classmethod
+    def load(cls, path=scaler_path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yeni adayları kayıtlı min-max sınırlarıyla ölçekle")
+    parser.add_argument("--input", required=True, help="Ölçeklenecek aday dosyası (.xlsx)")
+    parser.add_argument("--output", required=True, help="Çıktı dosyası (.xlsx)")
+    parser.add_argument("--bounds", default=scaler_path, help="Kayıtlı sınır dosyası")
+    parser.add_argument("--policy", choices=POLICIES, default=None, help="Aralık dışı değer politikası")
+    args = parser.parse_args()
+
+    scaler = MinMaxScaler.load(args.bounds)
+    batch = pd.read_excel(args.input)
+    scaled = scaler.transform(batch, args.policy)
+    scaled.to_excel(args.output, index=False)
+    print(f"{len(batch)} aday sınır sürümü v{scaler.version} ile ölçeklendi: {args.output}")
+
+    # Genişletilen sınırlar yeni sürüm olarak kaydedilir
+    if scaler.rescale_required:
+        scaler.save(args.bounds)
+        print(f"Sınırlar v{scaler.version} olarak kaydedildi; havuz için 2_scaler.py yeniden çalıştırılmalı "
+              f"({', '.join(scaler.rescale_columns)}).")
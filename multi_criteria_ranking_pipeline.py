@@ -2,20 +2,70 @@
 AHP + TOPSIS + ELECTRE Pipeline (FINAL VERSION)
 ===============================================
 
+Birleşik rapora ayrıca PROMETHEE II net akışı (ELECTRE ile aynı ikili fark
+taramasında) ve VIKOR uzlaşı indeksi eklenir.
+
 Girdi:
 - ./outputs/ahp_weights_summary.xlsx (Birlesik_Agirlik)
-- ./outputs/processed_candidates_anonymized_scaled.xlsx
+- ./outputs/candidate_criteria.pkl (kompakt; yoksa processed_candidates_anonymized_scaled.xlsx)
 
 Çıktılar:
 - TOPSIS_Ranking.xlsx
 - ELECTRE_Results.xlsx
 - combined_ranking_report.xlsx
+- electre_state.npz (artımlı ekleme/çıkarma için, incremental_electre.py; ön filtre yokken)
+- results.sqlite (çalıştırma × aday sonuç deposu, results_db.py; --sonuc-db)
 (Optional: Concordance, Discordance, Outranking matrices)
+
+Excel dosyaları akışlı yazıcıyla (excel_export.py) arka plan thread'inde
+yazılır; sıralama sonuçları dosyalar bitmeden raporlanır. --metrics açıkken
+yazımlar ölçüm için eşzamanlıdır (write:<dosya> span'leri ana thread'de).
+
+Pareto ön filtresi (opsiyonel): ELECTRE yalnızca ilk K Pareto katmanında
+(--pareto-katman K) veya N kişilik kısa listeyi dolduran katmanlarda
+(--kisa-liste N) çalışır; filtre dışı adayların ELECTRE skoru boş kalır.
+Kaçınılan ikili karşılaştırma sayısı raporlanır.
+
+Outranking grafı (outranking_graph.py): döngüler SCC olarak birleştirilir;
+birleşik rapora baskılanma sayısı, graf katmanı ve ELECTRE I çekirdeği eklenir.
+
+Büyük havuzlar (--parcali KAYNAK): kriter matrisi belleğe sığmayan, parçalı
+.npy/.parquet olarak saklanan havuzlarda yalnızca iki geçişli bellek dışı TOPSIS
+çalışır (streaming_topsis.py); ilk k tablosu TOPSIS_Streaming_Top.xlsx'e, tüm
+skorlar topsis_streaming_scores.npy'ye yazılır. ELECTRE, PROMETHEE ve VIKOR
+tüm matrisi (ELECTRE/PROMETHEE ayrıca n² ikili karşılaştırma) istediğinden bu
+modda atlanır; parçalar streaming_topsis.py --disa-aktar ile üretilir.
 """
 
+import argparse
+import os
+
 import pandas as pd
 import numpy as np
 
+import mcdm_methods
+import excel_export
+import streaming_topsis
+import outranking_graph
+import results_db
+import pipeline_metrics
+from candidate_schema import criteria_path, features_path, load_criteria
+from incremental_electre import IncrementalElectreState, electre_state_path
+from outranking_store import OutrankingMatrix
+from pipeline_metrics import span
+
+parser = argparse.ArgumentParser(description="AHP + TOPSIS + ELECTRE pipeline")
+parser.add_argument("--pareto-katman", type=int, default=None, help="ELECTRE yalnızca ilk K Pareto katmanında çalışır")
+parser.add_argument("--kisa-liste", type=int, default=None, help="ELECTRE, N adayı dolduracak Pareto katmanlarında çalışır")
+parser.add_argument("--sonuc-db", default=results_db.results_db_path, help="SQLite sonuç deposu (boş → yazılmaz)")
+parser.add_argument("--parcali", metavar="KAYNAK", default=None, help="Parça klasörü veya .npy/.parquet: yalnızca bellek dışı TOPSIS")
+parser.add_argument("--ilk-k", type=int, default=streaming_topsis.TOP_K, help="--parcali: tutulacak en iyi aday sayısı")
+parser.add_argument("--parca", type=int, default=streaming_topsis.DEFAULT_CHUNK_ROWS, help="--parcali: parça başına satır")
+# Ölçüm bayrakları: --metrics <dosya.jsonl> / --profile-dir <klasör> (veya PIPELINE_METRICS)
+pipeline_metrics.add_arguments(parser)
+args = parser.parse_args()
+pipeline_metrics.configure_from_args(args)
+
 # -------------------------------------
 # Parametreler
 # -------------------------------------
@@ -25,28 +75,52 @@ weights_path = "./outputs/ahp_weights_summary.xlsx"
 candidates_path = "./outputs/processed_candidates_anonymized_scaled.xlsx"
 
 # ELECTRE threshold parametreleri (değiştirilebilir)
-C_threshold = 0.65  # Concordance threshold
-D_threshold = 0.35  # Discordance threshold
+C_threshold = mcdm_methods.C_THRESHOLD  # Concordance threshold
+D_threshold = mcdm_methods.D_THRESHOLD  # Discordance threshold
 
 # -------------------------------------
 # Ağırlıkları Yükle
 # -------------------------------------
 
-weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
-weights = weights_df["Birlesik_Agirlik"].values
-criteria_names = weights_df.index.tolist()
+with span("load:ahp_weights_summary.xlsx"):
+    weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+    weights = weights_df["Birlesik_Agirlik"].values
+    criteria_names = weights_df.index.tolist()
 
 print(f"Kriterler: {criteria_names}")
 print(f"Ağırlıklar: {weights}")
 
+# -------------------------------------
+# Büyük Havuz: Bellek Dışı TOPSIS (--parcali)
+# -------------------------------------
+
+# Havuz belleğe yüklenmez; iki geçişli TOPSIS sonrası ELECTRE aşamalarına geçilmeden çıkılır
+if args.parcali:
+    top_df, stream_report = streaming_topsis.streaming_topsis(
+        args.parcali, weights, criteria_names, args.ilk_k, args.parca, streaming_topsis.scores_path
+    )
+    with span("write:TOPSIS_Streaming_Top.xlsx", rows=len(top_df)):
+        top_df.to_excel(streaming_topsis.top_path)
+
+    print(f"\nAday sayısı: {stream_report['n_candidates']} ({stream_report['n_chunks']} parça, bellek dışı TOPSIS)")
+    print(f"\nİlk {len(top_df)} aday (TOPSIS):")
+    print(top_df.head(10).to_string())
+    print("\nELECTRE, PROMETHEE ve VIKOR tüm matrisi gerektirdiğinden atlandı.")
+    print("Çıktılar:")
+    print(f"- {streaming_topsis.top_path}")
+    print(f"- {streaming_topsis.scores_path}")
+    raise SystemExit(0)
+
 # -------------------------------------
 # Aday Verisini Yükle
 # -------------------------------------
 
-candidates_df = pd.read_excel(candidates_path)
-candidates_df.set_index("ID", inplace=True)
+# Kompakt kriter tablosu (candidate_criteria.pkl) varsa doğrudan o, yoksa Excel okunur
+with span("load:candidate_criteria") as record:
+    candidates_df = load_criteria(criteria_path, candidates_path)
+    record["rows"] = len(candidates_df)
 
-criteria_matrix = candidates_df[criteria_names].values
+criteria_matrix = candidates_df[criteria_names].to_numpy(dtype=float)
 
 print(f"\nAday sayısı: {criteria_matrix.shape[0]}")
 print(f"Kriter sayısı: {criteria_matrix.shape[1]}")
@@ -55,105 +129,153 @@ print(f"Kriter sayısı: {criteria_matrix.shape[1]}")
 # TOPSIS Hesaplama
 # -------------------------------------
 
-norm = np.linalg.norm(criteria_matrix, axis=0)
-normalized_matrix = criteria_matrix / norm
-weighted_matrix = normalized_matrix * weights
-
-ideal_solution = np.max(weighted_matrix, axis=0)
-anti_ideal_solution = np.min(weighted_matrix, axis=0)
-
-distance_to_ideal = np.linalg.norm(weighted_matrix - ideal_solution, axis=1)
-distance_to_anti_ideal = np.linalg.norm(weighted_matrix - anti_ideal_solution, axis=1)
-
-topsis_scores = distance_to_anti_ideal / (distance_to_ideal + distance_to_anti_ideal)
-topsis_ranking = np.argsort(topsis_scores)[::-1] + 1
+with span("topsis", rows=len(criteria_matrix)):
+    topsis_scores = mcdm_methods.topsis_scores(criteria_matrix, weights)
+    topsis_ranking = mcdm_methods.descending_rank(topsis_scores)
 
 topsis_df = candidates_df.copy()
 topsis_df["TOPSIS_Score"] = topsis_scores
 topsis_df["TOPSIS_Rank"] = topsis_ranking
 
 # -------------------------------------
-# ELECTRE Hesaplama
+# VIKOR Hesaplama
 # -------------------------------------
 
-n_candidates = criteria_matrix.shape[0]
-n_criteria = criteria_matrix.shape[1]
-
-C_matrix = np.zeros((n_candidates, n_candidates))
-D_matrix = np.zeros((n_candidates, n_candidates))
-
-for i in range(n_candidates):
-    for j in range(n_candidates):
-        if i == j:
-            continue
-        concordance_indices = criteria_matrix[i, :] >= criteria_matrix[j, :]
-        Cij = np.sum(weights[concordance_indices])
-        C_matrix[i, j] = Cij
-        
-        differences = np.abs(criteria_matrix[i, :] - criteria_matrix[j, :])
-        max_diff = np.max(differences)
-        if max_diff == 0:
-            D_matrix[i, j] = 0
-        else:
-            Dij = np.max((criteria_matrix[j, :] - criteria_matrix[i, :]) / max_diff)
-            D_matrix[i, j] = Dij
-
-outranking_matrix = np.zeros((n_candidates, n_candidates))
-
-for i in range(n_candidates):
-    for j in range(n_candidates):
-        if i == j:
-            continue
-        if C_matrix[i, j] >= C_threshold and D_matrix[i, j] <= D_threshold:
-            outranking_matrix[i, j] = 1
-        else:
-            outranking_matrix[i, j] = 0
+with span("vikor", rows=len(criteria_matrix)):
+    vikor_S, vikor_R, vikor_Q = mcdm_methods.vikor_scores(criteria_matrix, weights)
+    vikor_ranking = mcdm_methods.descending_rank(-vikor_Q)  # düşük Q daha iyi
 
-dominance_scores = np.sum(outranking_matrix, axis=1)
-
-electre_df = pd.DataFrame({
-    "ID": candidates_df.index,
-    "ELECTRE_Dominance_Score": dominance_scores
-}).set_index("ID")
+# -------------------------------------
+# ELECTRE (+ PROMETHEE II) Hesaplama
+# -------------------------------------
 
-electre_df["ELECTRE_Rank"] = electre_df["ELECTRE_Dominance_Score"].rank(ascending=False, method='min').astype(int)
+use_prefilter = args.pareto_katman is not None or args.kisa_liste is not None
+
+if use_prefilter:
+    with span("pareto_prefilter", rows=len(criteria_matrix)) as record:
+        selected, pareto_layers, prefilter_report = mcdm_methods.pareto_prefilter(
+            criteria_matrix, max_layers=args.pareto_katman, shortlist_size=args.kisa_liste
+        )
+        record.update(prefilter_report)
+    electre_index = candidates_df.index[selected]
+    electre_matrix = criteria_matrix[selected]
+    print(f"\nPareto ön filtresi: {prefilter_report['n_selected']}/{prefilter_report['n_candidates']} aday "
+          f"({prefilter_report['layers_used']} katman) ELECTRE'ye alındı.")
+    print(f"Kaçınılan ikili karşılaştırma: {prefilter_report['pairs_avoided']:,} / {prefilter_report['pairs_full']:,} "
+          f"(%{prefilter_report['avoided_ratio'] * 100:.1f})")
+else:
+    electre_index = candidates_df.index
+    electre_matrix = criteria_matrix
+
+with span("electre", rows=len(electre_matrix)) as record:
+    # Aynı kriter vektörlü adaylar tek profil olarak karşılaştırılır (n² → u²);
+    # PROMETHEE II tercihleri aynı ikili fark bloklarından hesaplanır
+    promethee_flows = mcdm_methods.PrometheeFlows(weights)
+    electre_state = mcdm_methods.ProfileElectreState(electre_matrix, consumers=[promethee_flows])
+    record.update(electre_state.work_report())
+    C_matrix, D_matrix, outranking_matrix = mcdm_methods.electre_matrices(
+        electre_matrix, weights, C_threshold, D_threshold, state=electre_state
+    )
+
+    dominance_scores = np.sum(outranking_matrix, axis=1)
+
+    electre_df = mcdm_methods.electre_ranking(dominance_scores, electre_index)
+
+    promethee_scores = promethee_flows.net_flows()
+    promethee_df = pd.DataFrame({
+        "PROMETHEE_Net_Flow": promethee_scores,
+        "PROMETHEE_Rank": mcdm_methods.descending_rank(promethee_scores),
+    }, index=electre_index)
+
+print(f"\nBenzersiz kriter profili: {electre_state.n_profiles} / {electre_state.n_candidates} aday")
+
+# Outranking grafı: SCC condensation, katmanlı kısmi sıra ve çekirdek
+with span("electre_graph", rows=len(electre_matrix)) as record:
+    graph_df = outranking_graph.graph_ranking(outranking_graph.from_dense(outranking_matrix), electre_index)
+    graph_summary = outranking_graph.graph_summary(graph_df)
+    record.update(graph_summary)
+
+print(f"ELECTRE çekirdeği: {graph_summary['n_kernel']} aday, {graph_summary['n_layers']} katman, "
+      f"döngülü bileşen: {graph_summary['n_cyclic_components']} ({graph_summary['n_candidates_in_cycles']} aday)")
 
 # -------------------------------------
 # Sonuçları Kaydet
 # -------------------------------------
 
+# Excel dosyaları arka planda sırayla yazılır
+exporter = excel_export.BackgroundExporter()
+
 # TOPSIS
 topsis_df_out = topsis_df[["TOPSIS_Score", "TOPSIS_Rank"]].copy()
-topsis_df_out.to_excel("./outputs/TOPSIS_Ranking.xlsx")
+exporter.submit(topsis_df_out, "./outputs/TOPSIS_Ranking.xlsx")
 
 # ELECTRE
-electre_df.to_excel("./outputs/ELECTRE_Results.xlsx")
+exporter.submit(electre_df, "./outputs/ELECTRE_Results.xlsx")
 
 # Combined Report
 combined_df = pd.DataFrame(index=candidates_df.index)
 combined_df["TOPSIS_Score"] = topsis_df_out["TOPSIS_Score"]
 combined_df["TOPSIS_Rank"] = topsis_df_out["TOPSIS_Rank"]
-combined_df["ELECTRE_Dominance_Score"] = electre_df["ELECTRE_Dominance_Score"]
-combined_df["ELECTRE_Rank"] = electre_df["ELECTRE_Rank"]
-
-combined_df.to_excel("./outputs/combined_ranking_report.xlsx")
+combined_df["ELECTRE_Dominance_Score"] = electre_df["ELECTRE_Dominance_Score"].reindex(combined_df.index).astype("Int64")
+combined_df["ELECTRE_Rank"] = electre_df["ELECTRE_Rank"].reindex(combined_df.index).astype("Int64")
+for column in ["ELECTRE_Dominated_By", "ELECTRE_Layer", "ELECTRE_SCC_Size"]:
+    combined_df[column] = graph_df[column].reindex(combined_df.index).astype("Int64")
+combined_df["ELECTRE_Kernel"] = graph_df["ELECTRE_Kernel"].reindex(combined_df.index).astype("boolean")
+combined_df["PROMETHEE_Net_Flow"] = promethee_df["PROMETHEE_Net_Flow"].reindex(combined_df.index)
+combined_df["PROMETHEE_Rank"] = promethee_df["PROMETHEE_Rank"].reindex(combined_df.index).astype("Int64")
+combined_df["VIKOR_S"] = vikor_S
+combined_df["VIKOR_R"] = vikor_R
+combined_df["VIKOR_Q"] = vikor_Q
+combined_df["VIKOR_Rank"] = vikor_ranking
+if use_prefilter:
+    combined_df["Pareto_Katmani"] = pareto_layers  # 0 → hesaplanan katmanların dışında
+
+exporter.submit(combined_df, "./outputs/combined_ranking_report.xlsx")
 
 # -------------------------------------
 # (Optional) Matrisleri de kaydet
 # -------------------------------------
 
 # Concordance matrix
-pd.DataFrame(C_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Concordance.xlsx")
+exporter.submit(pd.DataFrame(C_matrix, index=electre_index, columns=electre_index), "./outputs/ELECTRE_Concordance.xlsx")
 # Discordance matrix
-pd.DataFrame(D_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Discordance.xlsx")
+exporter.submit(pd.DataFrame(D_matrix, index=electre_index, columns=electre_index), "./outputs/ELECTRE_Discordance.xlsx")
 # Outranking matrix
-pd.DataFrame(outranking_matrix, index=candidates_df.index, columns=candidates_df.index).to_excel("./outputs/ELECTRE_Outranking.xlsx")
+exporter.submit(pd.DataFrame(outranking_matrix, index=electre_index, columns=electre_index), "./outputs/ELECTRE_Outranking.xlsx")
+# Outranking matrix (ID indeksli, bit-paketli → dashboard heatmap için)
+with span("write:ELECTRE_Outranking.npz", rows=len(candidates_df)):
+    OutrankingMatrix.from_dense(electre_index.values, outranking_matrix).save_npz("./outputs/ELECTRE_Outranking.npz")
+# Artımlı ELECTRE durumu (yalnızca tüm havuz hesaplandıysa; ön filtreli sonuçlar güncellenemez)
+if not use_prefilter:
+    IncrementalElectreState(
+        electre_index.values, electre_matrix, weights, dominance_scores, np.sum(outranking_matrix, axis=0),
+        C_threshold, D_threshold, criteria_names
+    ).save(electre_state_path)
+
+# Sonuç deposu: özellikler, kriterler, ağırlıklar, skorlar ve baskınlık kenarları (run_id × aday ID)
+if args.sonuc_db:
+    with span("write:results.sqlite", rows=len(candidates_df)):
+        features_df = pd.read_pickle(features_path).set_index("ID") if os.path.exists(features_path) else None
+        results_store = results_db.ResultsStore(args.sonuc_db)
+        results_store.write_run(
+            pipeline_metrics.run_id(), scores=combined_df, criteria=candidates_df[criteria_names],
+            features=features_df, weights=pd.Series(weights, index=criteria_names),
+            outranking=(electre_index.values, outranking_matrix), script="multi_criteria_ranking_pipeline",
+            C_threshold=C_threshold, D_threshold=D_threshold, prefilter=use_prefilter,
+        )
+        results_store.close()
 
 # -------------------------------------
 # Print log
 # -------------------------------------
 
 print("\nTOPSIS ve ELECTRE hesaplamaları başarıyla tamamlandı.")
+print("İlk 5 aday (TOPSIS):")
+print(combined_df.sort_values("TOPSIS_Rank")[["TOPSIS_Score", "TOPSIS_Rank", "ELECTRE_Rank"]].head().to_string())
+
+# Sıralama hazır; Excel dosyalarının bitmesini bekle
+print(f"\nExcel dosyaları yazılıyor ({len(exporter.pending)} dosya bekliyor)...")
+exporter.wait()
 print("Çıktılar:")
 print("- ./outputs/TOPSIS_Ranking.xlsx")
 print("- ./outputs/ELECTRE_Results.xlsx")
@@ -161,3 +283,8 @@ print("- ./outputs/combined_ranking_report.xlsx")
 print("- ./outputs/ELECTRE_Concordance.xlsx")
 print("- ./outputs/ELECTRE_Discordance.xlsx")
 print("- ./outputs/ELECTRE_Outranking.xlsx")
+print("- ./outputs/ELECTRE_Outranking.npz")
+if not use_prefilter:
+    print(f"- {electre_state_path}")
+if args.sonuc_db:
+    print(f"- {args.sonuc_db} (run_id: {pipeline_metrics.run_id()})")
@@ -0,0 +1,145 @@
+"""
+Çok Pozisyonlu Toplu Sıralama (TOPSIS + ELECTRE)
+================================================
+
+Her açık pozisyonun kendi AHP ağırlıkları (ve istenirse ELECTRE eşikleri)
+vardır. 30 pozisyon için pipeline'ı 30 kez çalıştırmak aday matrisini 30 kez
+okuyup normalize eder. Bu betik tek çalıştırmada:
+- Aday matrisini bir kez okur ve normalize eder
+- TOPSIS'i tüm pozisyonlar için tek matris çarpımıyla hesaplar:
+  uzaklık²[i, p] = Σ_k (r_ik - r*_k)² · w_pk²  →  ((R - R*)²) @ (W²)ᵀ
+  (ağırlıklar pozitif olduğundan ideal/anti-ideal çözüm w_p · max/min r_k'dır)
+  Skorlar tek pozisyonlu TOPSIS ile ~1e-16 içinde aynıdır; yalnızca bu kadar
+  yakın (fiilen eşit) skorlu adayların sırası yer değiştirebilir.
+- ELECTRE ikili karşılaştırma durumunu (ProfileElectreState) bir kez kurar;
+  her pozisyon yalnızca ağırlık tablosu okuması + eşik karşılaştırması yapar
+- Sonuçları (Pozisyon, ID) anahtarlı tek tabloya yazar
+
+Pozisyon tablosu (Excel): "Pozisyon" kolonu, kriter adlarıyla ağırlık
+kolonları ve opsiyonel "C_threshold" / "D_threshold" kolonları. Boş ağırlık
+hücresi (kriter o pozisyonda kullanılmıyor) 0 sayılır; ağırlıklar satır bazında
+toplamı 1 olacak şekilde normalize edilir. Ağırlık toplamı 0 olan pozisyon
+hata verir.
+
+Kullanım:
+    python multi_position_ranking.py --sablon ./data_sources/pozisyon_agirliklari.xlsx
+    python multi_position_ranking.py --pozisyonlar ./data_sources/pozisyon_agirliklari.xlsx
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import mcdm_methods
+import pipeline_metrics
+from candidate_schema import criteria_excel_path, criteria_path, load_criteria
+from pipeline_metrics import span
+
+# Dosya yolları
+weights_path = "./outputs/ahp_weights_summary.xlsx"
+positions_path = "./data_sources/pozisyon_agirliklari.xlsx"
+results_path = "./outputs/multi_position_ranking.xlsx"
+
+POSITION_COLUMN = "Pozisyon"
+THRESHOLD_COLUMNS = ("C_threshold", "D_threshold")
+
+
+def read_positions(path, criteria_names):
+    """Pozisyon tablosu → (pozisyon adları, ağırlık matrisi P × m, C eşikleri, D eşikleri)."""
+    positions_df = pd.read_excel(path)
+    missing = [col for col in [POSITION_COLUMN, *criteria_names] if col not in positions_df.columns]
+    if missing:
+        raise ValueError(f"Pozisyon tablosunda eksik kolonlar: {missing}")
+    if positions_df[POSITION_COLUMN].duplicated().any():
+        raise ValueError("Pozisyon tablosunda tekrarlanan pozisyon adları var.")
+
+    # Boş hücre: kriter bu pozisyonda kullanılmıyor
+    weights = positions_df[criteria_names].fillna(0).to_numpy(dtype=float)
+    if (weights < 0).any():
+        raise ValueError("Pozisyon ağırlıkları negatif olamaz.")
+    totals = weights.sum(axis=1, keepdims=True)
+    invalid = positions_df.loc[~np.isfinite(totals[:, 0]) | (totals[:, 0] <= 0), POSITION_COLUMN].tolist()
+    if invalid:
+        raise ValueError(f"Ağırlık toplamı 0 veya geçersiz pozisyonlar: {invalid}")
+    weights = weights / totals
+
+    C_thresholds = positions_df.get("C_threshold", pd.Series(mcdm_methods.C_THRESHOLD, index=positions_df.index))
+    D_thresholds = positions_df.get("D_threshold", pd.Series(mcdm_methods.D_THRESHOLD, index=positions_df.index))
+    return (positions_df[POSITION_COLUMN].tolist(), weights,
+            C_thresholds.fillna(mcdm_methods.C_THRESHOLD).to_numpy(dtype=float),
+            D_thresholds.fillna(mcdm_methods.D_THRESHOLD).to_numpy(dtype=float))
+
+
+def batch_topsis_scores(criteria_matrix, weight_matrix):
+    """Tüm pozisyonlar için TOPSIS skorları (n × P)."""
+    norm = np.linalg.norm(criteria_matrix, axis=0)
+    norm[norm == 0] = 1
+    normalized_matrix = criteria_matrix / norm
+    squared_weights = np.asarray(weight_matrix, dtype=float).T ** 2  # m × P
+
+    distance_to_ideal = np.sqrt(((normalized_matrix - normalized_matrix.max(axis=0)) ** 2) @ squared_weights)
+    distance_to_anti_ideal = np.sqrt(((normalized_matrix - normalized_matrix.min(axis=0)) ** 2) @ squared_weights)
+    return distance_to_anti_ideal / (distance_to_ideal + distance_to_anti_ideal)
+
+
+def rank_positions(criteria_matrix, index, position_names, weight_matrix, C_thresholds, D_thresholds):
+    """(Pozisyon, ID) anahtarlı TOPSIS + ELECTRE sonuç tablosu."""
+    with span("topsis_batch", rows=len(criteria_matrix), positions=len(position_names)):
+        topsis = batch_topsis_scores(criteria_matrix, weight_matrix)
+
+    with span("electre_state", rows=len(criteria_matrix)) as record:
+        electre_state = mcdm_methods.ProfileElectreState(criteria_matrix)
+        record.update(electre_state.work_report())
+
+    tables = []
+    for p, position in enumerate(position_names):
+        with span("electre_position", rows=len(criteria_matrix), position=position):
+            dominance = electre_state.dominance_scores(weight_matrix[p], C_thresholds[p], D_thresholds[p])
+        position_df = mcdm_methods.electre_ranking(dominance, index)
+        position_df.insert(0, "TOPSIS_Score", topsis[:, p])
+        position_df.insert(1, "TOPSIS_Rank", mcdm_methods.descending_rank(topsis[:, p]))
+        position_df.insert(0, POSITION_COLUMN, position)
+        tables.append(position_df.reset_index())
+    return pd.concat(tables, ignore_index=True).set_index([POSITION_COLUMN, "ID"])
+
+
+def write_template(path, weights_path=weights_path):
+    """Birleşik AHP ağırlıklarını tek satırlık pozisyon tablosu şablonu olarak yaz."""
+    weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+    template = pd.DataFrame([weights_df["Birlesik_Agirlik"].values], columns=weights_df.index)
+    template.insert(0, POSITION_COLUMN, "Genel")
+    template["C_threshold"] = mcdm_methods.C_THRESHOLD
+    template["D_threshold"] = mcdm_methods.D_THRESHOLD
+    template.to_excel(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bir aday havuzunu birden çok pozisyon için tek çalıştırmada sırala")
+    parser.add_argument("--pozisyonlar", default=positions_path, help="Pozisyon ağırlık/eşik tablosu (.xlsx)")
+    parser.add_argument("--cikti", default=results_path)
+    parser.add_argument("--sablon", default=None, help="Birleşik ağırlıklarla pozisyon tablosu şablonu yaz ve çık")
+    pipeline_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    pipeline_metrics.configure_from_args(args)
+
+    if args.sablon:
+        print(f"Pozisyon tablosu şablonu yazıldı: {write_template(args.sablon)}")
+        raise SystemExit(0)
+
+    with span("load:candidate_criteria") as record:
+        candidates_df = load_criteria(criteria_path, criteria_excel_path)
+        record["rows"] = len(candidates_df)
+    criteria_names = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0).index.tolist()
+    position_names, weight_matrix, C_thresholds, D_thresholds = read_positions(args.pozisyonlar, criteria_names)
+    criteria_matrix = candidates_df[criteria_names].to_numpy(dtype=float)
+
+    print(f"Aday sayısı: {len(criteria_matrix)}, pozisyon sayısı: {len(position_names)}")
+    results_df = rank_positions(criteria_matrix, candidates_df.index, position_names,
+                                weight_matrix, C_thresholds, D_thresholds)
+
+    with span("write:multi_position_ranking.xlsx", rows=len(results_df)):
+        # Anahtar kolonlar düz yazılır (MultiIndex Excel'de birleştirilmiş hücre olur)
+        results_df.reset_index().to_excel(args.cikti, index=False)
+    print(f"Çıktı ({len(results_df)} satır, Pozisyon × ID): {args.cikti}")
@@ -0,0 +1,157 @@
+"""
+ELECTRE Outranking Grafı: Çekirdek (Kernel) ve Katmanlı Kısmi Sıra
+==================================================================
+
+Pipeline adayları yalnızca ELECTRE_Dominance_Score (satır toplamı) ile
+sıralar; outranking grafındaki döngüler yok sayılır. Bu modül outranking
+ilişkisini seyrek (CSR) graf olarak ele alır (scipy.sparse.csgraph):
+- Güçlü bağlı bileşenler (SCC) tek düğüme indirgenir (condensation); döngüdeki
+  adaylar birbirine denk (kayıtsız) sayılır → döngüsüz graf (DAG)
+- Katman: kaynaklardan (baskılanmayan bileşenler) en uzun yol derinliği;
+  aynı katmandaki adaylar arasında baskınlık yoktur (katmanlı kısmi sıra)
+- Çekirdek (ELECTRE I kernel): DAG'de tek ve kesin; topolojik sırada,
+  çekirdekteki hiçbir düğümce baskılanmayan düğüm çekirdeğe girer. Çekirdek
+  bileşenindeki tüm adaylar çekirdektedir
+- Baskılanma sayısı (ELECTRE_Dominated_By): outranking sütun toplamı
+
+Tüm adımlar kenar sayısında (E) doğrusala yakındır; graf yoğun n × n matris
+oluşturulmadan blok blok da kurulabilir (sparse_outranking).
+
+Kullanım (yoğun matris olmadan, kompakt kriter tablosundan):
+    python outranking_graph.py --cikti ./outputs/ELECTRE_Graph.xlsx
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse import csgraph
+
+import mcdm_methods
+from candidate_schema import criteria_excel_path, criteria_path, load_criteria
+from incremental_electre import PAIR_BUDGET
+
+# Dosya yolları
+weights_path = "./outputs/ahp_weights_summary.xlsx"
+graph_results_path = "./outputs/ELECTRE_Graph.xlsx"
+
+
+# ---------------------- Graf kurulumu ----------------------
+
+def from_dense(outranking_matrix):
+    """Yoğun 0/1 outranking matrisinden CSR graf (i → j: i, j'yi baskılar)."""
+    matrix = np.asarray(outranking_matrix) != 0
+    np.fill_diagonal(matrix, False)
+    return sparse.csr_matrix(matrix, dtype=np.int8)
+
+
+def sparse_outranking(criteria_matrix, weights, C_threshold=mcdm_methods.C_THRESHOLD,
+                      D_threshold=mcdm_methods.D_THRESHOLD, pair_budget=PAIR_BUDGET):
+    """Outranking grafını satır blokları halinde kur; yalnızca kenarlar saklanır."""
+    X = np.asarray(criteria_matrix, dtype=float)
+    n_candidates = len(X)
+    block_size = max(1, pair_budget // max(n_candidates, 1))
+    rows, cols = [], []
+    for start in range(0, n_candidates, block_size):
+        stop = min(start + block_size, n_candidates)
+        outranks, _ = mcdm_methods.electre_against_pool(X, X[start:stop], weights, C_threshold, D_threshold)
+        outranks[np.arange(stop - start), np.arange(start, stop)] = False  # i == j
+        block_rows, block_cols = np.nonzero(outranks)
+        rows.append(block_rows + start)
+        cols.append(block_cols)
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    return sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n_candidates, n_candidates))
+
+
+def _successors(adjacency, nodes):
+    """CSR grafta verilen düğümlerin tüm komşuları (tekrarlı)."""
+    starts, stops = adjacency.indptr[nodes], adjacency.indptr[nodes + 1]
+    lengths = stops - starts
+    if lengths.sum() == 0:
+        return np.empty(0, dtype=adjacency.indices.dtype)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return adjacency.indices[offsets + np.arange(lengths.sum())]
+
+
+def condensation(adjacency):
+    """SCC etiketleri ve bileşenler arası döngüsüz (DAG) CSR graf."""
+    n_components, labels = csgraph.connected_components(adjacency, directed=True, connection="strong")
+    coo = adjacency.tocoo()
+    source, target = labels[coo.row], labels[coo.col]
+    between = source != target
+    dag = sparse.csr_matrix((np.ones(between.sum(), dtype=np.int32), (source[between], target[between])),
+                            shape=(n_components, n_components))
+    dag.data[:] = 1  # tekrarlı kenarlar toplandıysa
+    return labels, dag
+
+
+def dag_layers_and_kernel(dag):
+    """Katman (1 = baskılanmayanlar, en uzun yol derinliği) ve çekirdek maskesi."""
+    n_nodes = dag.shape[0]
+    in_degree = np.bincount(dag.indices, minlength=n_nodes)
+    layers = np.zeros(n_nodes, dtype=np.int64)
+    kernel = np.zeros(n_nodes, dtype=bool)
+    covered = np.zeros(n_nodes, dtype=bool)  # çekirdekteki bir düğümce baskılanan
+
+    frontier = np.flatnonzero(in_degree == 0)
+    layer = 1
+    while len(frontier):
+        layers[frontier] = layer
+        # Katman içinde kenar yok: öncüllerin tamamı önceki katmanlarda işlendi
+        kernel_nodes = frontier[~covered[frontier]]
+        kernel[kernel_nodes] = True
+        covered[_successors(dag, kernel_nodes)] = True
+
+        successors = _successors(dag, frontier)
+        in_degree -= np.bincount(successors, minlength=n_nodes)
+        candidates = np.unique(successors)
+        frontier = candidates[in_degree[candidates] == 0]
+        layer += 1
+    return layers, kernel
+
+
+def graph_ranking(adjacency, index):
+    """Aday bazlı graf sonuçları (ID indeksli)."""
+    labels, dag = condensation(adjacency)
+    layers, kernel = dag_layers_and_kernel(dag)
+    component_sizes = np.bincount(labels)
+    graph_df = pd.DataFrame({
+        "ID": index,
+        "ELECTRE_Dominated_By": np.bincount(adjacency.indices, minlength=adjacency.shape[0]),
+        "ELECTRE_SCC": labels,
+        "ELECTRE_SCC_Size": component_sizes[labels],
+        "ELECTRE_Layer": layers[labels],
+        "ELECTRE_Kernel": kernel[labels],
+    }).set_index("ID")
+    return graph_df
+
+
+def graph_summary(graph_df):
+    return {
+        "n_candidates": len(graph_df),
+        "n_kernel": int(graph_df["ELECTRE_Kernel"].sum()),
+        "n_layers": int(graph_df["ELECTRE_Layer"].max()) if len(graph_df) else 0,
+        "n_cyclic_components": int(graph_df.loc[graph_df["ELECTRE_SCC_Size"] > 1, "ELECTRE_SCC"].nunique()),
+        "n_candidates_in_cycles": int((graph_df["ELECTRE_SCC_Size"] > 1).sum()),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seyrek outranking grafı: çekirdek ve katmanlar")
+    parser.add_argument("--cikti", default=graph_results_path)
+    args = parser.parse_args()
+
+    weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+    candidates_df = load_criteria(criteria_path, criteria_excel_path)
+    criteria_matrix = candidates_df[weights_df.index.tolist()].to_numpy(dtype=float)
+
+    adjacency = sparse_outranking(criteria_matrix, weights_df["Birlesik_Agirlik"].values)
+    graph_df = graph_ranking(adjacency, candidates_df.index)
+    graph_df.to_excel(args.cikti)
+
+    summary = graph_summary(graph_df)
+    print(f"Kenar sayısı: {adjacency.nnz:,} ({summary['n_candidates']} aday)")
+    print(f"Çekirdek: {summary['n_kernel']} aday, katman sayısı: {summary['n_layers']}")
+    print(f"Döngülü bileşen: {summary['n_cyclic_components']} ({summary['n_candidates_in_cycles']} aday)")
+    print(f"Çıktı: {args.cikti}")
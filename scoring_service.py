@@ -0,0 +1,221 @@
+"""
+Yerel Aday Skorlama Servisi (HTTP)
+==================================
+
+Tek bir yeni adayı (veya küçük bir grubu) tüm betikleri yeniden çalıştırmadan,
+hazır (warm) aday havuzuna göre milisaniyeler içinde skorlar.
+
+Bellekte tutulanlar:
+- Havuzun kriter matrisi ve TOPSIS referansı (normlar, ideal/anti-ideal)
+- Havuzun ELECTRE baskınlık skorları
+- Kayıtlı min/max ölçekleyiciler (2_scaler.py ve sosyal aktivite 0-100 sınırları)
+- AHP birleşik ağırlıkları
+- Embedding modeli (SentenceTransformer)
+
+Uç noktalar:
+- GET  /health → {"status": "ok", "pool_size": n}
+- POST /score  → ham aday kaydı (aday_havuzu.xlsx sütun adlarıyla JSON obje)
+                 veya kayıt listesi; özellikler, TOPSIS skoru/sırası ve havuza
+                 karşı ELECTRE baskınlığı döner
+
+Havuz sabit kabul edilir: yeni adaylar havuza eklenmez, birbirleriyle
+karşılaştırılmaz. Hedef: tek kayıt için p99 ≤ P99_TARGET_MS
+(scoring_service_loadtest.py ile ölçülür).
+
+Kullanım:
+    python scoring_service.py --port 8765
+"""
+
+import argparse
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import mcdm_methods
+import text_richness
+from candidate_features import FEATURE_STEPS, anon_columns, featurize_record
+from candidate_schema import criteria_path, features_path, load_criteria
+from minmax_scaler import MinMaxScaler, scaler_path, social_scaler_path
+
+# Dosya yolları
+weights_path = "./outputs/ahp_weights_summary.xlsx"
+candidates_path = "./outputs/processed_candidates_anonymized_scaled.xlsx"
+full_candidates_path = "./outputs/processed_candidates_full.xlsx"
+
+# Servis ayarları
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Tek kayıt için p99 gecikme hedefi (ms, embedding dahil, yerel CPU)
+P99_TARGET_MS = 100
+
+
+class WarmPool:
+    """Skorlama için gereken havuz durumunu bellekte tutar."""
+
+    def __init__(self, weights_path=weights_path, candidates_path=candidates_path,
+                 full_candidates_path=full_candidates_path,
+                 C_threshold=mcdm_methods.C_THRESHOLD, D_threshold=mcdm_methods.D_THRESHOLD):
+        self.C_threshold = C_threshold
+        self.D_threshold = D_threshold
+
+        # AHP ağırlıkları
+        weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+        self.weights = weights_df["Birlesik_Agirlik"].values
+        self.criteria_names = weights_df.index.tolist()
+
+        # Havuz kriter matrisi (kompakt tablo varsa o)
+        candidates_df = load_criteria(criteria_path, candidates_path)
+        self.pool_ids = candidates_df.index.values
+        self.criteria_matrix = candidates_df[self.criteria_names].to_numpy(dtype=float)
+
+        # 2_scaler.py'nin kaydettiği min/max sınırları (yoksa havuzdan öğrenilir)
+        if os.path.exists(scaler_path):
+            self.scaler = MinMaxScaler.load(scaler_path)
+        else:
+            scaled_columns = [col for col in anon_columns if col != "ID" and col != "Deneyim Seviyesi (Kategori)"]
+            self.scaler = MinMaxScaler(scaled_columns).fit(candidates_df)
+        self.scaled_columns = self.scaler.columns
+
+        # Sosyal aktivite 0-100 dönüşümü için ham skor sınırları (1_tamTemiz_pipeline.py)
+        if os.path.exists(social_scaler_path):
+            self.social_scaler = MinMaxScaler.load(social_scaler_path)
+        else:
+            # Özellik tablosu: kompakt pickle, yoksa Excel kopyası (ham metin içermez)
+            if os.path.exists(features_path):
+                social_scores = pd.read_pickle(features_path)[["Sosyal Aktivite Skoru"]]
+            else:
+                social_scores = pd.read_excel(full_candidates_path, usecols=["Sosyal Aktivite Skoru"])
+            self.social_scaler = MinMaxScaler(["Sosyal Aktivite Skoru"], suffix=" (0-100)").fit(social_scores)
+
+        # TOPSIS referansı ve havuzun ELECTRE baskınlık skorları
+        self.topsis = mcdm_methods.TopsisReference(self.criteria_matrix, self.weights)
+        state = mcdm_methods.ProfileElectreState(self.criteria_matrix)
+        self.pool_dominance = state.dominance_scores(self.weights, C_threshold, D_threshold)
+
+        # Metin zenginliği backend'ini (embedding modeli) şimdiden yükle (ilk istek yavaş olmasın)
+        text_richness.get_backend().warm_up()
+
+    @property
+    def pool_size(self):
+        return len(self.pool_ids)
+
+    def featurize(self, records):
+        """Kayıtların skor kolonları: {kolon: numpy dizisi} (ham metinler DataFrame'e alınmaz)."""
+        rows = [featurize_record(record) for record in records]
+        features = {column: np.array([float(row[column]) for row in rows]) for column, _, _ in FEATURE_STEPS}
+        # Havuz sınırlarıyla ölçekle; aralık dışı değerler kırpılır (havuz yeniden ölçeklenmez)
+        features["Sosyal Aktivite Skoru (0-100)"] = self.social_scaler.transform_column(
+            "Sosyal Aktivite Skoru", features["Sosyal Aktivite Skoru"], policy="clip"
+        )
+        for col in self.scaled_columns:
+            features[col + " (Scaled)"] = self.scaler.transform_column(col, features[col], policy="clip")
+        return features
+
+    def score(self, records):
+        features = self.featurize(records)
+        criteria_matrix = np.column_stack([features[col] for col in self.criteria_names])
+
+        # TOPSIS (havuz normalizasyonu sabit)
+        topsis_scores = self.topsis.score(criteria_matrix)
+        topsis_ranks = self.topsis.rank(topsis_scores)
+
+        # ELECTRE (havuza karşı iki yönlü)
+        outranks, outranked_by = mcdm_methods.electre_against_pool(
+            self.criteria_matrix, criteria_matrix, self.weights, self.C_threshold, self.D_threshold
+        )
+        dominance = outranks.sum(axis=1)
+        dominated_by = outranked_by.sum(axis=1)
+        # Yeni adayı baskılayan havuz adaylarının skoru 1 artar
+        electre_ranks = ((self.pool_dominance[None, :] + outranked_by) > dominance[:, None]).sum(axis=1) + 1
+
+        feature_columns = [col for col in anon_columns if col != "ID"] + [col + " (Scaled)" for col in self.scaled_columns]
+        results = []
+        for k, record in enumerate(records):
+            results.append({
+                "ID": record.get("ID"),
+                "features": {col: float(features[col][k]) for col in feature_columns},
+                "TOPSIS_Score": float(topsis_scores[k]),
+                "TOPSIS_Rank": int(topsis_ranks[k]),
+                "ELECTRE_Dominance_Score": int(dominance[k]),
+                "ELECTRE_Dominated_By": int(dominated_by[k]),
+                "ELECTRE_Rank": int(electre_ranks[k]),
+                "pool_size": self.pool_size,
+            })
+        return results
+
+
+def make_handler(pool):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok", "pool_size": pool.pool_size})
+            else:
+                self._send_json(404, {"error": "Bilinmeyen uç nokta"})
+
+        def do_POST(self):
+            if self.path != "/score":
+                self._send_json(404, {"error": "Bilinmeyen uç nokta"})
+                return
+            start = time.perf_counter()
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                records = [payload] if isinstance(payload, dict) else payload
+                if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+                    raise ValueError("Gövde bir aday kaydı (JSON obje) veya kayıt listesi olmalı.")
+                nested = sorted({key for r in records for key, value in r.items() if isinstance(value, (dict, list))})
+                if nested:
+                    raise ValueError(f"Kayıt alanları metin veya sayı olmalı: {nested}")
+                results = pool.score(records)
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except Exception as e:  # istemci her durumda JSON yanıt alır
+                self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            latency_ms = (time.perf_counter() - start) * 1000
+            if isinstance(payload, dict):
+                self._send_json(200, {**results[0], "latency_ms": latency_ms})
+            else:
+                self._send_json(200, {"results": results, "latency_ms": latency_ms})
+
+        def log_message(self, format, *args):
+            pass  # her istek için konsol çıktısı gecikmeyi artırmasın
+
+    return ScoringHandler
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, pool=None):
+    pool = pool or WarmPool()
+    server = ThreadingHTTPServer((host, port), make_handler(pool))
+    print(f"Skorlama servisi hazır: http://{host}:{port} (havuz: {pool.pool_size} aday)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yerel aday skorlama servisi")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    text_richness.add_arguments(parser)
+    args = parser.parse_args()
+    text_richness.configure_from_args(args)
+
+    print("Havuz ve model yükleniyor...")
+    serve(args.host, args.port)
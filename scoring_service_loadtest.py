@@ -0,0 +1,106 @@
+"""
+Skorlama Servisi Yük Testi
+==========================
+
+Çalışan scoring_service.py'ye (localhost) aday_havuzu.xlsx'ten alınan gerçek
+kayıtlarla eşzamanlı istekler gönderir; p50/p95/p99 gecikmeleri ve saniyedeki
+istek sayısını raporlar. p99, P99_TARGET_MS'i aşarsa çıkış kodu 1'dir.
+
+Kullanım:
+    python scoring_service.py --port 8765            # ayrı terminalde
+    python scoring_service_loadtest.py --requests 500 --concurrency 4
+    python scoring_service_loadtest.py --batch-size 20  # toplu istekler
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from candidate_features import clean_columns
+from scoring_service import DEFAULT_HOST, DEFAULT_PORT, P99_TARGET_MS
+
+# Örnek kayıtların alınacağı ham aday dosyası
+records_path = "./data_sources/aday_havuzu.xlsx"
+
+
+# Ham Excel satırlarını JSON isteğine uygun kayıtlara çevir
+def load_sample_records(path=records_path):
+    df = clean_columns(pd.read_excel(path))
+    records = []
+    for row in df.to_dict(orient="records"):
+        record = {}
+        for key, value in row.items():
+            if pd.isna(value):
+                continue
+            if isinstance(value, pd.Timestamp):
+                value = value.strftime("%d.%m.%Y")
+            elif isinstance(value, np.generic):
+                value = value.item()
+            record[key] = value
+        records.append(record)
+    return records
+
+
+def post_json(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST"
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_load_test(url, records, n_requests, concurrency, batch_size):
+    payloads = []
+    for i in range(n_requests):
+        if batch_size == 1:
+            payloads.append(records[i % len(records)])
+        else:
+            payloads.append([records[(i * batch_size + k) % len(records)] for k in range(batch_size)])
+
+    # Isınma isteği (bağlantı + ilk çağrı)
+    post_json(url, payloads[0])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = np.array(list(executor.map(lambda payload: post_json(url, payload), payloads)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "max_ms": float(latencies.max()),
+        "requests_per_sec": n_requests / elapsed,
+        "candidates_per_sec": n_requests * batch_size / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Skorlama servisi yük testi")
+    parser.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/score")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--p99-target-ms", type=float, default=P99_TARGET_MS)
+    args = parser.parse_args()
+
+    records = load_sample_records()
+    report = run_load_test(args.url, records, args.requests, args.concurrency, args.batch_size)
+
+    print(json.dumps(report, indent=2))
+    if args.batch_size == 1:
+        hedef_tutuldu = report["p99_ms"] <= args.p99_target_ms
+        print(f"p99 hedefi ({args.p99_target_ms:.0f} ms): {'TUTTU' if hedef_tutuldu else 'AŞILDI'}")
+        sys.exit(0 if hedef_tutuldu else 1)
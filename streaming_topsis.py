@@ -0,0 +1,311 @@
+"""
+İki Geçişli Bellek Dışı (Out-of-Core) TOPSIS
+============================================
+
+mcdm_methods.topsis_scores tüm kriter matrisini bellekte ister (sütun normları,
+ideal ve anti-ideal çözüm için). Bu modül parça parça saklanan havuzlarda
+TOPSIS'i iki geçişte hesaplar; bellek havuz boyutundan bağımsız
+O(parça + m + k)'dır:
+- 1. geçiş: kriter başına kareler toplamı ve ham max/min. Ağırlıklı normalize
+  değer x / norm · w, x'in artan fonksiyonu olduğundan (w ≥ 0) ağırlıklı
+  ideal/anti-ideal ham max/min'den birebir elde edilir
+- 2. geçiş: parçalar yeniden okunur, uzaklıklar ve skorlar hesaplanır; skorlar
+  girdi satır sırasıyla .npy dosyasına (memmap) yazılır, yalnızca ilk k aday
+  sınırlı bir min-heap'te tutulur (eşit skorda önce gelen satır önde,
+  descending_rank ile aynı)
+
+Girdi biçimleri:
+- Tek .npy (n × m) dosyası: memmap ile açılır, --parca satırlık dilimler okunur
+- Klasör: sıralı parça dosyaları (part-00000.npy, ... veya part-00000.parquet, ...);
+  yalnızca part-NNNNN adlı dosyalar okunur, iki biçim birlikte bulunursa hata
+  verilir. Aynı klasöre yeniden dışa aktarım eski parçaları siler
+- .npy parçalarının yanında "<parça>_ids.npy" (aday ID'leri, yoksa satır no)
+  ve klasörde "columns.json" (kriter adları, yoksa ağırlık sırası varsayılır)
+- .parquet girdisi/çıktısı için pyarrow gerekir (opsiyonel)
+
+Kullanım:
+    python streaming_topsis.py --disa-aktar ./outputs/criteria_chunks --parca 100000
+    python streaming_topsis.py --girdi ./outputs/criteria_chunks --ilk-k 50
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from candidate_schema import criteria_excel_path, criteria_path, load_criteria
+from pipeline_metrics import span
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsiyonel
+    pq = None
+
+# Dosya yolları
+weights_path = "./outputs/ahp_weights_summary.xlsx"
+chunks_dir = "./outputs/criteria_chunks"
+top_path = "./outputs/TOPSIS_Streaming_Top.xlsx"
+scores_path = "./outputs/topsis_streaming_scores.npy"
+
+COLUMNS_FILE = "columns.json"
+PART_PATTERN = re.compile(r"part-\d{5}\.(npy|parquet)$")
+DEFAULT_CHUNK_ROWS = 100_000
+TOP_K = 20
+
+
+# ---------------------- Parça Okuma / Yazma ----------------------
+
+def _require_pyarrow():
+    if pq is None:
+        raise ImportError("Parquet parçaları için pyarrow gerekli: pip install pyarrow")
+
+
+def _column_index(names, criteria):
+    """Dosyadaki kolon sırasından kriter (ağırlık) sırasına indeks; ad yoksa sıra aynı varsayılır."""
+    if names is None:
+        return None
+    missing = [name for name in criteria if name not in names]
+    if missing:
+        raise ValueError(f"Parçalarda eksik kriter kolonları: {missing}")
+    return [names.index(name) for name in criteria]
+
+
+def _npy_chunks(path, criteria, chunk_rows, row_offset, column_index):
+    matrix = np.load(path, mmap_mode="r")
+    ids_path = path[:-len(".npy")] + "_ids.npy"
+    ids = np.load(ids_path, mmap_mode="r") if os.path.exists(ids_path) else None
+    if column_index is None and matrix.shape[1] != len(criteria):
+        raise ValueError(f"{path}: {matrix.shape[1]} kolon var, {len(criteria)} kriter bekleniyor")
+    for start in range(0, len(matrix), chunk_rows):
+        block = matrix[start:start + chunk_rows]
+        X = np.asarray(block[:, column_index] if column_index is not None else block, dtype=float)
+        chunk_ids = (np.array(ids[start:start + chunk_rows]) if ids is not None
+                     else np.arange(row_offset + start, row_offset + start + len(X)))
+        yield chunk_ids, X
+
+
+def _parquet_chunks(path, criteria, chunk_rows, row_offset):
+    _require_pyarrow()
+    parquet_file = pq.ParquetFile(path)
+    has_ids = "ID" in parquet_file.schema_arrow.names
+    columns = (["ID"] if has_ids else []) + list(criteria)
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        X = np.column_stack([batch.column(name).to_numpy(zero_copy_only=False) for name in criteria]).astype(float)
+        chunk_ids = (batch.column("ID").to_numpy(zero_copy_only=False) if has_ids
+                     else np.arange(row_offset, row_offset + len(X)))
+        row_offset += len(X)
+        yield chunk_ids, X
+
+
+def _part_files(directory):
+    """Klasördeki part-NNNNN.npy / part-NNNNN.parquet dosyaları (ID ve diğer dosyalar hariç)."""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if PART_PATTERN.fullmatch(name)
+    )
+
+
+def chunk_files(source):
+    """Kaynak dosya listesi (tek dosya veya klasördeki sıralı parçalar)."""
+    if os.path.isfile(source):
+        return [source]
+    files = _part_files(source)
+    if not files:
+        raise FileNotFoundError(f"{source}: part-NNNNN.npy veya part-NNNNN.parquet parça dosyası bulunamadı")
+    formats = {os.path.splitext(path)[1] for path in files}
+    if len(formats) > 1:
+        raise ValueError(f"{source}: hem .npy hem .parquet parçaları var; adaylar iki kez sayılırdı")
+    return files
+
+
+def iter_chunks(source, criteria, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """(ID dizisi, r × m kriter matrisi) parçaları; kolonlar criteria sırasında."""
+    directory = source if os.path.isdir(source) else os.path.dirname(source)
+    columns_path = os.path.join(directory, COLUMNS_FILE)
+    names = None
+    if os.path.exists(columns_path):
+        with open(columns_path, encoding="utf-8") as f:
+            names = json.load(f)
+    column_index = _column_index(names, criteria)
+
+    row_offset = 0
+    for path in chunk_files(source):
+        reader = (_parquet_chunks(path, criteria, chunk_rows, row_offset) if path.endswith(".parquet")
+                  else _npy_chunks(path, criteria, chunk_rows, row_offset, column_index))
+        for chunk_ids, X in reader:
+            row_offset += len(X)
+            yield chunk_ids, X
+
+
+def write_chunks(criteria_df, directory, chunk_rows=DEFAULT_CHUNK_ROWS, fmt="npy"):
+    """ID indeksli kriter tablosunu parça dosyalarına yaz (.npy + _ids.npy veya .parquet)."""
+    if fmt == "parquet":
+        _require_pyarrow()
+    os.makedirs(directory, exist_ok=True)
+    # Önceki dışa aktarımın parçaları kalırsa havuz eski/yinelenen adaylarla okunur
+    for path in glob.glob(os.path.join(directory, "part-*")):
+        os.remove(path)
+    with open(os.path.join(directory, COLUMNS_FILE), "w", encoding="utf-8") as f:
+        json.dump([str(col) for col in criteria_df.columns], f, ensure_ascii=False)
+    paths = []
+    for part, start in enumerate(range(0, len(criteria_df), chunk_rows)):
+        chunk = criteria_df.iloc[start:start + chunk_rows]
+        stem = os.path.join(directory, f"part-{part:05d}")
+        if fmt == "parquet":
+            chunk.reset_index().to_parquet(stem + ".parquet", index=False)
+            paths.append(stem + ".parquet")
+        else:
+            np.save(stem + ".npy", chunk.to_numpy(dtype=float))
+            np.save(stem + "_ids.npy", chunk.index.to_numpy())
+            paths.append(stem + ".npy")
+    return paths
+
+
+# ---------------------- İki Geçişli TOPSIS ----------------------
+
+class StreamingTopsis:
+    """Parça parça beslenen TOPSIS: accumulate (1. geçiş) → finalize → score/offer (2. geçiş)."""
+
+    def __init__(self, weights, top_k=TOP_K):
+        self.weights = np.asarray(weights, dtype=float)
+        if np.any(self.weights < 0):
+            raise ValueError("Akışlı TOPSIS negatif olmayan ağırlıklar gerektirir.")
+        n_criteria = len(self.weights)
+        self.top_k = top_k
+        self.n_candidates = 0
+        self.sum_squares = np.zeros(n_criteria)
+        self.column_max = np.full(n_criteria, -np.inf)
+        self.column_min = np.full(n_criteria, np.inf)
+        self._heap = []  # (skor, -satır no, ID); heap[0] → ilk k'nın en zayıfı
+
+    def accumulate(self, X):
+        self.n_candidates += len(X)
+        self.sum_squares += np.einsum("ij,ij->j", X, X)
+        if len(X):
+            np.maximum(self.column_max, X.max(axis=0), out=self.column_max)
+            np.minimum(self.column_min, X.min(axis=0), out=self.column_min)
+
+    def finalize(self):
+        self.norm = np.sqrt(self.sum_squares)
+        self.norm[self.norm == 0] = 1  # tamamen 0 olan kriter → bölme hatasını önle
+        self.ideal_solution = self.column_max / self.norm * self.weights
+        self.anti_ideal_solution = self.column_min / self.norm * self.weights
+
+    def score(self, X):
+        weighted_matrix = X / self.norm * self.weights
+        distance_to_ideal = np.linalg.norm(weighted_matrix - self.ideal_solution, axis=1)
+        distance_to_anti_ideal = np.linalg.norm(weighted_matrix - self.anti_ideal_solution, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return distance_to_anti_ideal / (distance_to_ideal + distance_to_anti_ideal)
+
+    def offer(self, ids, scores, row_offset):
+        """Parçanın ilk k adayını heap'e ekle (parça içinde argpartition, eşitlikte önce gelen satır)."""
+        keys = np.where(np.isnan(scores), -np.inf, scores)  # NaN skor → en sona
+        if len(keys) > self.top_k:
+            threshold = np.partition(keys, len(keys) - self.top_k)[len(keys) - self.top_k]
+            above = np.flatnonzero(keys > threshold)
+            tied = np.flatnonzero(keys == threshold)[:self.top_k - len(above)]
+            rows = np.concatenate([above, tied])
+        else:
+            rows = np.arange(len(keys))
+        for row in rows:
+            item = (keys[row], -(row_offset + int(row)), ids[row], scores[row])
+            if len(self._heap) < self.top_k:
+                heapq.heappush(self._heap, item)
+            elif item[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, item)
+
+    def top(self):
+        """İlk k aday: ID indeksli TOPSIS_Score, TOPSIS_Rank."""
+        items = sorted(self._heap, key=lambda item: item[:2], reverse=True)
+        top_df = pd.DataFrame({
+            "ID": [item[2] for item in items],
+            "TOPSIS_Score": [item[3] for item in items],
+            "TOPSIS_Rank": np.arange(1, len(items) + 1),
+        }).set_index("ID")
+        return top_df
+
+
+def streaming_topsis(source, weights, criteria, top_k=TOP_K, chunk_rows=DEFAULT_CHUNK_ROWS, scores_output=None):
+    """İki geçişte TOPSIS; (ilk k tablosu, rapor). scores_output verilirse tüm skorlar .npy'ye yazılır."""
+    model = StreamingTopsis(weights, top_k)
+
+    start = time.perf_counter()
+    with span("topsis_stream:pass1") as record:
+        n_chunks = 0
+        for _, X in iter_chunks(source, criteria, chunk_rows):
+            model.accumulate(X)
+            n_chunks += 1
+        record["rows"] = model.n_candidates
+    model.finalize()
+    pass1_seconds = time.perf_counter() - start
+
+    scores_file = None
+    if scores_output:
+        directory = os.path.dirname(scores_output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        scores_file = np.lib.format.open_memmap(scores_output, mode="w+", dtype=float, shape=(model.n_candidates,))
+
+    start = time.perf_counter()
+    with span("topsis_stream:pass2", rows=model.n_candidates):
+        row_offset = 0
+        for chunk_ids, X in iter_chunks(source, criteria, chunk_rows):
+            scores = model.score(X)
+            if scores_file is not None:
+                scores_file[row_offset:row_offset + len(X)] = scores
+            model.offer(chunk_ids, scores, row_offset)
+            row_offset += len(X)
+    if scores_file is not None:
+        scores_file.flush()
+        del scores_file
+    pass2_seconds = time.perf_counter() - start
+
+    report = {
+        "n_candidates": model.n_candidates,
+        "n_chunks": n_chunks,
+        "chunk_rows": chunk_rows,
+        "top_k": top_k,
+        "pass1_seconds": pass1_seconds,
+        "pass2_seconds": pass2_seconds,
+        "ideal_solution": model.ideal_solution.tolist(),
+        "anti_ideal_solution": model.anti_ideal_solution.tolist(),
+    }
+    return model.top(), report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parçalı (.npy/.parquet) havuzlarda iki geçişli bellek dışı TOPSIS")
+    parser.add_argument("--girdi", default=chunks_dir, help="Parça klasörü veya tek .npy/.parquet dosyası")
+    parser.add_argument("--ilk-k", type=int, default=TOP_K, help="Heap'te tutulacak en iyi aday sayısı")
+    parser.add_argument("--parca", type=int, default=DEFAULT_CHUNK_ROWS, help="Parça başına satır")
+    parser.add_argument("--cikti", default=top_path, help="İlk k tablosu (.xlsx)")
+    parser.add_argument("--skorlar", default=scores_path, help="Tüm skorlar (.npy, girdi satır sırası; boş → yazılmaz)")
+    parser.add_argument("--disa-aktar", metavar="KLASOR", help="Kompakt kriter tablosunu parça dosyalarına yaz ve çık")
+    parser.add_argument("--bicim", choices=("npy", "parquet"), default="npy", help="--disa-aktar parça biçimi")
+    args = parser.parse_args()
+
+    weights_df = pd.read_excel(weights_path, sheet_name="Birlesik_Agirlik", index_col=0)
+    criteria_names = weights_df.index.tolist()
+
+    if args.disa_aktar:
+        candidates_df = load_criteria(criteria_path, criteria_excel_path)
+        paths = write_chunks(candidates_df[criteria_names], args.disa_aktar, args.parca, args.bicim)
+        print(f"{len(candidates_df)} aday {len(paths)} parçaya yazıldı: {args.disa_aktar}")
+        raise SystemExit(0)
+
+    top_df, report = streaming_topsis(
+        args.girdi, weights_df["Birlesik_Agirlik"].values, criteria_names, args.ilk_k, args.parca, args.skorlar or None
+    )
+    top_df.to_excel(args.cikti)
+
+    print(f"Aday sayısı: {report['n_candidates']}, parça: {report['n_chunks']} (≤ {report['chunk_rows']} satır)")
+    print(f"1. geçiş {report['pass1_seconds']:.2f} s, 2. geçiş {report['pass2_seconds']:.2f} s")
+    print(f"\nİlk {len(top_df)} aday (TOPSIS):")
+    print(top_df.head(10).to_string())
+    print(f"Çıktı: {args.cikti}" + (f", skorlar: {args.skorlar}" if args.skorlar else ""))
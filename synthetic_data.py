@@ -0,0 +1,155 @@
+"""
+Sentetik Aday Havuzu ve Uzman AHP Dosyası Üretici
+=================================================
+
+Ölçeklenme testleri için aday_havuzu.xlsx ile aynı kolon şemasında
+(temizlenmiş kolon adlarıyla) gerçekçi sentetik adaylar üretir:
+- 4 kuruma kadar başlangıç/çıkış tarihleri
+- Okuma/Yazma/Konuşma seviyeleri (gerçek veriye yakın dağılım)
+- Eğitim durumu
+- Serbest metin: yazılım bilgisi, sertifikalar, hobiler, dernekler
+
+Ayrıca 4_ahp_calculator.py'nin okuyabileceği formatta (Uzman_k sheet'leri)
+Saaty ölçeğine yuvarlanmış sentetik uzman karşılaştırma matrisleri üretir.
+
+Kullanım:
+    python synthetic_data.py --rows 10000 --output ./data_sources/synthetic_pool_10k.pkl
+    python synthetic_data.py --experts 200 --ahp-output ./data_sources/synthetic_ahp_expert_filled.xlsx
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from candidate_features import anon_columns
+
+# ---------------------- Dağılımlar ve Kelime Havuzları ----------------------
+
+lang_levels = ["Zayıf", "Orta", "İyi", "Çok İyi"]
+lang_level_probs = [0.10, 0.34, 0.35, 0.21]
+
+education_levels = ["Lise", "Lisans/Ön Lisans", "Yüksek Lisans", "Doktora"]
+education_probs = [0.06, 0.80, 0.125, 0.015]
+
+# Çalışılan kurum sayısı (0-4) olasılıkları
+institution_count_probs = [0.40, 0.30, 0.18, 0.08, 0.04]
+
+software_vocab = np.array([
+    "Excel", "Word", "PowerPoint", "Python", "SQL", "C#", "Java", "C++", "R", "MATLAB",
+    "AutoCAD", "SolidWorks", "SAP", "Power BI", "Tableau", "Photoshop", "Git", "JavaScript",
+    "Arduino", "Minitab", "SPSS", "Primavera", "Outlook", "Kotlin", "Docker", "Linux",
+])
+certificate_vocab = np.array([
+    "Proje Yönetimi Sertifikası", "İleri Excel Eğitimi", "İş Sağlığı ve Güvenliği Eğitimi",
+    "Scrum Master Sertifikası", "Google Analytics Sertifikası", "TOEFL", "IELTS",
+    "Yalın Altı Sigma Sarı Kuşak", "Veri Analizi Kursu", "Python ile Programlama Kursu",
+    "Girişimcilik Semineri", "Liderlik Eğitimi", "Dönem Birinciliği Ödülü", "Ulusal Staj Programı",
+])
+hobby_vocab = np.array([
+    "Kitap okumak", "Yüzme", "Satranç", "Fotoğrafçılık", "Koşu", "Gitar çalmak", "Seyahat",
+    "Sinema", "Futbol", "Basketbol", "Yoga", "Resim", "Dağcılık", "Bisiklet", "Gönüllülük",
+    "Yazılım projeleri", "Münazara", "Tiyatro", "Kamp", "Yemek yapmak",
+])
+association_vocab = np.array([
+    "TEMA Vakfı", "IEEE Öğrenci Kolu", "Türk Kızılay", "LÖSEV", "AIESEC",
+    "Makine Mühendisleri Odası", "Rotaract Kulübü", "Türkiye Eğitim Gönüllüleri Vakfı",
+    "Endüstri Mühendisliği Kulübü", "Girişimcilik Kulübü",
+])
+
+# Saaty ölçeği (1-9 ve tersleri)
+saaty_scale = np.array([1 / 9, 1 / 8, 1 / 7, 1 / 6, 1 / 5, 1 / 4, 1 / 3, 1 / 2, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+# Varsayılan AHP kriterleri
+criteria = [col for col in anon_columns if col != "ID"]
+
+
+# Her satır için rastgele sayıda öğeyi ayırıcıyla birleştir (0 öğe → NaN)
+def _random_lists(rng, n_rows, vocab, mean_count, sep, max_count=None):
+    counts = rng.poisson(mean_count, size=n_rows)
+    if max_count is not None:
+        counts = np.minimum(counts, max_count)
+    indices = rng.integers(0, len(vocab), size=counts.sum())
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    words = vocab[indices].tolist()
+    return [sep.join(words[a:b]) if b > a else np.nan for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+# ---------------------- Aday Havuzu ----------------------
+
+def generate_candidate_pool(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    data = {"ID": np.arange(1, n_rows + 1)}
+
+    # Kurum tarihleri: kurum sayısı kadar ardışık dönem (en yeni kurum 1. kurum)
+    n_institutions = rng.choice(len(institution_count_probs), size=n_rows, p=institution_count_probs)
+    end = np.datetime64("2025-06-30") - rng.integers(0, 365, size=n_rows).astype("timedelta64[D]")
+    for i in range(1, 5):
+        duration = rng.integers(30, 1500, size=n_rows).astype("timedelta64[D]")
+        start = end - duration
+        has_institution = n_institutions >= i
+        data[f"{i}. Kuruma Başlangıç Tarihi"] = pd.to_datetime(np.where(has_institution, start, np.datetime64("NaT")))
+        data[f"{i}. Kurumdan Çıkış Tarihi"] = pd.to_datetime(np.where(has_institution, end, np.datetime64("NaT")))
+        end = start - rng.integers(0, 180, size=n_rows).astype("timedelta64[D]")
+
+    data["Eğitim Durumunuz"] = rng.choice(education_levels, size=n_rows, p=education_probs)
+    for skill in ["Okuma", "Yazma", "Konuşma"]:
+        data[skill] = rng.choice(lang_levels, size=n_rows, p=lang_level_probs)
+
+    data["Yazılım Bilginiz"] = _random_lists(rng, n_rows, software_vocab, 5, ";")
+    data["Katıldığınız Kurs/Seminer/Sertifika/ Ödül ve Takdirler"] = _random_lists(rng, n_rows, certificate_vocab, 1.5, "\n")
+    data["Hobileriniz"] = _random_lists(rng, n_rows, hobby_vocab, 2, ", ")
+    data["Üye olduğunuz dernek ve kuruluşlar"] = _random_lists(rng, n_rows, association_vocab, 0.6, ", ", max_count=4)
+
+    return pd.DataFrame(data)
+
+
+# ---------------------- Uzman AHP Matrisleri ----------------------
+
+# Gizli ağırlık vektöründen gürültülü, Saaty ölçeğine yuvarlanmış matris
+def generate_expert_matrix(rng, n_criteria, noise=0.35):
+    hidden_weights = rng.dirichlet(np.ones(n_criteria))
+    matrix = np.ones((n_criteria, n_criteria))
+    for i in range(n_criteria):
+        for j in range(i + 1, n_criteria):
+            ratio = hidden_weights[i] / hidden_weights[j] * np.exp(rng.normal(0, noise))
+            value = saaty_scale[np.argmin(np.abs(np.log(saaty_scale) - np.log(ratio)))]
+            matrix[i, j] = value
+            matrix[j, i] = 1 / value
+    return matrix
+
+
+def generate_expert_workbook(output_path, n_experts=6, criteria=criteria, seed=42, noise=0.35):
+    rng = np.random.default_rng(seed)
+    with pd.ExcelWriter(output_path) as writer:
+        for expert_id in range(1, n_experts + 1):
+            matrix = generate_expert_matrix(rng, len(criteria), noise)
+            pd.DataFrame(matrix, index=criteria, columns=criteria).to_excel(writer, sheet_name=f"Uzman_{expert_id}")
+    return output_path
+
+
+# Dosya uzantısına göre kaydet (.xlsx / .csv / .pkl)
+def save_frame(df, output_path):
+    if output_path.endswith(".xlsx"):
+        df.to_excel(output_path, index=False)
+    elif output_path.endswith(".csv"):
+        df.to_csv(output_path, index=False)
+    else:
+        df.to_pickle(output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik aday havuzu / uzman AHP dosyası üretici")
+    parser.add_argument("--rows", type=int, default=0, help="Üretilecek aday sayısı")
+    parser.add_argument("--output", default="./data_sources/synthetic_pool.pkl", help="Aday dosyası (.xlsx/.csv/.pkl)")
+    parser.add_argument("--experts", type=int, default=0, help="Üretilecek uzman sayısı")
+    parser.add_argument("--ahp-output", default="./data_sources/synthetic_ahp_expert_filled.xlsx")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.rows:
+        save_frame(generate_candidate_pool(args.rows, args.seed), args.output)
+        print(f"{args.rows} sentetik aday kaydedildi: {args.output}")
+    if args.experts:
+        generate_expert_workbook(args.ahp_output, args.experts, seed=args.seed)
+        print(f"{args.experts} sentetik uzman matrisi kaydedildi: {args.ahp_output}")
@@ -0,0 +1,6 @@
+"""Testler kök dizindeki betik modüllerini (mcdm_methods, incremental_electre, ...) doğrudan içe aktarır."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
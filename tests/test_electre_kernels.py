@@ -0,0 +1,86 @@
+"""Numba ELECTRE çekirdeği NumPy yoluyla (mcdm_methods) birebir aynı sonuç vermeli."""
+
+import numpy as np
+import pytest
+
+import electre_kernels
+import mcdm_methods
+
+# (aday sayısı, kriter sayısı, seviye sayısı): az seviye → çok sayıda eşitlik ve aynı profil
+CASES = [(40, 3, 3), (120, 6, 4), (200, 8, 5), (60, 10, 2)]
+THRESHOLDS = [(mcdm_methods.C_THRESHOLD, mcdm_methods.D_THRESHOLD), (0.5, 0.6), (0.8, 0.2)]
+
+
+def _random_case(seed, n_candidates, n_criteria, n_levels):
+    rng = np.random.default_rng(seed)
+    criteria_matrix = rng.integers(0, n_levels, size=(n_candidates, n_criteria)).astype(float) * 25
+    weights = rng.dirichlet(np.ones(n_criteria))
+    return criteria_matrix, weights
+
+
+def _python_kernel(kernel):
+    # Numba kuruluysa derlenmiş sürümün Python kaynağı, değilse fonksiyonun kendisi
+    return getattr(kernel, "py_func", kernel)
+
+
+@pytest.mark.parametrize("seed,case", list(enumerate(CASES)))
+@pytest.mark.parametrize("C_threshold,D_threshold", THRESHOLDS)
+def test_numba_backend_matches_numpy(seed, case, C_threshold, D_threshold):
+    pytest.importorskip("numba")
+    assert electre_kernels.resolve_backend("numba") == "numba"
+    criteria_matrix, weights = _random_case(seed, *case)
+
+    for numpy_result, numba_result in zip(
+        electre_kernels.dominance_counts(criteria_matrix, weights, C_threshold, D_threshold, "numpy"),
+        electre_kernels.dominance_counts(criteria_matrix, weights, C_threshold, D_threshold, "numba"),
+    ):
+        np.testing.assert_array_equal(numba_result, numpy_result)
+
+    pool, candidates = criteria_matrix[:-10], criteria_matrix[-10:]
+    for numpy_result, numba_result in zip(
+        electre_kernels.outranking_counts(pool, candidates, weights, C_threshold, D_threshold, "numpy"),
+        electre_kernels.outranking_counts(pool, candidates, weights, C_threshold, D_threshold, "numba"),
+    ):
+        np.testing.assert_array_equal(numba_result, numpy_result)
+
+    C_numpy, D_numpy = electre_kernels.pairwise_matrices(criteria_matrix, weights, "numpy")
+    C_numba, D_numba = electre_kernels.pairwise_matrices(criteria_matrix, weights, "numba")
+    np.testing.assert_array_equal(C_numba, C_numpy)
+    np.testing.assert_array_equal(D_numba, D_numpy)
+
+
+@pytest.mark.parametrize("seed,case", list(enumerate(CASES)))
+@pytest.mark.parametrize("C_threshold,D_threshold", THRESHOLDS)
+def test_loop_kernels_match_numpy(seed, case, C_threshold, D_threshold):
+    """Döngü çekirdeklerinin mantığı (derlemeden, Numba olmadan da) NumPy yoluyla aynı."""
+    criteria_matrix, weights = _random_case(seed, *case)
+    weight_table = mcdm_methods.concordance_weight_table(weights)
+
+    C_loop, D_loop = _python_kernel(electre_kernels._pair_matrices_kernel)(criteria_matrix, weight_table)
+    C_numpy, D_numpy = electre_kernels.pairwise_matrices(criteria_matrix, weights, "numpy")
+    np.testing.assert_array_equal(C_loop, C_numpy)
+    np.testing.assert_array_equal(D_loop, D_numpy)
+
+    # Bağımsız referans: tam matris yolu (concordance toplama sırası farklı → yuvarlama payı)
+    C_full, D_full, outranking_full = mcdm_methods.electre_matrices(criteria_matrix, weights, C_threshold, D_threshold)
+    np.testing.assert_allclose(C_loop, C_full, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(D_loop, D_full)
+
+    profiles, inverse, counts = np.unique(criteria_matrix, axis=0, return_inverse=True, return_counts=True)
+    dominance, dominated_by = _python_kernel(electre_kernels._profile_counts_kernel)(
+        profiles, counts.astype(np.int64), weight_table, C_threshold, D_threshold
+    )
+    expected = electre_kernels.dominance_counts(criteria_matrix, weights, C_threshold, D_threshold, "numpy")
+    np.testing.assert_array_equal(dominance[inverse.reshape(-1)], expected[0])
+    np.testing.assert_array_equal(dominated_by[inverse.reshape(-1)], expected[1])
+
+    outranking = mcdm_methods.outranking_from_matrices(C_numpy, D_numpy, C_threshold, D_threshold)
+    np.testing.assert_array_equal(expected[0], outranking.sum(axis=1))
+    np.testing.assert_array_equal(dominance[inverse.reshape(-1)], outranking_full.sum(axis=1))
+    np.testing.assert_array_equal(dominated_by[inverse.reshape(-1)], outranking_full.sum(axis=0))
+
+    pool, candidates = criteria_matrix[:-5], criteria_matrix[-5:]
+    loop_counts = _python_kernel(electre_kernels._against_pool_kernel)(pool, candidates, weight_table, C_threshold, D_threshold)
+    numpy_counts = electre_kernels.outranking_counts(pool, candidates, weights, C_threshold, D_threshold, "numpy")
+    for loop_result, numpy_result in zip(loop_counts, numpy_counts):
+        np.testing.assert_array_equal(loop_result, numpy_result)
@@ -0,0 +1,93 @@
+"""Artımlı ELECTRE durumu: ekleme, çıkarma ve ağırlık değişimi tam hesapla (electre_matrices) aynı olmalı."""
+
+import numpy as np
+import pytest
+
+import mcdm_methods
+from incremental_electre import IncrementalElectreState
+
+N_CRITERIA = 6
+
+
+def _criteria(rng, n_rows):
+    # Az sayıda seviye → çok sayıda eşit kriter değeri ve aynı profil
+    return rng.integers(0, 4, size=(n_rows, N_CRITERIA)).astype(float) * 33
+
+
+def _weights(rng):
+    weights = rng.random(N_CRITERIA)
+    return weights / weights.sum()
+
+
+def _full_counts(criteria_matrix, weights, C_threshold=mcdm_methods.C_THRESHOLD, D_threshold=mcdm_methods.D_THRESHOLD):
+    _, _, outranking = mcdm_methods.electre_matrices(criteria_matrix, weights, C_threshold, D_threshold)
+    return outranking.sum(axis=1), outranking.sum(axis=0)
+
+
+def _assert_matches_full(state):
+    dominance, dominated_by = _full_counts(state.criteria_matrix, state.weights, state.C_threshold, state.D_threshold)
+    np.testing.assert_array_equal(state.dominance, dominance)
+    np.testing.assert_array_equal(state.dominated_by, dominated_by)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+def test_add_matches_full_recompute(rng):
+    criteria_matrix, weights = _criteria(rng, 90), _weights(rng)
+    ids = np.arange(90) * 3 + 1
+    state = IncrementalElectreState.from_criteria(ids[:60], criteria_matrix[:60], weights)
+    state.add(ids[60:75], criteria_matrix[60:75])
+    state.add(ids[75:], criteria_matrix[75:])
+
+    np.testing.assert_array_equal(state.ids, ids)
+    _assert_matches_full(state)
+    expected = mcdm_methods.electre_ranking(_full_counts(criteria_matrix, weights)[0], ids)
+    assert state.ranking().equals(expected)
+
+
+def test_remove_matches_full_recompute(rng):
+    criteria_matrix, weights = _criteria(rng, 80), _weights(rng)
+    ids = np.arange(80) + 100
+    state = IncrementalElectreState.from_criteria(ids, criteria_matrix, weights)
+    removed = [100, 117, 150, 179]
+    state.remove(removed)
+
+    keep = ~np.isin(ids, removed)
+    np.testing.assert_array_equal(state.ids, ids[keep])
+    np.testing.assert_array_equal(state.criteria_matrix, criteria_matrix[keep])
+    _assert_matches_full(state)
+
+
+def test_add_then_remove_matches_full_recompute(rng):
+    criteria_matrix, weights = _criteria(rng, 70), _weights(rng)
+    ids = np.arange(70)
+    state = IncrementalElectreState.from_criteria(ids[:50], criteria_matrix[:50], weights)
+    state.add(ids[50:], criteria_matrix[50:])
+    state.remove([3, 55, 69])
+    _assert_matches_full(state)
+
+
+def test_weight_and_threshold_change_rebuilds(rng):
+    criteria_matrix = _criteria(rng, 60)
+    state = IncrementalElectreState.from_criteria(np.arange(60), criteria_matrix, _weights(rng))
+    state.rebuild(_weights(rng))
+    _assert_matches_full(state)
+    state.rebuild(C_threshold=0.55, D_threshold=0.5)
+    _assert_matches_full(state)
+    state.add([1000, 1001], _criteria(rng, 2))
+    _assert_matches_full(state)
+
+
+def test_save_load_roundtrip(rng, tmp_path):
+    criteria_matrix, weights = _criteria(rng, 40), _weights(rng)
+    state = IncrementalElectreState.from_criteria(np.arange(40), criteria_matrix, weights,
+                                                  criteria_names=[f"k{i}" for i in range(N_CRITERIA)])
+    path = state.save(str(tmp_path / "electre_state.npz"))
+    loaded = IncrementalElectreState.load(path)
+    loaded.add([40], _criteria(rng, 1))
+    assert loaded.version == state.version + 1
+    assert loaded.criteria_names == state.criteria_names
+    _assert_matches_full(loaded)
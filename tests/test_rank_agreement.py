@@ -0,0 +1,83 @@
+"""Sıralama uyumu metrikleri: tau-b ve rho scipy ile, RBO ve ilk-k tanımlarıyla aynı olmalı."""
+
+import numpy as np
+import pytest
+
+import rank_agreement
+
+stats = pytest.importorskip("scipy.stats")
+
+# (aday sayısı, farklı değer sayısı): az değer → çok sayıda eşitlik
+CASES = [(2, 2), (7, 3), (50, 5), (300, 20), (1000, 1000), (513, 4)]
+
+
+def _ranks(rng, n, n_values):
+    return rng.integers(1, n_values + 1, size=n).astype(float)
+
+
+def _brute_inversions(values):
+    values = np.asarray(values)
+    return int(sum(np.sum(values[i] > values[i + 1:]) for i in range(len(values))))
+
+
+def _brute_rbo(order_a, order_b, p):
+    depth = len(order_a)
+    agreement = np.array([len(set(order_a[:d]) & set(order_b[:d])) / d for d in range(1, depth + 1)])
+    depths = np.arange(1, depth + 1)
+    return agreement[-1] * p ** depth + (1 - p) / p * np.sum(agreement * p ** depths)
+
+
+@pytest.mark.parametrize("seed,case", list(enumerate(CASES)))
+@pytest.mark.filterwarnings("ignore:An input array is constant")  # sabit girdi: iki taraf da NaN
+def test_tau_b_and_rho_match_scipy(seed, case):
+    rng = np.random.default_rng(seed)
+    x, y = _ranks(rng, *case), _ranks(rng, *case)
+    # Kısmen uyumlu sıralama: x'in gürültülü kopyası
+    z = np.round(x + rng.normal(0, 1, size=len(x)))
+    for a, b in [(x, y), (x, z), (x, x), (x, -x)]:
+        expected_tau = stats.kendalltau(a, b).statistic
+        expected_rho = stats.spearmanr(a, b).statistic
+        np.testing.assert_allclose(rank_agreement.kendall_tau_b(a, b), expected_tau, atol=1e-12)
+        np.testing.assert_allclose(rank_agreement.spearman_rho(a, b), expected_rho, atol=1e-12)
+
+
+@pytest.mark.parametrize("seed,case", list(enumerate(CASES)))
+def test_count_inversions_matches_brute_force(seed, case):
+    values = _ranks(np.random.default_rng(seed), *case)
+    assert rank_agreement.count_inversions(values) == _brute_inversions(values)
+
+
+def test_constant_ranking_is_nan():
+    assert np.isnan(rank_agreement.kendall_tau_b([1, 1, 1], [1, 2, 3]))
+    assert np.isnan(rank_agreement.spearman_rho([1, 1, 1], [1, 2, 3]))
+
+
+@pytest.mark.parametrize("n", [1, 10, 41])
+def test_identical_and_reversed_lists(n):
+    ranks = np.arange(1, n + 1, dtype=float)
+    reversed_ranks = ranks[::-1].copy()
+    k = min(5, n)
+
+    assert rank_agreement.top_k_overlap(ranks, ranks, k) == (1.0, 1.0)
+    assert rank_agreement.rank_biased_overlap(ranks, ranks) == pytest.approx(1.0)
+
+    overlap, jaccard = rank_agreement.top_k_overlap(ranks, reversed_ranks, k)
+    expected_common = max(0, 2 * k - n)
+    assert overlap == pytest.approx(expected_common / k)
+    assert jaccard == pytest.approx(expected_common / (2 * k - expected_common))
+
+    order = list(range(n))
+    expected_rbo = _brute_rbo(order, order[::-1], rank_agreement.RBO_P)
+    assert rank_agreement.rank_biased_overlap(ranks, reversed_ranks) == pytest.approx(expected_rbo)
+    if n >= 2 * k:
+        assert (overlap, jaccard) == (0.0, 0.0)
+
+
+def test_rbo_matches_definition_with_ties():
+    rng = np.random.default_rng(7)
+    ranks_a, ranks_b = _ranks(rng, 60, 8), _ranks(rng, 60, 8)
+    ids = np.arange(60) * 2 + 3
+    order_a = list(rank_agreement.ranking_order(ranks_a, ids))
+    order_b = list(rank_agreement.ranking_order(ranks_b, ids))
+    expected = _brute_rbo(order_a, order_b, 0.8)
+    assert rank_agreement.rank_biased_overlap(ranks_a, ranks_b, p=0.8, ids=ids) == pytest.approx(expected)
@@ -0,0 +1,59 @@
+"""Parçalı bellek dışı TOPSIS: tam hesapla (topsis_scores) aynı olmalı; eski/yabancı dosyalar okunmamalı."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mcdm_methods
+import streaming_topsis
+
+N_CRITERIA = 5
+
+
+def _pool(rng, n_rows):
+    X = rng.integers(0, 5, size=(n_rows, N_CRITERIA)).astype(float) * 25
+    index = pd.Index(np.arange(n_rows) * 3 + 1, name="ID")
+    return pd.DataFrame(X, columns=[f"k{i}" for i in range(N_CRITERIA)], index=index)
+
+
+def _run(directory, df, weights, **kwargs):
+    return streaming_topsis.streaming_topsis(str(directory), weights, list(df.columns), top_k=10, chunk_rows=70, **kwargs)
+
+
+@pytest.mark.parametrize("fmt", ["npy", "parquet"])
+def test_matches_full_topsis(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(0)
+    df = _pool(rng, 500)
+    weights = rng.dirichlet(np.ones(N_CRITERIA))
+    streaming_topsis.write_chunks(df, tmp_path, 120, fmt)
+    top_df, report = _run(tmp_path, df, weights, scores_output=str(tmp_path / "skorlar.npy"))
+
+    expected = pd.Series(mcdm_methods.topsis_scores(df.to_numpy(), weights), index=df.index)
+    assert report["n_candidates"] == len(df)
+    np.testing.assert_allclose(np.load(tmp_path / "skorlar.npy"), expected.to_numpy(), atol=1e-12)
+    assert list(top_df.index) == list(expected.sort_values(ascending=False, kind="stable").index[:10])
+
+
+def test_reexport_replaces_old_parts(tmp_path):
+    rng = np.random.default_rng(1)
+    weights = rng.dirichlet(np.ones(N_CRITERIA))
+    streaming_topsis.write_chunks(_pool(rng, 1000), tmp_path, 100)
+    df = _pool(rng, 400)
+    streaming_topsis.write_chunks(df, tmp_path, 100)
+    # --skorlar çıktısı gibi yabancı bir .npy parça sayılmamalı
+    np.save(tmp_path / "skorlar.npy", np.zeros(1000))
+
+    _, report = _run(tmp_path, df, weights)
+    assert report["n_candidates"] == 400
+
+
+def test_mixed_formats_rejected(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = _pool(np.random.default_rng(2), 100)
+    streaming_topsis.write_chunks(df, tmp_path, 50, "parquet")
+    np.save(tmp_path / "part-00009.npy", df.to_numpy())
+
+    with pytest.raises(ValueError, match="hem .npy hem .parquet"):
+        streaming_topsis.chunk_files(str(tmp_path))
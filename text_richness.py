@@ -0,0 +1,224 @@
+"""
+Metin Zenginliği (Text Richness) Backend'leri
+=============================================
+
+Sosyal Aktivite Skoru, hobi + dernek metninin yalnızca bir "zenginlik"
+değerini kullanır (MiniLM embedding vektörünün L2 normu). Bu modül bu değeri
+üreten değiştirilebilir backend'ler tanımlar:
+- "transformer": SentenceTransformer embedding normu (varsayılan, mevcut davranış)
+- "ngram": karakter 3-gram (kelime sınırlı) sayımlarının alt-doğrusal
+  (log(1 + tf)) vektör normu; torch / model indirme gerektirmez, CPU'da hızlı.
+  Yalnızca norm kullanıldığından n-gram'lar hash'lenmeden tam sayılır (çakışma yok)
+
+Seçim (çalıştırma başına):
+- CLI:  python 1_tamTemiz_pipeline.py --zenginlik ngram
+- Ortam değişkeni: TEXT_RICHNESS_BACKEND=ngram
+
+"ngram" değerleri kalibrasyon dosyasındaki ölçek katsayısıyla transformer
+normlarının ölçeğine çekilir. Kalibrasyon raporu örnek havuzda iki backend'in
+sıra korelasyonunu (Spearman) ve metin başına süreleri verir:
+    python text_richness.py --kalibrasyon --orneklem 300
+
+Not: Aşama 1 (sosyal skor 0-100 sınırları) ve skorlama servisi aynı backend
+ile çalıştırılmalıdır; aksi halde ham skor ölçekleri farklı olur. Kalibrasyon
+dosyası yoksa ngram backend'i ölçek 1.0 ile çalışır ve uyarı verir (ham skorlar
+transformer ölçeğinde değildir; 0-100 ölçeklemesi yine havuz içinde tutarlıdır).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import warnings
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+# Ortam değişkeni ve dosya yolları
+BACKEND_ENV = "TEXT_RICHNESS_BACKEND"
+calibration_path = "./outputs/text_richness_calibration.json"
+
+BACKENDS = ("transformer", "ngram")
+NGRAM_SIZE = 3
+DEFAULT_NGRAM_SCALE = 1.0  # kalibrasyon dosyası yoksa (ölçülmemiş; transformer ölçeğinde değil)
+
+_config = {"backend": os.environ.get(BACKEND_ENV) or "transformer"}
+_instances = {}
+
+
+class TransformerBackend:
+    """SentenceTransformer embedding'inin L2 normu."""
+
+    name = "transformer"
+
+    def warm_up(self):
+        from candidate_features import get_embedding_model
+        get_embedding_model()
+
+    def richness(self, text):
+        from candidate_features import get_embedding_model
+        return float(np.linalg.norm(get_embedding_model().encode(text)))
+
+
+class NgramBackend:
+    """Karakter n-gram sayımlarının log(1 + tf) vektör normu (× kalibrasyon ölçeği)."""
+
+    name = "ngram"
+
+    def __init__(self, n=NGRAM_SIZE, scale=None, calibration_path=calibration_path):
+        self.n = n
+        self.calibration_path = calibration_path
+        self.calibrated = scale is not None
+        if scale is None:
+            scale = DEFAULT_NGRAM_SCALE
+            if os.path.exists(calibration_path):
+                with open(calibration_path, encoding="utf-8") as f:
+                    calibration = json.load(f)
+                self.calibrated = "scale" in calibration
+                scale = calibration.get("scale", DEFAULT_NGRAM_SCALE)
+        self.scale = float(scale)
+
+    def warm_up(self):
+        pass
+
+    def ngram_counts(self, text):
+        counts = Counter()
+        for word in re.findall(r"\w+", str(text).lower()):
+            padded = f" {word} "  # kelime sınırı (char_wb)
+            counts.update(padded[i:i + self.n] for i in range(max(len(padded) - self.n + 1, 1)))
+        return counts
+
+    def raw_norm(self, text):
+        counts = np.fromiter(self.ngram_counts(text).values(), dtype=float)
+        return float(np.sqrt(np.sum(np.log1p(counts) ** 2)))
+
+    def richness(self, text):
+        return self.scale * self.raw_norm(text)
+
+
+def create_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen metin zenginliği backend'i: {name} (seçenekler: {', '.join(BACKENDS)})")
+    return TransformerBackend() if name == "transformer" else NgramBackend()
+
+
+def set_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen metin zenginliği backend'i: {name} (seçenekler: {', '.join(BACKENDS)})")
+    _config["backend"] = name
+
+
+def backend_name():
+    return _config["backend"]
+
+
+def get_backend():
+    """Seçili backend (çalıştırma boyunca tek örnek)."""
+    name = _config["backend"]
+    if name not in _instances:
+        backend = _instances[name] = create_backend(name)
+        # Örnek başına bir kez; uyarı get_backend'i çağıran satırı gösterir
+        if name == "ngram" and not backend.calibrated:
+            warnings.warn(
+                f"ngram metin zenginliği kalibre edilmemiş ({backend.calibration_path} yok): ölçek {backend.scale} "
+                f"kullanılıyor, Sosyal Aktivite Skoru transformer skorlarıyla aynı ölçekte değil. "
+                f"Kalibrasyon: python text_richness.py --kalibrasyon (sentence-transformers gerekir).",
+                stacklevel=2,
+            )
+    return _instances[name]
+
+
+def add_arguments(parser):
+    parser.add_argument("--zenginlik", choices=BACKENDS, default=None,
+                        help=f"Metin zenginliği backend'i (veya {BACKEND_ENV})")
+    return parser
+
+
+def configure_from_args(args):
+    if args.zenginlik:
+        set_backend(args.zenginlik)
+
+
+def init_from_cli(argv=None):
+    """argparse kullanmayan betikler için: sys.argv'den yalnızca --zenginlik'i oku."""
+    parser = add_arguments(argparse.ArgumentParser(add_help=False))
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    configure_from_args(args)
+
+
+# ---------------------- Kalibrasyon ----------------------
+
+def social_text(row):
+    """Sosyal aktivite skorunun zenginlik için kullandığı metin (hobiler + dernekler)."""
+    hobiler = str(row.get("Hobileriniz", "")).strip()
+    dernekler = str(row.get("Üye olduğunuz dernek ve kuruluşlar", "")).strip()
+    return hobiler + " " + dernekler
+
+
+def calibrate(df, output_path=calibration_path):
+    """Örnek havuzda transformer ve ngram zenginliklerini karşılaştır, ölçeği kaydet."""
+    from scipy.stats import spearmanr
+
+    texts = [social_text(row) for _, row in df.iterrows()]
+    transformer, ngram = TransformerBackend(), NgramBackend(scale=1.0)
+    transformer.warm_up()
+
+    report = {"n_texts": len(texts), "created_at": datetime.now().isoformat(timespec="seconds")}
+    values = {}
+    for backend in (transformer, ngram):
+        start = time.perf_counter()
+        values[backend.name] = np.array([backend.richness(text) for text in texts])
+        report[f"{backend.name}_ms_per_text"] = (time.perf_counter() - start) / max(len(texts), 1) * 1000
+
+    ngram_median = np.median(values["ngram"])
+    report["scale"] = float(np.median(values["transformer"]) / ngram_median) if ngram_median > 0 else DEFAULT_NGRAM_SCALE
+    report["spearman"] = float(spearmanr(values["transformer"], values["ngram"]).statistic)
+
+    # Zenginliğin son skora etkisi: iki backend ile hesaplanan sosyal skorların sıra korelasyonu
+    from candidate_features import calculate_social_activity_score_advanced
+    scores = {
+        backend.name: df.apply(calculate_social_activity_score_advanced, axis=1, backend=backend).to_numpy(dtype=float)
+        for backend in (transformer, NgramBackend(scale=report["scale"]))
+    }
+    report["social_score_spearman"] = float(spearmanr(scores["transformer"], scores["ngram"]).statistic)
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    from candidate_features import clean_columns
+
+    parser = argparse.ArgumentParser(description="Metin zenginliği backend kalibrasyonu")
+    parser.add_argument("--kalibrasyon", action="store_true", help="Transformer ile ngram'ı karşılaştır")
+    parser.add_argument("--girdi", default="./data_sources/aday_havuzu.xlsx", help="Örnek aday havuzu (.xlsx)")
+    parser.add_argument("--orneklem", type=int, default=300, help="Kalibrasyon örneklem boyutu")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cikti", default=calibration_path)
+    args = parser.parse_args()
+
+    if not args.kalibrasyon:
+        parser.error("--kalibrasyon belirtilmeli")
+
+    pool = clean_columns(pd.read_excel(args.girdi))
+    sample = pool.sample(n=min(args.orneklem, len(pool)), random_state=args.seed)
+    try:
+        report = calibrate(sample, args.cikti)
+    except ImportError:
+        raise SystemExit("Kalibrasyon transformer backend'i gerektirir: pip install sentence-transformers")
+
+    print(f"Örnek: {report['n_texts']} metin")
+    print(f"Zenginlik sıra korelasyonu (Spearman): {report['spearman']:.3f}")
+    print(f"Sosyal Aktivite Skoru sıra korelasyonu: {report['social_score_spearman']:.3f}")
+    print(f"Metin başına süre: transformer {report['transformer_ms_per_text']:.2f} ms, "
+          f"ngram {report['ngram_ms_per_text']:.3f} ms")
+    print(f"ngram ölçek katsayısı: {report['scale']:.4f} → {args.cikti}")
@@ -3,29 +3,120 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import graphviz # Akış şeması için
+import numpy as np
+import os
+import sys
+import time
+
+# Kök dizindeki ortak hesaplama modülleri (mcdm_methods vb.)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+import mcdm_methods
+import rank_agreement
+from outranking_store import OutrankingMatrix
+from results_db import ResultsStore
+
+from artifact_store import ArtifactWatcher, build_artifact_store, file_fingerprint
 
 # Sayfa Yapılandırması (Geniş mod ve başlık)
 st.set_page_config(layout="wide", page_title="Aday Değerlendirme Sistemi")
 
 # Veri Yükleme Fonksiyonları (Önbellekleme ile)
-@st.cache_data
-def load_data(file_path, sheet_name=None, use_excel=True):
-    """CSV veya Excel dosyasından veri yükler."""
-    try:
-        if use_excel:
-            return pd.read_excel(file_path, sheet_name=sheet_name)
-        else:
-            return pd.read_csv(file_path)
-    except FileNotFoundError:
+@st.cache_resource(show_spinner="Veri dosyaları yükleniyor...")
+def get_artifact_store(data_path):
+    """Tüm Excel çıktılarını uygulama açılışında bir kez ve paralel olarak yükler.
+
+    Arka plandaki izleyici, değişen dosyaları (boyut/mtime) otomatik yeniden yükler.
+    """
+    store = build_artifact_store(data_path, cache_dir=os.path.join(data_path, ".artifact_cache"))
+    ArtifactWatcher(store, interval=WATCH_INTERVAL_SECONDS).start()
+    return store
+
+def load_data(file_path, sheet_name=None):
+    """Artefakt deposundaki tiplenmiş DataFrame'i döndürür (diske gitmez)."""
+    file_name = os.path.basename(file_path)
+    store = get_artifact_store(DATA_PATH)
+    error = store.errors.get(file_name)
+    if isinstance(error, FileNotFoundError):
         st.error(f"Hata: '{file_path}' dosyası bulunamadı. Lütfen 'data' klasöründe olduğundan emin olun.")
         return None
-    except Exception as e:
-        st.error(f"Hata: '{file_path}' dosyası yüklenirken bir sorun oluştu: {e}")
+    if error is not None:
+        st.error(f"Hata: '{file_path}' dosyası yüklenirken bir sorun oluştu: {error}")
+        return None
+    df = store.get(file_name, sheet_name)
+    if df is None:
+        st.error(f"Hata: '{file_path}' dosyasında '{sheet_name}' sheet'i bulunamadı.")
+    return df
+
+# ID indeksli outranking matrisi (.npz yoksa Excel sheet'inden kurulur)
+@st.cache_resource(max_entries=2)
+def outranking_from_sheet(outranking_fingerprint, _df_outranking):
+    df = _df_outranking.set_index('ID')
+    return OutrankingMatrix.from_dense(df.index.values, df.reindex(columns=df.index).fillna(0).values)
+
+# SQLite sonuç deposu (varsa birleşik rapor ve outranking matrisi seçili çalıştırmadan, ID ile okunur)
+@st.cache_resource(max_entries=2)
+def open_results_store(db_path, db_fingerprint):
+    return ResultsStore(db_path)
+
+def get_results_store(db_path):
+    # Varlık kontrolü önbellek dışında: sonradan kopyalanan/değişen depo yeniden başlatmadan görülür
+    db_fingerprint = file_fingerprint(db_path)
+    if db_fingerprint is None:
         return None
+    return open_results_store(db_path, db_fingerprint)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_run_scores(db_path, run_id):
+    return get_results_store(db_path).run_table(run_id).reset_index()
+
+@st.cache_resource(max_entries=2)
+def load_run_outranking(db_path, run_id):
+    return get_results_store(db_path).outranking_matrix(run_id)
+
+def load_combined_report():
+    """Birleşik rapor: sonuç deposunda seçili çalıştırma varsa oradan, yoksa Excel'den."""
+    if selected_run_id is not None:
+        return load_run_scores(file_results_db, selected_run_id)
+    return load_data(file_combined_report, sheet_name='Sheet1')
+
+def get_outranking_matrix():
+    if selected_run_id is not None:
+        return load_run_outranking(file_results_db, selected_run_id)
+    matrix = artifact_store.get(os.path.basename(file_electre_outranking_npz))
+    if matrix is not None:
+        return matrix
+    df_outranking = load_data(file_electre_outranking, sheet_name='Sheet1')
+    if df_outranking is None:
+        return None
+    return outranking_from_sheet(artifact_store.fingerprints.get(os.path.basename(file_electre_outranking)), df_outranking)
+
+def outranking_version():
+    """get_outranking_matrix'in kaynağını tanımlayan anahtar (çalıştırma kimliği veya dosya parmak izi)."""
+    if selected_run_id is not None:
+        return ("run", selected_run_id)
+    npz_name = os.path.basename(file_electre_outranking_npz)
+    if artifact_store.get(npz_name) is not None:
+        return ("npz", artifact_store.fingerprints.get(npz_name))
+    return ("xlsx", artifact_store.fingerprints.get(os.path.basename(file_electre_outranking)))
+
+# Büyük heatmap'lerde grup yoğunluğu; widget değişimlerinde yeniden hesaplanmaz
+@st.cache_data(max_entries=8, show_spinner=False)
+def outranking_block_density(version, ids, n_blocks, _outranking_matrix):
+    return _outranking_matrix.block_density(list(ids), n_blocks)
+
+# Canlı yeniden sıralama için ELECTRE ikili karşılaştırma durumu
+@st.cache_resource(max_entries=2, show_spinner="İkili karşılaştırma durumu hazırlanıyor...")
+def get_pairwise_state(candidates_fingerprint, _criteria_matrix):
+    """Aday seti (dosya parmak izi) değişmedikçe aynı durum yeniden kullanılır.
+
+    Aynı kriter vektörlü adaylar tek profil olarak tutulur (u² karşılaştırma).
+    """
+    return mcdm_methods.ProfileElectreState(_criteria_matrix)
 
 # --- VERİ DOSYALARININ YOLLARI ---
 # Kullanıcının yüklediği dosya adlarına göre güncellendi
 DATA_PATH = "data/"
+WATCH_INTERVAL_SECONDS = 5 # Değişen çıktı dosyalarının kontrol sıklığı
 file_ahp_birlesik_agirlik = DATA_PATH + "ahp_weights_summary.xlsx"
 file_ahp_uzman_agirliklari = DATA_PATH + "ahp_weights_summary.xlsx"
 file_ahp_tutarlilik = DATA_PATH + "ahp_weights_summary.xlsx"
@@ -33,7 +124,14 @@ file_topsis_ranking = DATA_PATH + "TOPSIS_Ranking.xlsx"
 file_electre_results = DATA_PATH + "ELECTRE_Results.xlsx"
 file_combined_report = DATA_PATH + "combined_ranking_report.xlsx"
 file_electre_outranking = DATA_PATH + "ELECTRE_Outranking.xlsx"
-# file_processed_candidates = DATA_PATH + "processed_candidates_anonymized_scaled.xlsx - Sheet1.csv" # Gerekirse kullanılabilir
+file_electre_outranking_npz = DATA_PATH + "ELECTRE_Outranking.npz"
+HEATMAP_EXACT_MAX = 60 # Bu sayıya kadar aday tek tek gösterilir
+HEATMAP_MAX_BLOCKS = 60 # Daha fazlasında adaylar en fazla bu kadar gruba toplanır
+file_processed_candidates = DATA_PATH + "processed_candidates_anonymized_scaled.xlsx"
+file_results_db = DATA_PATH + "results.sqlite" # multi_criteria_ranking_pipeline.py --sonuc-db
+
+# Tüm artefaktları açılışta yükle → sayfa geçişlerinde diske gidilmez
+artifact_store = get_artifact_store(DATA_PATH)
 
 # --- STREAMLIT ARAYÜZÜ ---
 
@@ -50,10 +148,27 @@ section = st.sidebar.radio(
         "Karşılaştırmalı Analiz ve Raporlama",
         "Excel Çıktı Dosyaları ve Yapıları",
         "Genel Metodoloji Özeti",
-        "Sonuç ve Değerlendirme"
+        "Sonuç ve Değerlendirme",
+        "Canlı Yeniden Sıralama (What-if)",
+        "Aday Geçmişi (Sonuç Deposu)"
     ]
 )
 
+# Veri sürümü göstergesi (dosya parmak izlerinden türetilir)
+st.sidebar.markdown("---")
+st.sidebar.caption(f"Veri sürümü: `{artifact_store.version}` · Son yükleme: {artifact_store.loaded_at:%d.%m.%Y %H:%M:%S}")
+
+# Sonuç deposundaki çalıştırma seçimi (depo yoksa Excel çıktıları kullanılır)
+results_store = get_results_store(file_results_db)
+selected_run_id = None
+if results_store is not None:
+    df_runs = results_store.runs()
+    if len(df_runs):
+        run_labels = dict(zip(df_runs['run_id'], df_runs['created_at']))
+        selected_run_id = st.sidebar.selectbox("Çalıştırma (sonuç deposu):", df_runs['run_id'].tolist(),
+                                               format_func=lambda run_id: f"{run_id} ({run_labels[run_id]})",
+                                               key="selected_run_id")
+
 # Ana Başlık
 st.title("Aday Değerlendirme Karar Destek Sistemi")
 st.subheader("AHP, TOPSIS ve ELECTRE Tabanlı Kapsamlı Analiz ve Raporlama")
@@ -190,7 +305,7 @@ elif section == "Kullanılan Python Kodları ve İşlevleri":
         - `Eğitim Düzeyi`: Kategorik (Lise, Lisans vb.) skora dönüştürülür.
         - `Sosyal Aktivite Skoru`: Metin madenciliği ve embedding teknikleri kullanılarak 0-100 aralığında normalize edilmiş bir skor üretilir.
     - **Çıktıları:**
-        - `processed_candidates_full.xlsx`: Tüm ham, ara ve türetilmiş sütunları içerir.
+        - `processed_candidates_full.xlsx`: Tüm ara ve türetilmiş skor sütunlarını içerir (ham serbest metin ayrı tabloda, `candidate_raw_text.pkl`).
         - `processed_candidates_anonymized_scaled.xlsx`: Sadece ÇKKV analizlerinde kullanılacak, anonimleştirilmiş ve normalize edilmiş (genellikle 0-100) kriter skorlarını içerir. **Bu dosya, TOPSIS ve ELECTRE için ana girdidir.**
     """)
 
@@ -278,7 +393,7 @@ elif section == "AHP Analizi ve Kriter Ağırlıkları":
     st.markdown("Bu bölümde, Analitik Hiyerarşi Süreci (AHP) kullanılarak elde edilen kriter ağırlıkları ve uzman değerlendirmelerinin tutarlılık analizleri sunulmaktadır.")
 
     # Birleşik Ağırlıklar
-    df_ahp_birlesik = load_data(file_ahp_birlesik_agirlik, sheet_name='Birlesik_Agirlik', use_excel=True)
+    df_ahp_birlesik = load_data(file_ahp_birlesik_agirlik, sheet_name='Birlesik_Agirlik')
     if df_ahp_birlesik is not None:
         st.subheader("4.1. Nihai Birleşik Kriter Ağırlıkları")
         # CSV'den doğru sütunları al
@@ -301,8 +416,8 @@ elif section == "AHP Analizi ve Kriter Ağırlıkları":
         #     st.dataframe(df_ahp_birlesik.head())
 
     # Uzman Ağırlıkları ve Tutarlılık
-    df_uzman_agirliklari = load_data(file_ahp_uzman_agirliklari, sheet_name='Uzman_Agirliklari', use_excel=True)
-    df_ahp_tutarlilik = load_data(file_ahp_tutarlilik, sheet_name='Consistency_Results', use_excel=True)
+    df_uzman_agirliklari = load_data(file_ahp_uzman_agirliklari, sheet_name='Uzman_Agirliklari')
+    df_ahp_tutarlilik = load_data(file_ahp_tutarlilik, sheet_name='Consistency_Results')
 
     if df_uzman_agirliklari is not None and df_ahp_tutarlilik is not None:
         st.subheader("4.2. Bireysel Uzman Ağırlıkları ve Tutarlılık Oranları (CR)")
@@ -374,7 +489,7 @@ elif section == "TOPSIS ve ELECTRE Sıralama Sonuçları":
     num_aday_goster = st.slider("Grafiklerde gösterilecek en iyi aday sayısı:", min_value=5, max_value=30, value=10, key="top_n_slider")
 
     # TOPSIS Sonuçları
-    df_topsis = load_data(file_topsis_ranking, sheet_name='Sheet1', use_excel=True)
+    df_topsis = load_data(file_topsis_ranking, sheet_name='Sheet1')
     if df_topsis is not None:
         st.subheader("5.1. TOPSIS Sıralaması (İdeale Yakınlık)")
         # Sütun adları: Aday ID,TOPSIS Score,TOPSIS Rank
@@ -396,7 +511,7 @@ elif section == "TOPSIS ve ELECTRE Sıralama Sonuçları":
             st.dataframe(df_topsis.head())
 
     # ELECTRE Sonuçları
-    df_electre = load_data(file_electre_results, sheet_name='Sheet1', use_excel=True)
+    df_electre = load_data(file_electre_results, sheet_name='Sheet1')
     if df_electre is not None:
         st.subheader("5.2. ELECTRE Sıralaması (Baskınlık Skoru)")
         # Sütun adları: Aday ID,ELECTRE Dominance Score,ELECTRE Rank
@@ -421,11 +536,12 @@ elif section == "Karşılaştırmalı Analiz ve Raporlama":
     st.header("6. Karşılaştırmalı Analiz ve Raporlama")
     st.markdown("Bu bölümde, TOPSIS ve ELECTRE metodolojilerinden elde edilen sonuçlar karşılaştırılmakta ve adayların genel durumu değerlendirilmektedir.")
 
-    df_combined = load_data(file_combined_report, sheet_name='Sheet1', use_excel=True)
+    df_combined = load_combined_report()
     if df_combined is not None:
         st.subheader("6.1. TOPSIS ve ELECTRE Sıralamalarının Karşılaştırılması (Saçılım Grafiği)")
         # Sütun adları: Aday ID,TOPSIS Score,TOPSIS Rank,ELECTRE Dominance Score,ELECTRE Rank
         if all(col in df_combined.columns for col in ['ID', 'TOPSIS_Score', 'TOPSIS_Rank', 'ELECTRE_Dominance_Score', 'ELECTRE_Rank']):
+            df_combined = df_combined.copy() # Depodaki ortak DataFrame değişmesin
             df_combined['ID'] = df_combined['ID'].astype(str)
 
             # Hover için metin oluşturma
@@ -453,32 +569,25 @@ elif section == "Karşılaştırmalı Analiz ve Raporlama":
             st.dataframe(df_combined.head())
 
         st.subheader("6.2. ELECTRE Baskınlık Matrisi (Heatmap)")
-        df_outranking = load_data(file_electre_outranking, sheet_name='Sheet1', use_excel=True)
-        if df_outranking is not None:
-            # Etiketler için aday ID'lerini al (Combined Report'tan ilk N aday)
-            # Outranking matrisinin boyutuna göre etiket sayısı ayarlanmalı
-            # Genellikle outranking matrisi tüm adayları içerir ama görselleştirme için ilk N aday alınabilir.
-            # Şimdilik, outranking matrisinin sütun/satır sayısına göre genel etiketler oluşturalım
-            # veya combined_report'tan sıralı adayları alalım.
-
-            num_heatmap_aday = st.slider("Heatmap için aday sayısı (En iyi TOPSIS sırasına göre):", min_value=5, max_value=min(50, len(df_combined) if df_combined is not None else 50), value=15, key="heatmap_aday_slider")
-
-            if 'ID' in df_combined.columns and 'TOPSIS_Rank' in df_combined.columns:
-                # En iyi N adayı TOPSIS sırasına göre al
-                top_n_aday_ids_ordered = df_combined.sort_values(by='TOPSIS_Rank').head(num_heatmap_aday)['ID'].tolist()
-
-                # Outranking matrisini bu adaylara göre filtrele/yeniden sırala
-                # Bu adım, df_outranking'in yapısına bağlıdır. Eğer df_outranking'in sütun ve indeksleri
-                # Aday ID'leri ise, .loc kullanarak filtreleme yapılabilir.
-                # Şu anki CSV formatında sütunlar '0', '1', ... şeklinde. Bu, adayların orijinal sırasına göre.
-                # Bu yüzden, top_n_aday_ids_ordered listesindeki ID'lerin orijinal indekslerini bulmamız gerekebilir.
-                # Basitlik adına, ilk N satır ve sütunu alıyoruz ve etiketleri top_n_aday_ids_ordered'dan atıyoruz.
-                # GERÇEK UYGULAMADA BU EŞLEŞTİRME DOĞRU YAPILMALIDIR.
-                
-                if not df_outranking.empty and len(df_outranking) >= num_heatmap_aday and len(df_outranking.columns) >= num_heatmap_aday:
-                    outranking_subset = df_outranking.iloc[:num_heatmap_aday, :num_heatmap_aday].values
-                    heatmap_labels = [str(id) for id in top_n_aday_ids_ordered[:num_heatmap_aday]]
-
+        outranking_matrix = get_outranking_matrix()
+        df_rank = load_combined_report() # ID'leri orijinal tipte (int) al
+        if outranking_matrix is not None:
+            if 'ID' in df_rank.columns and 'TOPSIS_Rank' in df_rank.columns and len(df_rank) >= 2:
+                num_heatmap_aday = st.slider("Heatmap için aday sayısı (En iyi TOPSIS sırasına göre):", min_value=min(5, len(df_rank) - 1), max_value=len(df_rank), value=min(15, len(df_rank)), key="heatmap_aday_slider")
+
+                # En iyi N adayı TOPSIS sırasına göre al (matriste olmayan ID'ler atlanır)
+                top_n_aday_ids_ordered = [
+                    aday_id for aday_id in df_rank.sort_values(by='TOPSIS_Rank').head(num_heatmap_aday)['ID'].tolist()
+                    if aday_id in outranking_matrix
+                ]
+
+                if len(top_n_aday_ids_ordered) < num_heatmap_aday:
+                    st.warning(f"{num_heatmap_aday - len(top_n_aday_ids_ordered)} aday outranking matrisinde bulunamadığı için heatmap'e dahil edilmedi.")
+
+                if len(top_n_aday_ids_ordered) <= HEATMAP_EXACT_MAX:
+                    # Satır ve sütunlar doğrudan ID ile seçilir → etiketler gerçek adaylara karşılık gelir
+                    outranking_subset = outranking_matrix.sub_block(top_n_aday_ids_ordered)
+                    heatmap_labels = [str(aday_id) for aday_id in top_n_aday_ids_ordered]
                     fig_heatmap = go.Figure(data=go.Heatmap(
                                        z=outranking_subset,
                                        x=heatmap_labels,
@@ -487,19 +596,37 @@ elif section == "Karşılaştırmalı Analiz ve Raporlama":
                                        reversescale=True, # Koyu renk baskınlığı göstersin (1)
                                        hovertemplate="Baskılayan Aday (Satır): %{y}<br>Baskılanan Aday (Sütun): %{x}<br>Baskınlık: %{z}<extra></extra>"
                                        ))
-                    fig_heatmap.update_layout(
-                        title=f'ELECTRE Baskınlık Matrisi (En İyi {num_heatmap_aday} Aday)',
-                        xaxis_title="Baskılanan Aday",
-                        yaxis_title="Baskılayan Aday (Satır)",
-                        yaxis_autorange='reversed', # Matrisin sol üstten başlaması için
-                        height=max(500, num_heatmap_aday * 30),
-                        xaxis_side="top"
-                    )
-                    st.plotly_chart(fig_heatmap, use_container_width=True)
-                    st.markdown("Bu ısı haritası, seçilen en iyi adaylar arasındaki baskınlık ilişkilerini gösterir. Koyu renk, satırdaki adayın sütundaki adayı baskıladığını (outrank ettiğini) belirtir (1=Baskılar, 0=Baskılamaz).")
+                    heatmap_title = f'ELECTRE Baskınlık Matrisi (En İyi {len(top_n_aday_ids_ordered)} Aday)'
+                    heatmap_aciklama = "Bu ısı haritası, seçilen en iyi adaylar arasındaki baskınlık ilişkilerini gösterir. Koyu renk, satırdaki adayın sütundaki adayı baskıladığını (outrank ettiğini) belirtir (1=Baskılar, 0=Baskılamaz)."
                 else:
-                    st.warning(f"Outranking matrisi {num_heatmap_aday}x{num_heatmap_aday} boyutunda alt küme için yeterli değil veya yüklenemedi.")
-                    st.dataframe(df_outranking.head())
+                    # Çok sayıda aday → TOPSIS sırasına göre gruplanmış baskınlık yoğunluğu
+                    density, edges = outranking_block_density(outranking_version(), tuple(top_n_aday_ids_ordered),
+                                                              HEATMAP_MAX_BLOCKS, outranking_matrix)
+                    heatmap_labels = [f"{start + 1}-{stop}" for start, stop in zip(edges[:-1], edges[1:])]
+                    fig_heatmap = go.Figure(data=go.Heatmap(
+                                       z=density,
+                                       x=heatmap_labels,
+                                       y=heatmap_labels,
+                                       zmin=0, zmax=1,
+                                       colorscale='Blues',
+                                       reversescale=True,
+                                       hovertemplate="Baskılayan Grup (TOPSIS Sırası): %{y}<br>Baskılanan Grup (TOPSIS Sırası): %{x}<br>Baskınlık Oranı: %{z:.2f}<extra></extra>"
+                                       ))
+                    heatmap_title = f'ELECTRE Baskınlık Yoğunluğu (En İyi {len(top_n_aday_ids_ordered)} Aday, {len(heatmap_labels)} Grup)'
+                    heatmap_aciklama = "Aday sayısı büyük olduğu için adaylar TOPSIS sırasına göre ardışık gruplara ayrılmıştır. Her hücre, satırdaki gruptaki adayların sütundaki gruptaki adayları baskılama oranını gösterir (0-1)."
+
+                fig_heatmap.update_layout(
+                    title=heatmap_title,
+                    xaxis_title="Baskılanan Aday",
+                    yaxis_title="Baskılayan Aday (Satır)",
+                    yaxis_autorange='reversed', # Matrisin sol üstten başlaması için
+                    height=max(500, min(len(heatmap_labels), HEATMAP_EXACT_MAX) * 30),
+                    xaxis_side="top"
+                )
+                st.plotly_chart(fig_heatmap, use_container_width=True)
+                st.markdown(heatmap_aciklama)
+            elif 'ID' in df_rank.columns and 'TOPSIS_Rank' in df_rank.columns:
+                st.info("Heatmap için en az 2 aday gerekiyor.")
             else:
                 st.warning("Heatmap etiketleri için `combined_ranking_report.xlsx` dosyasında 'Aday ID' veya 'TOPSIS Rank' sütunları bulunamadı.")
         else:
@@ -513,6 +640,55 @@ elif section == "Karşılaştırmalı Analiz ve Raporlama":
             "ELECTRE_Rank": "{:.0f}"
         }), use_container_width=True)
 
+        st.subheader("6.4. Sıralama Uyumu (Kendall tau-b, Spearman, İlk-k, RBO)")
+        st.markdown("Birleşik rapordaki sıralamaların ikili uyumu: Kendall tau-b ve Spearman rho tüm adayların sırasını, ilk-k örtüşme/Jaccard ve rank-biased overlap (RBO) ise listenin üst kısmını karşılaştırır. Sırası boş olan (ön filtre dışı) adaylar karşılaştırmaya alınmaz.")
+        df_uyum_kaynak = load_combined_report().set_index('ID')
+        # En az iki sıralaması dolu aday sayısı (ön filtre dışı adayların ELECTRE sırası boştur)
+        n_uyum = int((df_uyum_kaynak[rank_agreement.rank_columns(df_uyum_kaynak)].notna().sum(axis=1) >= 2).sum())
+        if n_uyum < 2:
+            st.info("Sıralama uyumu için en az iki sıralaması olan en az 2 aday gerekiyor.")
+        else:
+            col_k, col_p, col_metrik = st.columns(3)
+            uyum_k = col_k.slider("İlk-k:", min_value=min(5, n_uyum - 1), max_value=min(100, n_uyum), value=min(rank_agreement.TOP_K, n_uyum), key="agreement_k")
+            uyum_p = col_p.slider("RBO p (kalıcılık):", min_value=0.5, max_value=0.99, value=rank_agreement.RBO_P, step=0.01, key="agreement_p")
+            uyum_metrik = col_metrik.selectbox("Matris metriği:", rank_agreement.METRICS, key="agreement_metric")
+
+            df_uyum = rank_agreement.agreement_table(df_uyum_kaynak, k=uyum_k, p=uyum_p)
+            if df_uyum.empty:
+                st.warning("Birleşik raporda karşılaştırılacak en az iki sıralama sütunu (`*_Rank`) bulunamadı.")
+            else:
+                st.dataframe(df_uyum.style.format({metrik: "{:.3f}" for metrik in rank_agreement.METRICS}), use_container_width=True)
+                uyum_matrisi = rank_agreement.agreement_matrix(df_uyum, uyum_metrik)
+                fig_uyum = go.Figure(data=go.Heatmap(z=uyum_matrisi.values, x=uyum_matrisi.columns, y=uyum_matrisi.index,
+                                                     zmin=-1 if uyum_metrik in ("kendall_tau_b", "spearman_rho") else 0, zmax=1,
+                                                     colorscale='RdBu', text=np.round(uyum_matrisi.values, 3), texttemplate="%{text}"))
+                fig_uyum.update_layout(title=f"Sıralamalar Arası Uyum ({uyum_metrik})", height=450, yaxis_autorange='reversed')
+                st.plotly_chart(fig_uyum, use_container_width=True)
+
+            # Eşik taraması: ELECTRE durumu bir kez kurulur, her eşik için yalnızca yeniden eşikleme yapılır
+            df_candidates = load_data(file_processed_candidates, sheet_name='Sheet1')
+            df_ahp_birlesik = load_data(file_ahp_birlesik_agirlik, sheet_name='Birlesik_Agirlik')
+            if df_candidates is not None and df_ahp_birlesik is not None:
+                df_weights = df_ahp_birlesik.rename(columns={'Unnamed: 0': 'Kriter'}).set_index('Kriter')
+                kriterler = df_weights.index.tolist()
+                if all(k in df_candidates.columns for k in kriterler):
+                    criteria_matrix = df_candidates[kriterler].values.astype(float)
+                    candidates_fingerprint = artifact_store.fingerprints.get(os.path.basename(file_processed_candidates))
+                    pairwise_state = get_pairwise_state(candidates_fingerprint, criteria_matrix)
+                    df_tarama = rank_agreement.threshold_sweep(
+                        criteria_matrix, df_weights['Birlesik_Agirlik'].values, np.round(np.linspace(0.5, 0.9, 17), 3),
+                        state=pairwise_state, k=uyum_k, p=uyum_p, ids=df_candidates['ID'].values,
+                    )
+                    fig_tarama = px.line(df_tarama.melt(id_vars=['C_threshold', 'D_threshold', 'n'], value_vars=list(rank_agreement.METRICS),
+                                                        var_name='Metrik', value_name='Uyum'),
+                                         x='C_threshold', y='Uyum', color='Metrik', markers=True,
+                                         title=f"TOPSIS–ELECTRE Uyum Eğrisi (Concordance Eşiği Taraması, D ≤ {mcdm_methods.D_THRESHOLD})",
+                                         labels={'C_threshold': 'Concordance Eşiği (C ≥)'})
+                    fig_tarama.add_vline(x=mcdm_methods.C_THRESHOLD, line_dash="dash", annotation_text="Pipeline eşiği")
+                    fig_tarama.update_layout(height=450)
+                    st.plotly_chart(fig_tarama, use_container_width=True)
+                    st.markdown("Eğri, ELECTRE concordance eşiği değiştikçe ELECTRE sıralamasının TOPSIS sıralamasıyla uyumunun nasıl değiştiğini gösterir (tüm aday havuzu üzerinde).")
+
     else:
         st.warning(f"`{file_combined_report}` dosyası yüklenemedi.")
 
@@ -548,7 +724,7 @@ elif section == "Excel Çıktı Dosyaları ve Yapıları":
         - `CR`: Tutarlılık Oranı.
     """)
     # Örnek tablolar gösterilebilir
-    df_ahp_b = load_data(file_ahp_birlesik_agirlik, sheet_name='Birlesik_Agirlik', use_excel=True)
+    df_ahp_b = load_data(file_ahp_birlesik_agirlik, sheet_name='Birlesik_Agirlik')
     if df_ahp_b is not None:
         st.markdown("**Örnek: Birleşik Ağırlıklar**")
         st.dataframe(df_ahp_b.head(), height=200, use_container_width=True)
@@ -559,7 +735,7 @@ elif section == "Excel Çıktı Dosyaları ve Yapıları":
     - `TOPSIS Score`: Adayın ideale yakınlık skoru (0-1 aralığında, 1'e yakın olan daha iyi).
     - `TOPSIS Rank`: Adayın TOPSIS skoruna göre sıralaması.
     """)
-    df_t = load_data(file_topsis_ranking, sheet_name='Sheet1', use_excel=True)
+    df_t = load_data(file_topsis_ranking, sheet_name='Sheet1')
     if df_t is not None:
         st.dataframe(df_t.head(), height=200, use_container_width=True)
 
@@ -569,7 +745,7 @@ elif section == "Excel Çıktı Dosyaları ve Yapıları":
     - `ELECTRE Dominance Score`: Adayın net baskınlık skoru (veya benzeri bir ELECTRE sıralama metriği).
     - `ELECTRE Rank`: Adayın ELECTRE skoruna göre sıralaması.
     """)
-    df_e = load_data(file_electre_results, sheet_name='Sheet1', use_excel=True)
+    df_e = load_data(file_electre_results, sheet_name='Sheet1')
     if df_e is not None:
         st.dataframe(df_e.head(), height=200, use_container_width=True)
 
@@ -578,7 +754,7 @@ elif section == "Excel Çıktı Dosyaları ve Yapıları":
     Bu dosya, TOPSIS ve ELECTRE sonuçlarını tek bir tabloda birleştirerek karşılaştırmalı bir görünüm sunar.
     - `Aday ID`, `TOPSIS Score`, `TOPSIS Rank`, `ELECTRE Dominance Score`, `ELECTRE Rank`.
     """)
-    df_c = load_data(file_combined_report, sheet_name='Sheet1', use_excel=True)
+    df_c = load_data(file_combined_report, sheet_name='Sheet1')
     if df_c is not None:
         st.dataframe(df_c.head(), height=200, use_container_width=True)
 
@@ -588,7 +764,7 @@ elif section == "Excel Çıktı Dosyaları ve Yapıları":
     - `ELECTRE_Discordance.xlsx`: Aday çiftleri arasındaki uyumsuzluk değerlerini içerir.
     - `ELECTRE_Outranking.xlsx` (CSV: `ELECTRE_Outranking.xlsx - Sheet1.csv`): Adaylar arası baskınlık ilişkilerini gösteren matris (1: baskılar, 0: baskılamaz).
     """)
-    df_eo = load_data(file_electre_outranking, sheet_name='Sheet1', use_excel=True)
+    df_eo = load_data(file_electre_outranking, sheet_name='Sheet1')
     if df_eo is not None:
         st.markdown("**Örnek: Outranking Matrisi (İlk 5x5)**")
         st.dataframe(df_eo.iloc[:5, :5], height=200, use_container_width=True)
@@ -638,4 +814,128 @@ elif section == "Sonuç ve Değerlendirme":
     Sonuç olarak, bu çalışma ile kuruma/teze/sunuma verilebilecek, kapsamlı ve bilimsel temellere dayanan bir karar destek sistemi başarıyla inşa edilmiştir. 🚀
     """)
 
+elif section == "Canlı Yeniden Sıralama (What-if)":
+    st.header("10. Canlı Yeniden Sıralama (What-if)")
+    st.markdown("Bu bölümde AHP ağırlıkları ve ELECTRE eşikleri değiştirilerek sıralamanın nasıl değiştiği anında görülebilir. Ölçeklenmiş kriter matrisi ve ELECTRE ikili karşılaştırma durumu bellekte tutulur; sadece aday seti değiştiğinde yeniden hesaplanır.")
+
+    df_candidates = load_data(file_processed_candidates, sheet_name='Sheet1')
+    df_ahp_birlesik = load_data(file_ahp_birlesik_agirlik, sheet_name='Birlesik_Agirlik')
+    if df_candidates is not None and df_ahp_birlesik is not None:
+        df_weights = df_ahp_birlesik.rename(columns={'Unnamed: 0': 'Kriter'}).set_index('Kriter')
+        kriterler = df_weights.index.tolist()
+        ahp_agirliklari = df_weights['Birlesik_Agirlik'].values
+        eksik_kriterler = [k for k in kriterler if k not in df_candidates.columns]
+
+        if eksik_kriterler:
+            st.warning(f"`{file_processed_candidates}` dosyasında şu kriter sütunları bulunamadı: {eksik_kriterler}")
+        else:
+            candidate_ids = df_candidates['ID'].values
+            criteria_matrix = df_candidates[kriterler].values.astype(float)
+            candidates_fingerprint = artifact_store.fingerprints.get(os.path.basename(file_processed_candidates))
+            pairwise_state = get_pairwise_state(candidates_fingerprint, criteria_matrix)
+
+            col_agirlik, col_esik = st.columns(2)
+            with col_agirlik:
+                st.subheader("10.1. Kriter Ağırlıkları")
+                ham_agirliklar = np.array([
+                    st.slider(kriter, min_value=0.0, max_value=1.0, value=float(agirlik), step=0.01, key=f"live_weight_{i}")
+                    for i, (kriter, agirlik) in enumerate(zip(kriterler, ahp_agirliklari))
+                ])
+            with col_esik:
+                st.subheader("10.2. ELECTRE Eşikleri")
+                c_esik = st.slider("Concordance eşiği (C ≥)", min_value=0.0, max_value=1.0, value=mcdm_methods.C_THRESHOLD, step=0.01, key="live_c_threshold")
+                d_esik = st.slider("Discordance eşiği (D ≤)", min_value=0.0, max_value=1.0, value=mcdm_methods.D_THRESHOLD, step=0.01, key="live_d_threshold")
+                num_live_aday = st.slider("Tabloda gösterilecek aday sayısı:", min_value=5, max_value=50, value=20, key="live_top_n")
+
+            if ham_agirliklar.sum() == 0:
+                st.warning("En az bir kriterin ağırlığı sıfırdan büyük olmalıdır.")
+            else:
+                # Ağırlıklar toplamı 1 olacak şekilde normalize edilir
+                agirliklar = ham_agirliklar / ham_agirliklar.sum()
+
+                t_baslangic = time.perf_counter()
+                topsis_skorlari = mcdm_methods.topsis_scores(criteria_matrix, agirliklar)
+                t_topsis = time.perf_counter()
+                dominance_skorlari = pairwise_state.dominance_scores(agirliklar, c_esik, d_esik)
+                t_electre = time.perf_counter()
+
+                df_live = mcdm_methods.electre_ranking(dominance_skorlari, candidate_ids)
+                df_live.insert(0, "TOPSIS_Score", topsis_skorlari)
+                df_live.insert(1, "TOPSIS_Rank", mcdm_methods.descending_rank(topsis_skorlari))
+
+                # Hazır (offline) sonuçlarla karşılaştırma
+                df_combined = load_combined_report()
+                if df_combined is not None and 'ID' in df_combined.columns:
+                    df_base = df_combined.set_index('ID')
+                    df_live["TOPSIS Sıra Değişimi"] = df_base['TOPSIS_Rank'].reindex(df_live.index) - df_live['TOPSIS_Rank']
+                    df_live["ELECTRE Sıra Değişimi"] = df_base['ELECTRE_Rank'].reindex(df_live.index) - df_live['ELECTRE_Rank']
+
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Aday Sayısı", len(candidate_ids))
+                col2.metric("TOPSIS Süresi", f"{(t_topsis - t_baslangic) * 1000:.1f} ms")
+                col3.metric("ELECTRE Yeniden Eşikleme", f"{(t_electre - t_topsis) * 1000:.1f} ms")
+
+                df_agirlik_plot = pd.DataFrame({'Kriter': kriterler, 'AHP Ağırlığı': ahp_agirliklari, 'Canlı Ağırlık': agirliklar})
+                fig_live_weights = px.bar(df_agirlik_plot.melt(id_vars='Kriter', var_name='Kaynak', value_name='Ağırlık'),
+                                          x='Ağırlık', y='Kriter', color='Kaynak', barmode='group', orientation='h',
+                                          title='AHP Ağırlıkları ve Canlı (Normalize) Ağırlıklar')
+                fig_live_weights.update_layout(height=400)
+                st.plotly_chart(fig_live_weights, use_container_width=True)
+
+                st.subheader(f"10.3. Canlı Sıralama (TOPSIS'e göre ilk {num_live_aday} aday)")
+                st.dataframe(df_live.sort_values(by='TOPSIS_Rank').head(num_live_aday).style.format({"TOPSIS_Score": "{:.4f}"}), use_container_width=True)
+                st.markdown("Sıra değişimi sütunlarında pozitif değerler, adayın hazır rapordaki sırasına göre yükseldiğini gösterir.")
+    else:
+        st.warning("Canlı yeniden sıralama için aday veya AHP ağırlık dosyaları yüklenemedi.")
+
+elif section == "Aday Geçmişi (Sonuç Deposu)":
+    st.header("11. Aday Geçmişi (Sonuç Deposu)")
+    st.markdown("Her pipeline çalıştırması özellikleri, ölçeklenmiş kriterleri, AHP ağırlıklarını, skorları ve baskınlık kenarlarını tek bir SQLite veritabanına (`results.sqlite`) yazar. Bir adayın son çalıştırmalardaki tüm değerleri aday ID'si ile tek sorguda getirilir.")
+
+    if results_store is None:
+        st.warning(f"`{file_results_db}` dosyası bulunamadı. `multi_criteria_ranking_pipeline.py` çalıştırıldıktan sonra `outputs/results.sqlite` dosyasını 'data' klasörüne kopyalayın.")
+    else:
+        df_latest = load_combined_report()
+        varsayilan_id = int(df_latest.sort_values(by='TOPSIS_Rank')['ID'].iloc[0]) if df_latest is not None and len(df_latest) else 0
+        col_id, col_son = st.columns(2)
+        aday_id = int(col_id.number_input("Aday ID:", min_value=0, value=varsayilan_id, step=1, key="history_candidate_id"))
+        son_n = col_son.slider("Son çalıştırma sayısı:", min_value=1, max_value=50, value=10, key="history_last_runs")
+
+        t_baslangic = time.perf_counter()
+        df_history = results_store.candidate_history(aday_id, last=son_n)
+        t_sorgu = time.perf_counter()
+
+        if df_history.empty:
+            st.warning(f"Aday {aday_id} sonuç deposunda bulunamadı.")
+        else:
+            run_order = df_history.drop_duplicates('run_id').sort_values('created_at')['run_id'].tolist()
+            col1, col2 = st.columns(2)
+            col1.metric("Çalıştırma Sayısı", len(run_order))
+            col2.metric("Sorgu Süresi", f"{(t_sorgu - t_baslangic) * 1000:.1f} ms")
+
+            df_scores = df_history[df_history['kind'] == 'score'].pivot(index='name', columns='run_id', values='value')
+            st.subheader("11.1. Skorlar ve Sıralar (Çalıştırma Bazında)")
+            st.dataframe(df_scores.reindex(columns=run_order), use_container_width=True)
+
+            df_ranks = df_history[(df_history['kind'] == 'score') & df_history['name'].str.endswith('_Rank')].dropna(subset=['value'])
+            if len(df_ranks) and len(run_order) > 1:
+                fig_ranks = px.line(df_ranks.sort_values('created_at'), x='created_at', y='value', color='name', markers=True,
+                                    title=f'Aday {aday_id} Sıralarının Çalıştırmalar Arası Değişimi',
+                                    labels={'created_at': 'Çalıştırma Zamanı', 'value': 'Sıra', 'name': 'Yöntem'})
+                fig_ranks.update_layout(yaxis_autorange="reversed", height=450)
+                st.plotly_chart(fig_ranks, use_container_width=True)
+
+            for kind, baslik in [('criterion', "11.2. Ölçeklenmiş Kriterler"), ('feature', "11.3. Özellikler (Aşama 1)")]:
+                df_kind = df_history[df_history['kind'] == kind]
+                if len(df_kind):
+                    with st.expander(baslik):
+                        st.dataframe(df_kind.pivot(index='name', columns='run_id', values='value').reindex(columns=run_order), use_container_width=True)
+
+            if selected_run_id is not None:
+                df_edges = results_store.outranking_edges(selected_run_id, aday_id)
+                st.subheader(f"11.4. Baskınlık İlişkileri (Çalıştırma: {selected_run_id})")
+                col1, col2 = st.columns(2)
+                col1.metric("Baskıladığı Aday", int((df_edges['source_id'] == aday_id).sum()))
+                col2.metric("Baskılandığı Aday", int((df_edges['target_id'] == aday_id).sum()))
+
 # Uygulamayı çalıştırmak için terminalde: streamlit run app.py
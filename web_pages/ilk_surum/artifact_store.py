@@ -0,0 +1,187 @@
+"""
+Dashboard Artefakt Deposu
+=========================
+
+Dashboard'un kullandığı tüm Excel çıktılarını uygulama açılışında bir kez
+yükler:
+- Her çalışma kitabı tek seferde (sheet_name=None) okunur → aynı dosya
+  farklı sheet'ler için tekrar parse edilmez
+- Dosyalar ThreadPoolExecutor ile eşzamanlı yüklenir
+- Sütunlar sabit tiplere dönüştürülür (ID → int, skorlar → float, ...)
+
+Bölümler sadece bu depodaki DataFrame'leri kullanır, sayfa geçişlerinde
+diske gidilmez. Pipeline çıktıları güncellendiğinde ArtifactWatcher sadece
+değişen dosyaları (boyut/mtime parmak izine göre) arka planda yeniden yükler.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from outranking_store import OutrankingMatrix
+
+# Dashboard'un okuduğu çıktı dosyaları
+ARTIFACT_FILES = [
+    "ahp_weights_summary.xlsx",
+    "TOPSIS_Ranking.xlsx",
+    "ELECTRE_Results.xlsx",
+    "combined_ranking_report.xlsx",
+    "ELECTRE_Outranking.xlsx",
+    "ELECTRE_Outranking.npz",
+    "processed_candidates_anonymized_scaled.xlsx",
+]
+
+# Bilinen sütunların tipleri
+COLUMN_DTYPES = {
+    "ID": "int64",
+    "TOPSIS_Score": "float64",
+    "TOPSIS_Rank": "int64",
+    "ELECTRE_Dominance_Score": "int64",
+    "ELECTRE_Rank": "int64",
+    "Birlesik_Agirlik": "float64",
+    "Lambda_max": "float64",
+    "CI": "float64",
+    "CR": "float64",
+}
+
+# 0/1 matrisleri (ID sütunu hariç tüm hücreler)
+BINARY_MATRIX_FILES = {"ELECTRE_Outranking.xlsx"}
+
+
+# Bir sheet'in sütunlarını sabit tiplere dönüştür
+def apply_dtypes(df, file_name):
+    for col, dtype in COLUMN_DTYPES.items():
+        if col in df.columns and not df[col].isna().any():
+            df[col] = df[col].astype(dtype)
+
+    if file_name in BINARY_MATRIX_FILES:
+        value_cols = [col for col in df.columns if col != "ID"]
+        df[value_cols] = df[value_cols].fillna(0).astype("int8")
+    return df
+
+
+# Bir çalışma kitabının tüm sheet'lerini tek parse ile oku
+# (.npz → ID indeksli outranking matrisi, tek "matrix" girdisi)
+def load_workbook_frames(file_path):
+    file_name = os.path.basename(file_path)
+    if file_name.endswith(".npz"):
+        return {"matrix": OutrankingMatrix.from_npz(file_path)}
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    return {sheet: apply_dtypes(df, file_name) for sheet, df in sheets.items()}
+
+
+# Dosya parmak izi: boyut + değiştirilme zamanı (dosya yoksa None)
+def file_fingerprint(file_path):
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class ArtifactStore:
+    """Yüklenmiş çalışma kitapları: {dosya adı: {sheet adı: DataFrame}}
+
+    Her dosya parmak izi (boyut, mtime) ile birlikte tutulur. refresh() sadece
+    parmak izi değişen dosyaları yeniden yükler. cache_dir verilirse parse
+    edilmiş sheet'ler parmak iziyle birlikte pickle olarak saklanır; uygulama
+    yeniden başlatıldığında değişmeyen dosyalar Excel parse edilmeden açılır.
+    """
+
+    def __init__(self, data_path, files=ARTIFACT_FILES, cache_dir=None, max_workers=None):
+        self.data_path = data_path
+        self.files = list(files)
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or len(self.files)
+        self.frames = {}
+        self.errors = {}
+        self.fingerprints = {}
+        self.loaded_at = None
+        self._lock = threading.Lock()
+
+    def get(self, file_name, sheet_name=None):
+        book = self.frames.get(file_name)
+        if book is None:
+            return None
+        if sheet_name is None:
+            return next(iter(book.values()))
+        return book.get(sheet_name)
+
+    @property
+    def version(self):
+        """Tüm dosya parmak izlerinden türetilen kısa veri sürümü."""
+        digest = hashlib.sha1(repr(sorted(self.fingerprints.items())).encode("utf-8"))
+        return digest.hexdigest()[:8]
+
+    def _cache_path(self, file_name):
+        return os.path.join(self.cache_dir, file_name + ".pkl")
+
+    def _load(self, file_name, fingerprint):
+        file_path = os.path.join(self.data_path, file_name)
+        try:
+            if self.cache_dir:
+                cache_path = self._cache_path(file_name)
+                if os.path.exists(cache_path):
+                    cached = pd.read_pickle(cache_path)
+                    if cached["fingerprint"] == fingerprint:
+                        return file_name, cached["sheets"], None
+
+            book = load_workbook_frames(file_path)
+
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                pd.to_pickle({"fingerprint": fingerprint, "sheets": book}, self._cache_path(file_name))
+            return file_name, book, None
+        except Exception as e:
+            return file_name, None, e
+
+    def refresh(self):
+        """Parmak izi değişen dosyaları yeniden yükler, değişen dosya adlarını döndürür."""
+        with self._lock:
+            current = {f: file_fingerprint(os.path.join(self.data_path, f)) for f in self.files}
+            changed = [f for f in self.files if f not in self.fingerprints or current[f] != self.fingerprints[f]]
+            if not changed:
+                return []
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(changed))) as executor:
+                results = list(executor.map(lambda f: self._load(f, current[f]), changed))
+
+            for file_name, book, error in results:
+                if error is None:
+                    self.frames[file_name] = book
+                    self.errors.pop(file_name, None)
+                else:
+                    self.frames.pop(file_name, None)
+                    self.errors[file_name] = error
+                self.fingerprints[file_name] = current[file_name]
+
+            self.loaded_at = datetime.now()
+            return changed
+
+
+class ArtifactWatcher(threading.Thread):
+    """Arka planda dosyaları periyodik kontrol edip değişenleri yeniden yükler."""
+
+    def __init__(self, store, interval=5.0):
+        super().__init__(name="ArtifactWatcher", daemon=True)
+        self.store = store
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.store.refresh()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# Tüm artefaktları thread havuzunda eşzamanlı yükle
+def build_artifact_store(data_path, files=ARTIFACT_FILES, cache_dir=None, max_workers=None):
+    store = ArtifactStore(data_path, files=files, cache_dir=cache_dir, max_workers=max_workers)
+    store.refresh()
+    return store